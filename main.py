@@ -1,23 +1,159 @@
-
-import pygame
-import sys
-import os
-
-
-sys.path.append(os.path.join(os.path.dirname(__file__), 'modules'))
-
-from modules.Game import Game
-
-
-def main():
-
-    pygame.init()
-    pygame.mixer.init()
-
-
-    game = Game()
-    game.run()
-
-
-if __name__ == "__main__":
+
+import argparse
+import shlex
+import pygame
+import sys
+import os
+
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'modules'))
+
+from modules.Game import Game, FPS
+from modules.InputRecorder import InputReplay
+from modules.LevelGenerator import LevelGenerator
+from modules.FrameCapture import FrameCapture
+from modules.Netplay import RollbackSession, LinkSimulator
+
+
+def parse_args() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(description="КОНТРА - Аркадный Автомат")
+    parser.add_argument('--gc-mode', choices=['default', 'disabled', 'tuned'], default='default',
+                        help="режим сборщика мусора во время игры")
+    parser.add_argument('--record', metavar='PATH',
+                        help="записать ввод первой игровой сессии в файл")
+    parser.add_argument('--replay', metavar='PATH',
+                        help="воспроизвести записанную сессию")
+    parser.add_argument('--endless', action='store_true',
+                        help="бесконечный режим: после третьего уровня - процедурные уровни")
+    parser.add_argument('--stress-width', type=int, metavar='PIXELS',
+                        help="процедурный нагрузочный мир заданной ширины")
+    parser.add_argument('--level-seed', type=int, default=0,
+                        help="seed нагрузочного мира")
+    parser.add_argument('--render-scale', type=float, default=1.0,
+                        help="масштаб внутреннего буфера мира, например 0.5 - пиксель-арт 600x250")
+    parser.add_argument('--scaled', action='store_true',
+                        help="масштабировать окно средствами SDL (pygame.SCALED)")
+    parser.add_argument('--fullscreen', action='store_true',
+                        help="полноэкранный режим с масштабированием")
+    parser.add_argument('--headless', action='store_true',
+                        help="без окна и без ограничения FPS (для --replay)")
+    parser.add_argument('--capture', metavar='DIR',
+                        help="записывать кадры в папку (через общую память в отдельный процесс, с пропуском кадров)")
+    parser.add_argument('--capture-format', choices=FrameCapture.FORMATS, default='png',
+                        help="png - последовательность PNG, raw - кадры RGB24 подряд")
+    parser.add_argument('--capture-encoder', metavar='CMD',
+                        help="команда кодировщика, получающая raw-кадры через stdin")
+    parser.add_argument('--load-state', metavar='PATH',
+                        help="начать игру с сохраненного снимка (F5 - сохранить, F9 - загрузить)")
+    parser.add_argument('--rewind-seconds', type=float, default=10.0,
+                        help="длина истории для перемотки (BACKSPACE), 0 - выключить")
+    parser.add_argument('--netplay', type=int, choices=[1, 2],
+                        help="сетевая игра вдвоем: номер игрока (1 - первый, 2 - второй)")
+    parser.add_argument('--net-port', type=int,
+                        help="локальный UDP-порт (по умолчанию 7001 для игрока 1, 7002 для игрока 2)")
+    parser.add_argument('--net-peer', metavar='HOST:PORT',
+                        help="адрес собеседника (по умолчанию 127.0.0.1 и порт другого игрока)")
+    parser.add_argument('--net-seed', type=int, default=1,
+                        help="seed уровня, одинаковый у обоих игроков")
+    parser.add_argument('--net-delay', type=int, default=2,
+                        help="задержка локального ввода в кадрах")
+    parser.add_argument('--net-latency', type=float, default=0.0,
+                        help="имитация: задержка пакетов, мс")
+    parser.add_argument('--net-jitter', type=float, default=0.0,
+                        help="имитация: разброс задержки, мс")
+    parser.add_argument('--net-loss', type=float, default=0.0,
+                        help="имитация: доля потерянных пакетов (0..1)")
+    parser.add_argument('--fixed-quality', action='store_true',
+                        help="не снижать качество отрисовки при нехватке времени кадра")
+    parser.add_argument('--metrics-dir', metavar='DIR',
+                        help="выгружать метрики в DIR/metrics.jsonl и DIR/contra.prom")
+    parser.add_argument('--metrics-interval', type=float, default=5.0,
+                        help="период выгрузки метрик, секунды")
+    parser.add_argument('--memory-report', action='store_true',
+                        help="учет памяти: отчет tracemalloc и поверхностей на каждом завершении уровня")
+    parser.add_argument('--surface-budget-mb', type=float, default=64.0,
+                        help="бюджет памяти поверхностей для --memory-report, МБ")
+    parser.add_argument('--pipelined', action='store_true',
+                        help="симуляция в отдельном потоке, отрисовка последнего снимка мира")
+    parser.add_argument('--horde', action='store_true',
+                        help="сразу начать режим орды (выживание против волн врагов)")
+    parser.add_argument('--sprite-report', action='store_true',
+                        help="печатать формат и оценку времени blit каждого спрайта при загрузке уровня")
+    return parser.parse_args()
+
+
+def main():
+
+    args = parse_args()
+
+    if args.headless:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+    pygame.init()
+    # Небольшой буфер микшера - короткая задержка звуковых эффектов
+    pygame.mixer.init(44100, -16, 2, 512)
+
+
+    level_generator = None
+    if args.stress_width:
+        level_generator = LevelGenerator.stress(args.level_seed, args.stress_width)
+
+    display_flags = 0
+    if args.scaled or args.fullscreen:
+        display_flags |= pygame.SCALED
+    if args.fullscreen:
+        display_flags |= pygame.FULLSCREEN
+
+    frame_capture = None
+    if args.capture:
+        encoder = shlex.split(args.capture_encoder) if args.capture_encoder else None
+        frame_capture = FrameCapture(args.capture, args.capture_format, encoder=encoder, fps=FPS)
+
+    game = Game(gc_mode=args.gc_mode, record_path=args.record,
+                endless=args.endless, level_generator=level_generator,
+                render_scale=args.render_scale, display_flags=display_flags,
+                frame_capture=frame_capture, rewind_seconds=0 if args.netplay else args.rewind_seconds,
+                adaptive_quality=not args.fixed_quality,
+                metrics_dir=args.metrics_dir, metrics_interval=args.metrics_interval,
+                memory_report=args.memory_report, surface_budget_mb=args.surface_budget_mb,
+                sprite_report=args.sprite_report)
+
+    if args.replay:
+        replay = InputReplay(args.replay)
+        frames = game.run_replay(replay, fps=0 if args.headless else FPS)
+        print(f"Воспроизведено кадров: {frames}, счет: {game.score}, уровень: {game.level}")
+        game.close_outputs()
+        pygame.quit()
+        return
+
+    if args.netplay:
+        player_index = args.netplay - 1
+        local_port = args.net_port or 7001 + player_index
+        if args.net_peer:
+            host, port = args.net_peer.rsplit(':', 1)
+            remote_address = (host, int(port))
+        else:
+            remote_address = ('127.0.0.1', 7002 - player_index)
+
+        link = LinkSimulator(args.net_latency, args.net_jitter, args.net_loss, seed=player_index)
+        session = RollbackSession(game, player_index, local_port, remote_address, link, input_delay=args.net_delay)
+        game.start(args.net_seed)
+        game.add_partner()
+        game.run_netplay(session)
+        return
+
+    if args.load_state:
+        game.quick_load(args.load_state)
+    elif args.horde:
+        game.start_horde(args.level_seed or None)
+
+    if args.pipelined:
+        game.run_pipelined()
+    else:
+        game.run()
+
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,91 @@
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+import pygame
+
+if TYPE_CHECKING:
+    from modules.SpriteManager import SpriteManager
+
+TICK_MS = 16
+
+# Длительность кадра анимации (мс) и число кадров, если анимация не загружена
+ANIMATION_FRAME_MS: Dict[str, int] = {
+    'playerWalk': 150,
+    'playerJump': 200,
+    'enemyWalk': 200,
+}
+FALLBACK_FRAME_COUNTS: Dict[str, int] = {
+    'playerWalk': 2,
+    'playerJump': 2,
+    'enemyWalk': 4,
+}
+
+
+class AnimationClock:
+    """Общие часы анимаций.
+
+    Индекс кадра каждой анимации считается один раз за тик. Сущности хранят
+    только фазу (смещение в кадрах) или момент начала анимации, без своих
+    таймеров. frames[name] - кадры, сдвинутые на текущий индекс, так что
+    frames[name][phase] сразу дает поверхность для сущности с фазой phase;
+    mirrored[name] - те же кадры, отраженные по горизонтали один раз при bind.
+    """
+
+    __slots__ = ('ticks', 'frame_ticks', 'frame_counts', 'indices', 'sprites', 'frames',
+                 'mirrored_sprites', 'mirrored')
+
+    def __init__(self):
+        self.ticks = 0
+        self.frame_ticks: Dict[str, int] = {
+            name: -(-frame_ms // TICK_MS) for name, frame_ms in ANIMATION_FRAME_MS.items()
+        }
+        self.frame_counts: Dict[str, int] = dict(FALLBACK_FRAME_COUNTS)
+        self.indices: Dict[str, int] = {name: 0 for name in ANIMATION_FRAME_MS}
+        self.sprites: Dict[str, List[Optional[pygame.Surface]]] = {}
+        self.frames: Dict[str, List[Optional[pygame.Surface]]] = {}
+        self.mirrored_sprites: Dict[str, List[Optional[pygame.Surface]]] = {}
+        self.mirrored: Dict[str, List[Optional[pygame.Surface]]] = {}
+
+    def bind(self, sprite_manager: 'SpriteManager') -> None:
+        """Берем кадры анимаций из менеджера спрайтов после (пере)загрузки"""
+        for name in ANIMATION_FRAME_MS:
+            animation = sprite_manager.get_animation(name)
+            self.sprites[name] = animation
+            self.mirrored_sprites[name] = [sprite_manager.mirror(sprite) if sprite else None for sprite in animation]
+            self.frame_counts[name] = len(animation) or FALLBACK_FRAME_COUNTS[name]
+        self.refresh(True)
+
+    def reset(self) -> None:
+
+        self.ticks = 0
+        self.refresh(True)
+
+    def advance(self) -> None:
+
+        self.ticks += 1
+        self.refresh()
+
+    def refresh(self, force: bool = False) -> None:
+
+        for name, frame_ticks in self.frame_ticks.items():
+            count = self.frame_counts[name]
+            index = (self.ticks // frame_ticks) % count
+            if index == self.indices[name] and not force:
+                continue
+            self.indices[name] = index
+
+            animation = self.sprites.get(name)
+            if animation:
+                self.frames[name] = animation[index:] + animation[:index]
+                mirrored = self.mirrored_sprites[name]
+                self.mirrored[name] = mirrored[index:] + mirrored[:index]
+            else:
+                self.frames[name] = []
+                self.mirrored[name] = []
+
+    def frame(self, name: str, phase: int = 0) -> int:
+
+        return (self.indices[name] + phase) % self.frame_counts[name]
+
+    def frame_since(self, name: str, start_tick: int) -> int:
+        """Кадр анимации, запущенной на тике start_tick"""
+        return ((self.ticks - start_tick) // self.frame_ticks[name]) % self.frame_counts[name]
@@ -1,82 +1,169 @@
-import pygame
-import math
-from typing import TYPE_CHECKING
-
-if TYPE_CHECKING:
-    from modules.Game import Game
-
-
-class Bullet:
-    def __init__(self, game: 'Game', x: float, y: float,
-                 direction: str, is_enemy: bool = False, damage: int = 1, angle: float = 0):
-        self.game = game
-        self.x = x
-        self.y = y
-        self.width = 8
-        self.height = 4
-        self.speed = 10
-        self.direction = direction
-        self.is_enemy = is_enemy
-        self.damage = damage
-        self.angle = angle
-        self.speed_x = math.cos(angle) * self.speed
-        self.speed_y = math.sin(angle) * self.speed
-        self.is_angled = angle != 0
-
-    def update(self) -> None:
-        if self.is_angled:
-
-            self.x += self.speed_x
-            self.y += self.speed_y
-        else:
-
-            if self.direction == 'right':
-                self.x += self.speed
-            else:
-                self.x -= self.speed
-
-    def is_out_of_bounds(self, level_width: float) -> bool:
-
-        if self.is_angled:
-            return (self.x < -50 or self.x > level_width + 50 or
-                    self.y < -50 or self.y > 600)
-        return self.x < -50 or self.x > level_width + 50
-
-    def get_rect(self) -> pygame.Rect:
-        return pygame.Rect(self.x, self.y, self.width, self.height)
-
-    def render(self) -> None:
-        pass
-
-    def draw(self, screen: pygame.Surface, camera_x: float) -> None:
-        sprite = self.game.sprite_manager.get_sprite('bullet')
-
-        if sprite and not self.is_enemy:
-
-            if self.is_angled:
-
-                rotated_sprite = pygame.transform.rotate(sprite, -math.degrees(self.angle))
-
-                rotated_rect = rotated_sprite.get_rect(center=sprite.get_rect(center=(0, 0)).center)
-                screen.blit(rotated_sprite,
-                            (int(self.x - camera_x - rotated_rect.width // 2 + self.width // 2),
-                             int(self.y - rotated_rect.height // 2 + self.height // 2)))
-            else:
-                screen.blit(sprite, (int(self.x - camera_x), int(self.y)))
-        else:
-            color = (255, 0, 0) if self.is_enemy else (255, 255, 0)
-
-
-            if self.is_angled:
-                pygame.draw.circle(
-                    screen,
-                    color,
-                    (int(self.x - camera_x + self.width // 2), int(self.y + self.height // 2)),
-                    4
-                )
-            else:
-                pygame.draw.rect(
-                    screen,
-                    color,
-                    (int(self.x - camera_x), int(self.y), self.width, self.height)
+import pygame
+import math
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from modules.Game import Game
+    from modules.SlotMap import SlotMap
+    from modules.SpriteManager import SpriteManager
+
+ENEMY_BULLET_COLOR = (255, 0, 0)
+
+
+class Bullet:
+    __slots__ = ('game', 'x', 'y', 'width', 'height', 'speed', 'direction', 'is_enemy',
+                 'damage', 'angle', 'speed_x', 'speed_y', 'is_angled', 'handle',
+                 'rect', 'prev_x', 'prev_y', 'sweep')
+
+    def __init__(self, game: 'Game', x: float, y: float,
+                 direction: str, is_enemy: bool = False, damage: int = 1, angle: float = 0):
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.sweep = pygame.Rect(0, 0, 0, 0)
+        self.reset(game, x, y, direction, is_enemy, damage, angle)
+
+    def reset(self, game: 'Game', x: float, y: float,
+              direction: str, is_enemy: bool = False, damage: int = 1, angle: float = 0) -> None:
+        self.game = game
+        self.x = x
+        self.y = y
+        self.width = 8
+        self.height = 4
+        self.speed = 10
+        self.direction = direction
+        self.is_enemy = is_enemy
+        self.damage = damage
+        self.angle = angle
+        self.speed_x = math.cos(angle) * self.speed
+        self.speed_y = math.sin(angle) * self.speed
+        self.is_angled = angle != 0
+        self.prev_x = x
+        self.prev_y = y
+        self.rect.update(int(x), int(y), self.width, self.height)
+        self.sweep.update(self.rect)
+
+    @staticmethod
+    def update_batch(bullets: 'SlotMap', level_width: float) -> Tuple[List['Bullet'], List['Bullet']]:
+        """Движение всех пуль одним циклом.
+
+        Пули, вылетевшие за уровень больше чем на 50 пикселей, помечаются на
+        удаление; возвращаются оставшиеся пули игроков (с обновленным sweep) и
+        пули врагов.
+        """
+        friendly = []
+        hostile = []
+        min_x = -50
+        max_x = level_width + 50
+        for bullet in bullets.items:
+            prev_x = bullet.x
+            prev_y = bullet.y
+            bullet.prev_x = prev_x
+            bullet.prev_y = prev_y
+
+            if bullet.is_angled:
+                x = prev_x + bullet.speed_x
+                y = prev_y + bullet.speed_y
+                bullet.y = y
+                bullet.rect.y = int(y)
+                out = x < min_x or x > max_x or y < -50 or y > 600
+            else:
+                x = prev_x + bullet.speed if bullet.direction == 'right' else prev_x - bullet.speed
+                y = prev_y
+                out = x < min_x or x > max_x
+            bullet.x = x
+            bullet.rect.x = int(x)
+
+            if out:
+                bullets.discard(bullet)
+            elif bullet.is_enemy:
+                # Пули врагов проверяются прямоугольником против игроков - путь за тик им не нужен
+                hostile.append(bullet)
+            else:
+                left, right = (prev_x, x) if prev_x < x else (x, prev_x)
+                top, bottom = (prev_y, y) if prev_y < y else (y, prev_y)
+                left = int(left)
+                top = int(top)
+                bullet.sweep.update(left, top, int(right) - left + bullet.width + 1,
+                                    int(bottom) - top + bullet.height + 1)
+                friendly.append(bullet)
+        return friendly, hostile
+
+    def update_sweep(self) -> None:
+        """Прямоугольник, покрывающий весь путь пули за тик - широкая фаза для swept-проверки"""
+        left = int(min(self.prev_x, self.x))
+        top = int(min(self.prev_y, self.y))
+        self.sweep.update(left, top,
+                          int(max(self.prev_x, self.x)) - left + self.width + 1,
+                          int(max(self.prev_y, self.y)) - top + self.height + 1)
+
+    def get_rect(self) -> pygame.Rect:
+        return self.rect
+
+    def render(self) -> None:
+        pass
+
+    def get_mask(self) -> pygame.mask.Mask:
+
+        return self.game.sprite_manager.get_solid_mask(self.width, self.height)
+
+    @staticmethod
+    def draw_batch(screen: pygame.Surface, bullets: List['Bullet'], camera_x: float, scale: float,
+                   left: float, right: float, sprite_manager: 'SpriteManager',
+                   fallback: Optional[Callable[[Any], None]] = None) -> None:
+        """Пули с x в (left, right): пули врагов (круги) - одним вызовом blits из заготовленной
+        поверхности, остальные - через draw или fallback (пули из снимка отрисовки)"""
+        if not bullets:
+            return
+
+        radius = max(1, int(4 * scale))
+        dot = sprite_manager.get_circle_sprite(ENEMY_BULLET_COLOR, radius)
+        blit_sequence = []
+        append = blit_sequence.append
+        for bullet in bullets:
+            x = bullet.x
+            if not left < x < right:
+                continue
+            if bullet.is_enemy and bullet.is_angled:
+                append((dot, (int((x - camera_x + bullet.width // 2) * scale) - radius,
+                              int((bullet.y + bullet.height // 2) * scale) - radius)))
+            elif fallback:
+                fallback(bullet)
+            else:
+                bullet.draw(screen, camera_x, scale)
+        screen.blits(blit_sequence, False)
+
+    def draw(self, screen: pygame.Surface, camera_x: float, scale: float = 1.0) -> None:
+        sprite = self.game.sprite_manager.get_sprite('bullet')
+
+        center_x = int((self.x - camera_x + self.width // 2) * scale)
+        center_y = int((self.y + self.height // 2) * scale)
+
+        if sprite and not self.is_enemy:
+
+            if self.is_angled:
+
+                rotated_sprite = pygame.transform.rotate(sprite, -math.degrees(self.angle))
+
+                rotated_rect = rotated_sprite.get_rect(center=sprite.get_rect(center=(0, 0)).center)
+                screen.blit(rotated_sprite,
+                            (center_x - rotated_rect.width // 2,
+                             center_y - rotated_rect.height // 2))
+            else:
+                screen.blit(sprite, (int((self.x - camera_x) * scale), int(self.y * scale)))
+        else:
+            color = ENEMY_BULLET_COLOR if self.is_enemy else (255, 255, 0)
+
+
+            if self.is_angled:
+                pygame.draw.circle(
+                    screen,
+                    color,
+                    (center_x, center_y),
+                    max(1, int(4 * scale))
+                )
+            else:
+                pygame.draw.rect(
+                    screen,
+                    color,
+                    (int((self.x - camera_x) * scale), int(self.y * scale),
+                     max(1, int(self.width * scale)), max(1, int(self.height * scale)))
                 )
\ No newline at end of file
@@ -1,136 +1,192 @@
-
-import pygame
-from typing import TYPE_CHECKING, List, Dict, Optional
-
-if TYPE_CHECKING:
-    from modules.Game import Game
-
-
-class Enemy:
-    def __init__(self, game: 'Game', x: float, y: float, platform_id: int):
-        self.game = game
-        self.x = x
-        self.y = y
-        self.width = 40
-        self.height = 60
-        self.health = 2
-        self.speed = 0.8 + (game.level * 0.2)
-        self.direction = 1
-        self.platform_id = platform_id
-        self.current_platform: Optional[Dict] = None
-
-
-        self.animation_frame = 0
-        self.animation_timer = 0
-        self.animation_speed = 200
-
-        self.find_platform()
-
-    def find_platform(self) -> None:
-
-        for platform in self.game.platforms:
-            if platform['id'] == self.platform_id:
-                self.current_platform = platform
-                self.y = platform['y'] - self.height
-                break
-
-    def update(self) -> None:
-
-        if not self.current_platform:
-            self.find_platform()
-            return
-
-
-        self.x += self.speed * self.direction
-
-
-        if self.x <= self.current_platform['x']:
-            self.x = self.current_platform['x']
-            self.direction = 1
-        elif self.x + self.width >= self.current_platform['x'] + self.current_platform['width']:
-            self.x = self.current_platform['x'] + self.current_platform['width'] - self.width
-            self.direction = -1
-
-        self.y += 0.5
-
-
-        for platform in self.game.platforms:
-            if self.check_collision_with_platform(platform):
-                self.y = platform['y'] - self.height
-
-
-        self.animation_timer += 16
-        if self.animation_timer >= self.animation_speed:
-            animation_frames = self.game.sprite_manager.get_animation('enemyWalk')
-            if animation_frames:
-                self.animation_frame = (self.animation_frame + 1) % len(animation_frames)
-            else:
-                self.animation_frame = (self.animation_frame + 1) % 4
-            self.animation_timer = 0
-
-    def check_collision_with_platform(self, platform: Dict) -> bool:
-
-        return (self.x < platform['x'] + platform['width'] and
-                self.x + self.width > platform['x'] and
-                self.y + self.height > platform['y'] and
-                self.y < platform['y'])
-
-    def take_damage(self, damage: int) -> None:
-
-        self.health -= damage
-
-    def is_dead(self) -> bool:
-
-        return self.health <= 0
-
-    def get_rect(self) -> pygame.Rect:
-
-        return pygame.Rect(self.x, self.y, self.width, self.height)
-
-    def render(self) -> None:
-
-        pass
-
-    def draw(self, screen: pygame.Surface, camera_x: float) -> None:
-
-        animation_frames = self.game.sprite_manager.get_animation('enemyWalk')
-        sprite = None
-
-        if animation_frames and self.animation_frame < len(animation_frames):
-            sprite = animation_frames[self.animation_frame]
-
-        if sprite:
-
-            if self.direction == -1:
-                sprite = pygame.transform.flip(sprite, True, False)
-                screen.blit(sprite, (int(self.x - camera_x), int(self.y)))
-            else:
-                screen.blit(sprite, (int(self.x - camera_x), int(self.y)))
-        else:
-
-            color = (0, 170, 0)
-            pygame.draw.rect(
-                screen,
-                color,
-                (int(self.x - camera_x), int(self.y), self.width, self.height)
-            )
-
-
-            self.draw_health_bar(screen, camera_x)
-
-    def draw_health_bar(self, screen: pygame.Surface, camera_x: float) -> None:
-
-        if self.health < 2:
-            bar_width = self.width
-            bar_height = 5
-            bar_x = int(self.x - camera_x)
-            bar_y = int(self.y) - 10
-
-
-            pygame.draw.rect(screen, (255, 0, 0),
-                             (bar_x, bar_y, bar_width, bar_height))
-
-
-            health_width = int(bar_width * (self.health / 2))
-            pygame.draw.rect(screen, (0, 255, 0),
+
+import pygame
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Dict, Optional
+
+if TYPE_CHECKING:
+    from modules.Game import Game
+
+
+class Enemy:
+    __slots__ = ('game', 'x', 'y', 'width', 'height', 'health', 'speed', 'direction',
+                 'platform_id', 'current_platform', 'patrol_min', 'patrol_max', 'animation_phase',
+                 'handle', 'rect')
+
+    def __init__(self, game: 'Game', x: float, y: float, platform_id: int):
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(game, x, y, platform_id)
+
+    def reset(self, game: 'Game', x: float, y: float, platform_id: int) -> None:
+
+        self.game = game
+        self.x = x
+        self.y = y
+        self.width = 40
+        self.height = 60
+        self.health = 2
+        self.speed = 0.8 + (game.level * 0.2)
+        self.direction = 1
+        self.platform_id = platform_id
+        self.current_platform: Optional[Dict] = None
+        self.patrol_min = x
+        self.patrol_max = x
+
+
+        self.animation_phase = 0
+        self.rect.update(int(x), int(y), self.width, self.height)
+
+        self.find_platform()
+
+    def find_platform(self) -> None:
+        """Границы патруля и высота считаются один раз - враг не покидает свою платформу"""
+        platform = self.game.platform_index.get(self.platform_id)
+        if platform:
+            self.current_platform = platform
+            self.y = platform['y'] - self.height
+            self.rect.y = int(self.y)
+            self.patrol_min = platform['x']
+            self.patrol_max = platform['x'] + platform['width'] - self.width
+
+    def update(self) -> None:
+
+        if not self.current_platform:
+            self.find_platform()
+            return
+
+        x = self.x + self.speed * self.direction
+
+        if x <= self.patrol_min:
+            x = self.patrol_min
+            self.direction = 1
+        elif x >= self.patrol_max:
+            x = self.patrol_max
+            self.direction = -1
+
+        self.x = x
+        self.rect.x = int(x)
+
+    @staticmethod
+    def update_patrol_batch(enemies: Iterable['Enemy']) -> None:
+        """Обновление всех патрулирующих врагов одним циклом, без вызова метода на врага"""
+        for enemy in enemies:
+            direction = enemy.direction
+            x = enemy.x + enemy.speed * direction
+
+            if x <= enemy.patrol_min:
+                if enemy.current_platform is None:
+                    enemy.update()
+                    continue
+                x = enemy.patrol_min
+                enemy.direction = 1
+            elif x >= enemy.patrol_max:
+                if enemy.current_platform is None:
+                    enemy.update()
+                    continue
+                x = enemy.patrol_max
+                enemy.direction = -1
+
+            enemy.x = x
+            enemy.rect.x = int(x)
+
+    def sync_rect(self) -> None:
+
+        self.rect.x = int(self.x)
+        self.rect.y = int(self.y)
+
+    def check_collision_with_platform(self, platform: Dict) -> bool:
+
+        return (self.x < platform['x'] + platform['width'] and
+                self.x + self.width > platform['x'] and
+                self.y + self.height > platform['y'] and
+                self.y < platform['y'])
+
+    def take_damage(self, damage: int) -> None:
+
+        self.health -= damage
+
+    def is_dead(self) -> bool:
+
+        return self.health <= 0
+
+    def get_rect(self) -> pygame.Rect:
+
+        return self.rect
+
+    def get_mask(self) -> Optional[pygame.mask.Mask]:
+
+        frame = self.game.animation_clock.frame('enemyWalk', self.animation_phase)
+        return self.game.sprite_manager.get_animation_mask('enemyWalk', frame, self.direction == -1)
+
+    def render(self) -> None:
+
+        pass
+
+    @staticmethod
+    def draw_batch(screen: pygame.Surface, enemies: Iterable['Enemy'], camera_x: float, scale: float,
+                   left: float, right: float, animation_frames: List[Optional[pygame.Surface]],
+                   mirrored_frames: List[Optional[pygame.Surface]],
+                   fallback: Optional[Callable[[Any], None]] = None) -> None:
+        """Враги с x в (left, right): со спрайтами - одним вызовом blits с готовыми отраженными
+        кадрами, остальные - через draw или fallback (враги из снимка отрисовки)"""
+        blit_sequence = []
+        for enemy in enemies:
+            if not left < enemy.x < right:
+                continue
+            frames = mirrored_frames if enemy.direction == -1 else animation_frames
+            phase = enemy.animation_phase
+            sprite = frames[phase] if phase < len(frames) else None
+            if sprite:
+                blit_sequence.append((sprite, (int((enemy.x - camera_x) * scale), int(enemy.y * scale))))
+            elif fallback:
+                fallback(enemy)
+            else:
+                enemy.draw(screen, camera_x, scale, animation_frames)
+        screen.blits(blit_sequence, False)
+
+    def draw(self, screen: pygame.Surface, camera_x: float, scale: float = 1.0,
+             animation_frames: Optional[List[pygame.Surface]] = None) -> None:
+
+        if animation_frames is None:
+            animation_frames = self.game.animation_clock.frames['enemyWalk']
+        sprite = None
+
+        if animation_frames and self.animation_phase < len(animation_frames):
+            sprite = animation_frames[self.animation_phase]
+
+        screen_x = int((self.x - camera_x) * scale)
+        screen_y = int(self.y * scale)
+
+        if sprite and self.game.quality.use_sprites:
+
+            if self.direction == -1:
+                screen.blit(self.game.sprite_manager.mirror(sprite), (screen_x, screen_y))
+            else:
+                screen.blit(sprite, (screen_x, screen_y))
+        else:
+
+            color = (0, 170, 0)
+            pygame.draw.rect(
+                screen,
+                color,
+                (screen_x, screen_y, int(self.width * scale), int(self.height * scale))
+            )
+
+
+            if self.game.quality.health_bars:
+                self.draw_health_bar(screen, camera_x, scale)
+
+    def draw_health_bar(self, screen: pygame.Surface, camera_x: float, scale: float = 1.0) -> None:
+
+        if self.health < 2:
+            bar_width = int(self.width * scale)
+            bar_height = max(1, int(5 * scale))
+            bar_x = int((self.x - camera_x) * scale)
+            bar_y = int((self.y - 10) * scale)
+
+
+            pygame.draw.rect(screen, (255, 0, 0),
+                             (bar_x, bar_y, bar_width, bar_height))
+
+
+            health_width = int(bar_width * (self.health / 2))
+            pygame.draw.rect(screen, (0, 255, 0),
                              (bar_x, bar_y, health_width, bar_height))
\ No newline at end of file
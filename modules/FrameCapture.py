@@ -0,0 +1,181 @@
+import json
+import multiprocessing
+import os
+import queue
+import subprocess
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+import pygame
+
+STOP = None
+
+
+def pixel_format(surface: pygame.Surface) -> str:
+    """Порядок байт буфера как у экрана - копирование кадра без перестановки каналов"""
+    return 'BGRA' if surface.get_masks()[0] == 0xff0000 else 'RGBX'
+
+
+def encode_frames(names: List[str], size: Tuple[int, int], pixels: str, format_: str, output_dir: str,
+                  encoder: Optional[List[str]], free, pending, written) -> None:
+    """Процесс записи: кодирует кадры из общих буферов и возвращает буферы в пул"""
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    surfaces = [pygame.image.frombuffer(block.buf, size, pixels) for block in blocks]
+
+    process = None
+    output = None
+    if format_ == 'raw':
+        if encoder:
+            process = subprocess.Popen(encoder, stdin=subprocess.PIPE)
+            output = process.stdin
+        else:
+            output = open(os.path.join(output_dir, 'frames.rgb'), 'wb')
+
+    while True:
+        item = pending.get()
+        if item is STOP:
+            break
+
+        frame, index = item
+        try:
+            if format_ == 'png':
+                pygame.image.save(surfaces[index], os.path.join(output_dir, f"frame_{frame:06d}.png"))
+            else:
+                output.write(pygame.image.tobytes(surfaces[index], 'RGB'))
+            written.value += 1
+        except (OSError, ValueError) as e:
+            print(f"✗ Ошибка записи кадра {frame}: {e}")
+        finally:
+            free.put(index)
+
+    if output:
+        output.close()
+    if process:
+        process.wait()
+
+    del surfaces
+    for block in blocks:
+        block.close()
+
+
+class FrameCapture:
+    """Асинхронный захват кадров для QA и демо-записей.
+
+    Буферы кадров - заранее выделенный пул в общей памяти. В основном цикле кадр
+    только копируется одним blit'ом в свободный буфер; кодирование и запись идут в
+    отдельном процессе и не конкурируют с игрой за GIL. Если свободных буферов нет
+    (запись не успевает), кадр пропускается - цикл игры никогда не ждет диска или
+    кодировщика.
+
+    format 'png' - последовательность frame_000000.png (номер кадра с учетом
+    пропущенных); 'raw' - кадры RGB24 подряд в frames.rgb или в stdin внешнего
+    кодировщика (encoder - команда, например ffmpeg с '-f rawvideo -i -').
+    """
+
+    FORMATS = ('png', 'raw')
+
+    def __init__(self, output_dir: str, format_: str = 'png', pool_size: int = 8,
+                 encoder: Optional[List[str]] = None, fps: int = 60):
+        if format_ not in self.FORMATS:
+            raise ValueError(f"Неизвестный формат захвата: {format_}")
+
+        self.output_dir = output_dir
+        self.format = format_
+        self.pool_size = max(1, pool_size)
+        self.encoder = encoder
+        self.fps = fps
+
+        self.size: Optional[Tuple[int, int]] = None
+        self.blocks: List[shared_memory.SharedMemory] = []
+        self.buffers: List[pygame.Surface] = []
+        self.free = None
+        self.pending = None
+        self.written = None
+        self.process: Optional[multiprocessing.Process] = None
+
+        self.frame = 0
+        self.captured = 0
+        self.dropped = 0
+
+    def begin(self, surface: pygame.Surface) -> None:
+        """Выделяем пул буферов и запускаем процесс записи"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.size = surface.get_size()
+        frame_bytes = self.size[0] * self.size[1] * 4
+        pixels = pixel_format(surface)
+
+        self.blocks = [shared_memory.SharedMemory(create=True, size=frame_bytes) for _ in range(self.pool_size)]
+        self.buffers = [pygame.image.frombuffer(block.buf, self.size, pixels) for block in self.blocks]
+
+        context = multiprocessing.get_context('spawn')
+        self.free = context.Queue()
+        self.pending = context.Queue()
+        self.written = context.Value('i', 0)
+        for index in range(self.pool_size):
+            self.free.put(index)
+
+        self.process = context.Process(
+            target=encode_frames,
+            args=([block.name for block in self.blocks], self.size, pixels, self.format, self.output_dir,
+                  self.encoder, self.free, self.pending, self.written),
+            name='FrameCapture',
+            daemon=True
+        )
+        self.process.start()
+
+        self.write_info()
+        print(f"Захват кадров в {self.output_dir} ({self.format}, {self.size[0]}x{self.size[1]})")
+
+    def is_active(self) -> bool:
+
+        return self.process is not None
+
+    def capture(self, surface: pygame.Surface) -> None:
+
+        if self.process is None:
+            self.begin(surface)
+
+        frame = self.frame
+        self.frame += 1
+
+        try:
+            index = self.free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return
+
+        self.buffers[index].blit(surface, (0, 0))
+        self.captured += 1
+        self.pending.put((frame, index))
+
+    def write_info(self) -> None:
+
+        info = {
+            'format': self.format,
+            'width': self.size[0] if self.size else 0,
+            'height': self.size[1] if self.size else 0,
+            'fps': self.fps,
+            'frames': self.frame,
+            'written': self.written.value if self.written else 0,
+            'dropped': self.dropped
+        }
+        with open(os.path.join(self.output_dir, 'capture.json'), 'w', encoding='utf-8') as f:
+            json.dump(info, f, indent=2)
+
+    def close(self) -> None:
+        """Дописываем очередь, останавливаем процесс записи и освобождаем общую память"""
+        if self.process is None:
+            return
+
+        self.pending.put(STOP)
+        self.process.join()
+        self.process = None
+
+        self.buffers = []
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+        self.write_info()
+        print(f"Захват завершен: записано {self.written.value} кадров, пропущено {self.dropped}")
@@ -0,0 +1,200 @@
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+from .Game import Game, GameState
+from .InputRecorder import InputReplay
+
+
+def percentile(sorted_samples: List[float], q: float) -> float:
+
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(q * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+class FrameStats:
+    """Перцентили времени кадра в миллисекундах"""
+
+    __slots__ = ('frames', 'p50', 'p95', 'p99', 'worst')
+
+    METRICS = ('p50', 'p95', 'p99', 'worst')
+
+    def __init__(self, frames: int = 0, p50: float = 0.0, p95: float = 0.0,
+                 p99: float = 0.0, worst: float = 0.0):
+        self.frames = frames
+        self.p50 = p50
+        self.p95 = p95
+        self.p99 = p99
+        self.worst = worst
+
+    @classmethod
+    def from_samples(cls, samples: List[float]) -> 'FrameStats':
+
+        ordered = sorted(samples)
+        return cls(
+            len(ordered),
+            percentile(ordered, 0.50),
+            percentile(ordered, 0.95),
+            percentile(ordered, 0.99),
+            ordered[-1] if ordered else 0.0
+        )
+
+    @classmethod
+    def best_of(cls, runs: List['FrameStats']) -> 'FrameStats':
+        """Минимум каждой метрики по повторам - отсекает шум планировщика"""
+        return cls(
+            max(run.frames for run in runs),
+            *(min(getattr(run, metric) for run in runs) for metric in cls.METRICS)
+        )
+
+    def to_dict(self) -> Dict[str, float]:
+
+        data = {metric: round(getattr(self, metric), 4) for metric in self.METRICS}
+        data['frames'] = self.frames
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, float]) -> 'FrameStats':
+
+        return cls(int(data.get('frames', 0)), *(float(data[metric]) for metric in cls.METRICS))
+
+    def __str__(self) -> str:
+
+        return (f"p50 {self.p50:.3f} p95 {self.p95:.3f} p99 {self.p99:.3f} "
+                f"worst {self.worst:.3f} ms ({self.frames} кадров)")
+
+
+class FrameTimeHarness:
+    """Прогон записанных сессий через Game.update/Game.render без ограничения FPS
+    и сравнение времени кадра с сохраненными базовыми значениями.
+
+    Время кадра группируется по уровням: ключ '<сессия>:level<N>'.
+    Регрессия - метрика выше базовой более чем на допуск (доля) плюс slack_ms.
+    """
+
+    def __init__(self, sessions: List[str], baseline_path: str,
+                 tolerance: float = 0.15, worst_tolerance: float = 0.5,
+                 slack_ms: float = 0.25, repeats: int = 5, warmup: int = 30,
+                 render_scale: float = 1.0):
+        self.sessions = sessions
+        self.baseline_path = baseline_path
+        self.tolerance = tolerance
+        self.worst_tolerance = worst_tolerance
+        self.slack_ms = slack_ms
+        self.repeats = max(1, repeats)
+        self.warmup = warmup
+        self.render_scale = render_scale
+
+    def play_session(self, replay: InputReplay) -> Dict[int, List[float]]:
+
+        game = Game(render_scale=self.render_scale)
+        game.use_offscreen_surface()
+
+        replay.rewind()
+        game.start(replay.seed)
+
+        timings: Dict[int, List[float]] = {}
+        perf_counter = time.perf_counter
+        played = 0
+
+        frame = replay.next_frame()
+        while frame is not None and game.game_state != GameState.MENU:
+            level = game.level
+            # Кадры с переходами состояний (загрузка уровня, пауза) не измеряем
+            steady = game.game_state == GameState.PLAYING and not frame.keydowns
+
+            started = perf_counter()
+            game.replay_frame(frame)
+            game.render()
+            elapsed = (perf_counter() - started) * 1000.0
+
+            if steady and played >= self.warmup:
+                timings.setdefault(level, []).append(elapsed)
+            played += 1
+            frame = replay.next_frame()
+
+        return timings
+
+    def measure_session(self, path: str) -> Dict[str, FrameStats]:
+
+        replay = InputReplay(path)
+        name = os.path.splitext(os.path.basename(path))[0]
+
+        runs: Dict[str, List[FrameStats]] = {}
+        for _ in range(self.repeats):
+            for level, samples in self.play_session(replay).items():
+                runs.setdefault(f"{name}:level{level}", []).append(FrameStats.from_samples(samples))
+
+        return {key: FrameStats.best_of(stats) for key, stats in runs.items()}
+
+    def measure(self) -> Dict[str, FrameStats]:
+
+        results: Dict[str, FrameStats] = {}
+        for path in self.sessions:
+            results.update(self.measure_session(path))
+        return results
+
+    def load_baseline(self) -> Dict[str, FrameStats]:
+
+        if not os.path.exists(self.baseline_path):
+            return {}
+        with open(self.baseline_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return {key: FrameStats.from_dict(value) for key, value in data.items()}
+
+    def save_baseline(self, results: Dict[str, FrameStats]) -> None:
+
+        directory = os.path.dirname(self.baseline_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.baseline_path, 'w', encoding='utf-8') as f:
+            json.dump({key: stats.to_dict() for key, stats in sorted(results.items())}, f, indent=2)
+
+    def compare(self, key: str, current: FrameStats, baseline: FrameStats) -> List[str]:
+
+        failures = []
+        for metric in FrameStats.METRICS:
+            tolerance = self.worst_tolerance if metric == 'worst' else self.tolerance
+            base_value = getattr(baseline, metric)
+            value = getattr(current, metric)
+            limit = base_value * (1.0 + tolerance) + self.slack_ms
+            if value > limit:
+                failures.append(f"{key} {metric}: {value:.3f} ms > {limit:.3f} ms (база {base_value:.3f})")
+        return failures
+
+    def run(self, update_baseline: bool = False) -> bool:
+        """Возвращает False, если хотя бы один уровень стал медленнее базового или пропал из прогона"""
+        baseline = self.load_baseline()
+        if not baseline and not update_baseline:
+            print(f"✗ Нет базовых значений в {self.baseline_path}: запустите с --update-baseline")
+            return False
+
+        results = self.measure()
+        if update_baseline:
+            self.save_baseline(results)
+            print(f"Базовые значения сохранены в {self.baseline_path}")
+            return True
+
+        failures: List[str] = []
+        for key, stats in sorted(results.items()):
+            base: Optional[FrameStats] = baseline.get(key)
+            if base is None:
+                print(f"  {key}: {stats} (нет базы)")
+                continue
+            key_failures = self.compare(key, stats, base)
+            status = "РЕГРЕССИЯ" if key_failures else "ok"
+            print(f"  {key}: {stats} [{status}]")
+            failures.extend(key_failures)
+
+        # Уровень из базы, до которого запись больше не доходит, - тоже провал, а не пропуск
+        sessions = {os.path.splitext(os.path.basename(path))[0] for path in self.sessions}
+        for key in sorted(baseline):
+            if key.split(':', 1)[0] in sessions and key not in results:
+                failures.append(f"{key}: нет в прогоне (есть в базе)")
+
+        for failure in failures:
+            print(f"✗ {failure}")
+        return not failures
@@ -1,758 +1,1336 @@
-import pygame
-import sys
-from enum import Enum
-from typing import Dict, List, Optional, Any, Tuple
-
-from .SpriteManager import SpriteManager
-from .Player import Player
-from .Enemy import Enemy
-from .Bullet import Bullet
-from .Pickup import Pickup
-from .Particle import Particle
-
-SCREEN_WIDTH = 1200
-SCREEN_HEIGHT = 500
-FPS = 60
-
-BLACK = (0, 0, 0)
-WHITE = (255, 255, 255)
-RED = (231, 76, 60)
-GREEN = (46, 204, 113)
-BLUE = (52, 152, 219)
-YELLOW = (241, 196, 15)
-DARK_BLUE = (44, 62, 80)
-PLATFORM_COLOR = (139, 69, 19)
-
-
-class GameState(Enum):
-    MENU = "menu"
-    PLAYING = "playing"
-    PAUSED = "paused"
-    GAME_OVER = "gameOver"
-    WIN = "win"
-    LEVEL_COMPLETE = "levelComplete"
-    LOADING = "loading"
-
-
-class Game:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("КОНТРА - Аркадный Автомат")
-        self.clock = pygame.time.Clock()
-
-        self.sprite_manager = SpriteManager()
-
-        self.game_state = GameState.LOADING
-
-        self.player: Optional[Player] = None
-        self.enemies: List[Enemy] = []
-        self.bullets: List[Bullet] = []
-        self.platforms: List[Dict] = []
-        self.pickups: List[Pickup] = []
-        self.particles: List[Particle] = []
-
-        self.score = 0
-        self.lives = 3
-        self.level = 1
-        self.max_level = 3
-
-        self.camera_x = 0
-        self.camera_width = SCREEN_WIDTH
-        self.camera_height = SCREEN_HEIGHT
-
-        self.level_width = 2400
-        self.level_height = 500
-
-        self.load_fonts()
-
-        self.load_sprites()
-
-
-        self.mouse_pressed = False
-        self.last_mouse_press_time = 0
-
-    def load_fonts(self) -> None:
-
-        try:
-
-            self.font_small = pygame.font.Font("fonts/PressStart2P.ttf", 10)
-            self.font_medium = pygame.font.Font("fonts/PressStart2P.ttf", 16)
-            self.font_large = pygame.font.Font("fonts/PressStart2P.ttf", 24)
-        except:
-
-            self.font_small = pygame.font.Font(None, 20)
-            self.font_medium = pygame.font.Font(None, 30)
-            self.font_large = pygame.font.Font(None, 48)
-
-    def load_sprites(self) -> None:
-
-        print("Начинаем загрузку спрайтов...")
-        self.sprite_manager.load_all_sprites(self.on_sprites_loaded)
-
-    def on_sprites_loaded(self) -> None:
-
-        print("Все спрайты загружены!")
-        self.game_state = GameState.MENU
-
-    def on_level_sprites_loaded(self) -> None:
-
-        print(f"Спрайты для уровня {self.level} загружены!")
-        self.generate_level()
-        if self.player:
-            self.player.x = 50
-            self.player.y = 400
-        self.camera_x = 0
-        self.game_state = GameState.PLAYING
-
-    def start(self) -> None:
-
-        if not self.sprite_manager.is_loading_complete():
-            print("Еще не все спрайты загружены!")
-            return
-
-        self.game_state = GameState.PLAYING
-        self.score = 0
-        self.lives = 3
-        self.level = 1
-        self.player = Player(self)
-        self.generate_level()
-
-    def generate_level(self) -> None:
-
-        self.enemies.clear()
-        self.bullets.clear()
-        self.platforms.clear()
-        self.pickups.clear()
-        self.particles.clear()
-
-        self.level_width = 2000 + (self.level * 400)
-
-        if self.level == 1:
-            self.generate_level_1()
-        elif self.level == 2:
-            self.generate_level_2()
-        elif self.level == 3:
-            self.generate_level_3()
-
-        self.update_camera()
-        self.update_ui()
-
-    def generate_level_1(self) -> None:
-
-        self.platforms = [
-            {'x': 0, 'y': 450, 'width': 400, 'height': 20, 'id': 1},
-            {'x': 450, 'y': 400, 'width': 300, 'height': 20, 'id': 2},
-            {'x': 800, 'y': 350, 'width': 250, 'height': 20, 'id': 3},
-            {'x': 1100, 'y': 300, 'width': 300, 'height': 20, 'id': 4},
-            {'x': 1500, 'y': 400, 'width': 300, 'height': 20, 'id': 5},
-            {'x': 1900, 'y': 350, 'width': 200, 'height': 20, 'id': 6},
-            {'x': 0, 'y': 480, 'width': self.level_width, 'height': 20, 'id': 0}
-        ]
-
-        self.enemies.append(Enemy(self, 500, 380, 2))
-        self.enemies.append(Enemy(self, 850, 330, 3))
-        self.enemies.append(Enemy(self, 1200, 280, 4))
-        self.enemies.append(Enemy(self, 1600, 380, 5))
-
-        self.pickups = [
-            Pickup(self, 420, 370, 'health'),
-            Pickup(self, 700, 320, 'ammo'),
-            Pickup(self, 1250, 270, 'health'),
-            Pickup(self, 1700, 370, 'ammo')
-        ]
-
-    def generate_level_2(self) -> None:
-
-        self.platforms = [
-            {'x': 0, 'y': 450, 'width': 350, 'height': 20, 'id': 1},
-            {'x': 400, 'y': 400, 'width': 300, 'height': 20, 'id': 2},
-            {'x': 750, 'y': 350, 'width': 280, 'height': 20, 'id': 3},
-            {'x': 1080, 'y': 300, 'width': 320, 'height': 20, 'id': 4},
-            {'x': 1450, 'y': 250, 'width': 250, 'height': 20, 'id': 5},
-            {'x': 1750, 'y': 400, 'width': 200, 'height': 20, 'id': 6},
-            {'x': 2000, 'y': 350, 'width': 180, 'height': 20, 'id': 7},
-            {'x': 2230, 'y': 300, 'width': 170, 'height': 20, 'id': 8},
-            {'x': 0, 'y': 480, 'width': self.level_width, 'height': 20, 'id': 0}
-        ]
-
-        self.enemies.append(Enemy(self, 450, 380, 2))
-        self.enemies.append(Enemy(self, 800, 330, 3))
-        self.enemies.append(Enemy(self, 1150, 280, 4))
-        self.enemies.append(Enemy(self, 1550, 230, 5))
-        self.enemies.append(Enemy(self, 1850, 380, 6))
-        self.enemies.append(Enemy(self, 2100, 330, 7))
-
-        self.pickups = [
-            Pickup(self, 380, 370, 'ammo'),
-            Pickup(self, 900, 270, 'health'),
-            Pickup(self, 1300, 220, 'ammo'),
-            Pickup(self, 1650, 170, 'health'),
-            Pickup(self, 1950, 320, 'ammo'),
-            Pickup(self, 2300, 270, 'health')
-        ]
-
-    def generate_level_3(self) -> None:
-
-        self.platforms = [
-            {'x': 0, 'y': 450, 'width': 300, 'height': 20, 'id': 1},
-            {'x': 350, 'y': 420, 'width': 280, 'height': 20, 'id': 2},
-            {'x': 680, 'y': 390, 'width': 260, 'height': 20, 'id': 3},
-            {'x': 990, 'y': 360, 'width': 240, 'height': 20, 'id': 4},
-            {'x': 1280, 'y': 330, 'width': 220, 'height': 20, 'id': 5},
-            {'x': 1550, 'y': 400, 'width': 200, 'height': 20, 'id': 6},
-            {'x': 1800, 'y': 280, 'width': 180, 'height': 20, 'id': 7},
-            {'x': 2030, 'y': 250, 'width': 160, 'height': 20, 'id': 8},
-            {'x': 2240, 'y': 350, 'width': 140, 'height': 20, 'id': 9},
-            {'x': 2430, 'y': 300, 'width': 120, 'height': 20, 'id': 10},
-            {'x': 2600, 'y': 400, 'width': 100, 'height': 20, 'id': 11},
-            {'x': 0, 'y': 480, 'width': self.level_width, 'height': 20, 'id': 0}
-        ]
-
-        self.enemies.append(Enemy(self, 400, 400, 2))
-        self.enemies.append(Enemy(self, 730, 370, 3))
-        self.enemies.append(Enemy(self, 1040, 340, 4))
-        self.enemies.append(Enemy(self, 1350, 310, 5))
-        self.enemies.append(Enemy(self, 1650, 380, 6))
-        self.enemies.append(Enemy(self, 1900, 260, 7))
-        self.enemies.append(Enemy(self, 2130, 230, 8))
-        self.enemies.append(Enemy(self, 2340, 330, 9))
-
-        self.pickups = [
-            Pickup(self, 320, 370, 'health'),
-            Pickup(self, 600, 310, 'ammo'),
-            Pickup(self, 950, 280, 'health'),
-            Pickup(self, 1250, 250, 'ammo'),
-            Pickup(self, 1600, 320, 'health'),
-            Pickup(self, 1850, 200, 'ammo'),
-            Pickup(self, 2100, 150, 'health'),
-            Pickup(self, 2400, 250, 'ammo')
-        ]
-
-    def update_camera(self) -> None:
-
-        if self.player:
-            self.camera_x = self.player.x - self.camera_width / 2
-            self.camera_x = max(0, min(self.camera_x, self.level_width - self.camera_width))
-
-    def update(self) -> None:
-
-        if self.game_state != GameState.PLAYING:
-            return
-
-        keys = pygame.key.get_pressed()
-
-        if self.player:
-            self.player.update(keys)
-            self.update_camera()
-
-
-            mouse_buttons = pygame.mouse.get_pressed()
-            current_time = pygame.time.get_ticks()
-
-            if mouse_buttons[0] and not self.mouse_pressed:
-
-                mouse_pos = pygame.mouse.get_pos()
-
-                self.player.shoot_mouse(mouse_pos)
-                self.mouse_pressed = True
-                self.last_mouse_press_time = current_time
-            elif not mouse_buttons[0]:
-                self.mouse_pressed = False
-
-            elif mouse_buttons[0] and self.mouse_pressed:
-                if current_time - self.last_mouse_press_time > self.player.weapons[self.player.current_weapon][
-                    'fire_rate']:
-                    mouse_pos = pygame.mouse.get_pos()
-                    self.player.shoot_mouse(mouse_pos)
-                    self.last_mouse_press_time = current_time
-
-        for enemy in self.enemies[:]:
-            enemy.update()
-
-            if self.player and self.check_collision(self.player, enemy):
-                self.player.take_damage(20)
-                enemy.x += enemy.direction * 10
-
-            if enemy.is_dead():
-                self.create_explosion(enemy.x + enemy.width / 2, enemy.y + enemy.height / 2)
-                self.enemies.remove(enemy)
-                self.score += 100
-
-        for bullet in self.bullets[:]:
-            bullet.update()
-            if bullet.is_out_of_bounds(self.level_width):
-                self.bullets.remove(bullet)
-
-        for pickup in self.pickups[:]:
-            if self.player and self.check_collision(self.player, pickup):
-                pickup.collect(self.player)
-                self.pickups.remove(pickup)
-
-        for particle in self.particles[:]:
-            particle.update()
-            if not particle.is_alive():
-                self.particles.remove(particle)
-
-        self.check_collisions()
-        self.update_ui()
-
-        if len(self.enemies) == 0:
-            self.level_complete()
-
-    def check_collisions(self) -> None:
-
-        for bullet in self.bullets[:]:
-            if not bullet.is_enemy:
-                for enemy in self.enemies[:]:
-                    if self.check_collision(bullet, enemy):
-                        enemy.take_damage(bullet.damage)
-                        if bullet in self.bullets:
-                            self.bullets.remove(bullet)
-                        break
-
-    def check_collision(self, obj1, obj2) -> bool:
-
-        rect1 = obj1.get_rect() if hasattr(obj1, 'get_rect') else pygame.Rect(obj1.x, obj1.y, obj1.width, obj1.height)
-        rect2 = obj2.get_rect() if hasattr(obj2, 'get_rect') else pygame.Rect(obj2.x, obj2.y, obj2.width, obj2.height)
-        return rect1.colliderect(rect2)
-
-    def create_explosion(self, x: float, y: float) -> None:
-
-        for _ in range(8):
-            self.particles.append(Particle(x, y))
-
-    def update_ui(self) -> None:
-
-        pass
-
-    def render(self) -> None:
-
-        self.screen.fill(DARK_BLUE)
-
-        if self.game_state == GameState.LOADING:
-            self.render_loading_screen()
-        elif self.game_state == GameState.PLAYING:
-            self.render_game()
-        elif self.game_state == GameState.MENU:
-            self.render_menu()
-        elif self.game_state == GameState.PAUSED:
-            self.render_game()
-            self.render_pause_screen()
-        elif self.game_state == GameState.GAME_OVER:
-            self.render_game()
-            self.render_game_over_screen()
-        elif self.game_state == GameState.WIN:
-            self.render_game()
-            self.render_win_screen()
-        elif self.game_state == GameState.LEVEL_COMPLETE:
-            self.render_game()
-            self.render_level_complete_screen()
-
-        pygame.display.flip()
-
-    def render_game(self) -> None:
-
-        clip_rect = self.screen.get_clip()
-        self.screen.set_clip(pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
-
-        self.render_background()
-
-        self.render_platforms()
-
-        for pickup in self.pickups:
-            pickup.draw(self.screen, self.camera_x)
-
-        for enemy in self.enemies:
-            enemy.draw(self.screen, self.camera_x)
-
-        for bullet in self.bullets:
-            bullet.draw(self.screen, self.camera_x)
-
-        for particle in self.particles:
-            particle.draw(self.screen, self.camera_x)
-
-        if self.player:
-            self.player.draw(self.screen, self.camera_x)
-
-        self.screen.set_clip(clip_rect)
-
-        self.render_ui()
-
-
-        if self.game_state == GameState.PLAYING:
-            mouse_pos = pygame.mouse.get_pos()
-            crosshair_size = 12
-            crosshair_color = (255, 255, 255, 180)
-
-
-            pygame.draw.line(
-                self.screen, crosshair_color,
-                (mouse_pos[0], mouse_pos[1] - crosshair_size),
-                (mouse_pos[0], mouse_pos[1] + crosshair_size),
-                2
-            )
-
-            pygame.draw.line(
-                self.screen, crosshair_color,
-                (mouse_pos[0] - crosshair_size, mouse_pos[1]),
-                (mouse_pos[0] + crosshair_size, mouse_pos[1]),
-                2
-            )
-
-
-            pygame.draw.circle(
-                self.screen, (255, 0, 0, 200),
-                mouse_pos, 3
-            )
-
-    def render_background(self) -> None:
-
-        background_sprite = self.sprite_manager.get_sprite('background')
-        if background_sprite:
-            for x in range(0, self.level_width, background_sprite.get_width()):
-                if x + background_sprite.get_width() > self.camera_x and x < self.camera_x + SCREEN_WIDTH:
-                    self.screen.blit(background_sprite, (x - self.camera_x, 0))
-        else:
-
-            self.screen.fill((15, 52, 96), (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
-
-    def render_platforms(self) -> None:
-
-        platform_sprite = self.sprite_manager.get_sprite('platform')
-        for platform in self.platforms:
-            if (platform['x'] + platform['width'] > self.camera_x and
-                    platform['x'] < self.camera_x + SCREEN_WIDTH):
-
-                if platform_sprite:
-
-                    for x_offset in range(0, platform['width'], platform_sprite.get_width()):
-                        draw_x = platform['x'] + x_offset - self.camera_x
-                        sprite_width = min(platform_sprite.get_width(), platform['width'] - x_offset)
-                        scaled_sprite = pygame.transform.scale(
-                            platform_sprite,
-                            (sprite_width, platform_sprite.get_height())
-                        )
-                        self.screen.blit(scaled_sprite, (draw_x, platform['y']))
-                else:
-
-                    pygame.draw.rect(
-                        self.screen,
-                        PLATFORM_COLOR,
-                        (
-                            int(platform['x'] - self.camera_x),
-                            int(platform['y']),
-                            platform['width'],
-                            platform['height']
-                        )
-                    )
-
-    def render_ui(self) -> None:
-
-        ui_rect = pygame.Rect(15, 15, 180, 140)
-
-        ui_surface = pygame.Surface((ui_rect.width, ui_rect.height), pygame.SRCALPHA)
-        ui_surface.fill((44, 62, 80, 200))
-        self.screen.blit(ui_surface, ui_rect)
-
-        pygame.draw.rect(self.screen, YELLOW, ui_rect, 3, border_radius=8)
-
-        texts = [
-            f"LEVEL: {self.level}",
-            f"LIVES: {self.lives}",
-            f"HEALTH: {self.player.health if self.player else 0}",
-            f"SCORE: {self.score:06d}",
-            f"AMMO: {self.player.weapons['pistol']['ammo'] if self.player else 0}",
-            f"ENEMIES: {len(self.enemies)}"
-        ]
-
-        colors = [YELLOW, RED, GREEN, BLUE, YELLOW, RED]
-
-        for i, (text, color) in enumerate(zip(texts, colors)):
-            text_surface = self.font_small.render(text, True, color)
-            self.screen.blit(text_surface, (30, 25 + i * 22))
-
-    def render_loading_screen(self) -> None:
-
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        self.screen.blit(overlay, (0, 0))
-
-        progress = self.sprite_manager.loaded_sprites / max(self.sprite_manager.total_sprites, 1)
-
-        loading_text = self.font_large.render(
-            f"LOADING: {self.sprite_manager.loaded_sprites}/{self.sprite_manager.total_sprites}",
-            True, WHITE
-        )
-        text_rect = loading_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 20))
-        self.screen.blit(loading_text, text_rect)
-
-        bar_width = 400
-        bar_height = 20
-        bar_x = SCREEN_WIDTH // 2 - bar_width // 2
-        bar_y = SCREEN_HEIGHT // 2 + 20
-
-        pygame.draw.rect(self.screen, (100, 100, 100), (bar_x, bar_y, bar_width, bar_height))
-        fill_width = int(bar_width * progress)
-        pygame.draw.rect(self.screen, GREEN, (bar_x, bar_y, fill_width, bar_height))
-        pygame.draw.rect(self.screen, WHITE, (bar_x, bar_y, bar_width, bar_height), 2)
-
-    def render_menu(self) -> None:
-
-        menu_rect = pygame.Rect(SCREEN_WIDTH // 2 - 200, SCREEN_HEIGHT // 2 - 150, 400, 300)
-
-        menu_surface = pygame.Surface((menu_rect.width, menu_rect.height), pygame.SRCALPHA)
-        menu_surface.fill((26, 26, 46, 200))
-        self.screen.blit(menu_surface, menu_rect)
-
-        pygame.draw.rect(self.screen, YELLOW, menu_rect, 5, border_radius=15)
-
-        title = self.font_large.render("🎮 CONTRA 🎮", True, YELLOW)
-        title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 100))
-        self.screen.blit(title, title_rect)
-
-        self.render_menu_buttons()
-
-    def render_menu_buttons(self) -> None:
-
-        start_btn = pygame.Rect(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2, 200, 50)
-        pygame.draw.rect(self.screen, RED, start_btn, border_radius=10)
-        pygame.draw.rect(self.screen, WHITE, start_btn, 3, border_radius=10)
-
-        start_text = self.font_medium.render("INSERT COIN", True, WHITE)
-        start_text_rect = start_text.get_rect(center=start_btn.center)
-        self.screen.blit(start_text, start_text_rect)
-
-        instr_btn = pygame.Rect(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 70, 200, 50)
-        pygame.draw.rect(self.screen, BLUE, instr_btn, border_radius=10)
-        pygame.draw.rect(self.screen, WHITE, instr_btn, 3, border_radius=10)
-
-        instr_text = self.font_medium.render("HOW TO PLAY", True, WHITE)
-        instr_text_rect = instr_text.get_rect(center=instr_btn.center)
-        self.screen.blit(instr_text, instr_text_rect)
-
-    def render_pause_screen(self) -> None:
-
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 128))
-        self.screen.blit(overlay, (0, 0))
-
-        pause_text = self.font_large.render("PAUSED", True, YELLOW)
-        pause_rect = pause_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 20))
-        self.screen.blit(pause_text, pause_rect)
-
-        continue_text = self.font_small.render("PRESS P TO CONTINUE", True, WHITE)
-        continue_rect = continue_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20))
-        self.screen.blit(continue_text, continue_rect)
-
-    def render_game_over_screen(self) -> None:
-
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        self.screen.blit(overlay, (0, 0))
-
-        game_over_text = self.font_large.render("GAME OVER", True, RED)
-        game_over_rect = game_over_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 40))
-        self.screen.blit(game_over_text, game_over_rect)
-
-        score_text = self.font_medium.render(f"FINAL SCORE: {self.score}", True, WHITE)
-        score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-        self.screen.blit(score_text, score_rect)
-
-        level_text = self.font_medium.render(f"LEVEL: {self.level}", True, WHITE)
-        level_rect = level_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 25))
-        self.screen.blit(level_text, level_rect)
-
-        menu_text = self.font_small.render("PRESS ESC FOR MENU", True, WHITE)
-        menu_rect = menu_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 60))
-        self.screen.blit(menu_text, menu_rect)
-
-    def render_win_screen(self) -> None:
-
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        self.screen.blit(overlay, (0, 0))
-
-        win_text = self.font_large.render("VICTORY!", True, GREEN)
-        win_rect = win_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
-        self.screen.blit(win_text, win_rect)
-
-        score_text = self.font_medium.render(f"FINAL SCORE: {self.score}", True, WHITE)
-        score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 20))
-        self.screen.blit(score_text, score_rect)
-
-        lives_text = self.font_medium.render(f"LIVES: {self.lives}", True, WHITE)
-        lives_rect = lives_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 5))
-        self.screen.blit(lives_text, lives_rect)
-
-        levels_text = self.font_medium.render(f"LEVELS: {self.max_level}", True, WHITE)
-        levels_rect = levels_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 30))
-        self.screen.blit(levels_text, levels_rect)
-
-        menu_text = self.font_small.render("PRESS ESC FOR MENU", True, WHITE)
-        menu_rect = menu_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 70))
-        self.screen.blit(menu_text, menu_rect)
-
-    def render_level_complete_screen(self) -> None:
-
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        self.screen.blit(overlay, (0, 0))
-
-        level_text = self.font_large.render("LEVEL COMPLETE!", True, GREEN)
-        level_rect = level_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 30))
-        self.screen.blit(level_text, level_rect)
-
-        score_text = self.font_medium.render(f"SCORE: {self.score}", True, YELLOW)
-        score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-        self.screen.blit(score_text, score_rect)
-
-        lives_text = self.font_medium.render(f"LIVES: {self.lives}", True, YELLOW)
-        lives_rect = lives_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 25))
-        self.screen.blit(lives_text, lives_rect)
-
-        continue_text = self.font_small.render("PRESS ANY KEY TO CONTINUE", True, WHITE)
-        continue_rect = continue_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 60))
-        self.screen.blit(continue_text, continue_rect)
-
-    def level_complete(self) -> None:
-        """Завершение уровня и переход к следующему"""
-        self.level += 1
-        if self.level <= self.max_level:
-            self.game_state = GameState.LEVEL_COMPLETE
-        else:
-            self.win_game()
-
-    def win_game(self) -> None:
-
-        self.game_state = GameState.WIN
-
-    def show_instructions(self) -> None:
-
-        temp_screen = self.screen.copy()
-
-        instructions_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        instructions_surface.fill((0, 0, 0, 220))
-
-        title = self.font_large.render("🎯 HOW TO PLAY", True, BLUE)
-        title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 100))
-        instructions_surface.blit(title, title_rect)
-
-        instructions = [
-            "←→ ARROWS: MOVE",
-            "SPACE/W/↑: JUMP",
-            "MOUSE: AIM",
-            "LEFT CLICK: SHOOT",
-            "P KEY: PAUSE",
-            "ESC: MENU",
-            "DESTROY ALL ENEMIES!"
-        ]
-
-        for i, instruction in enumerate(instructions):
-            text = self.font_medium.render(instruction, True, WHITE)
-            text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 40 + i * 30))
-            instructions_surface.blit(text, text_rect)
-
-        back_btn = pygame.Rect(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 100, 200, 50)
-        pygame.draw.rect(instructions_surface, RED, back_btn, border_radius=10)
-        pygame.draw.rect(instructions_surface, WHITE, back_btn, 3, border_radius=10)
-
-        back_text = self.font_medium.render("BACK", True, WHITE)
-        back_text_rect = back_text.get_rect(center=back_btn.center)
-        instructions_surface.blit(back_text, back_text_rect)
-
-        self.screen.blit(temp_screen, (0, 0))
-        self.screen.blit(instructions_surface, (0, 0))
-        pygame.display.flip()
-
-        waiting = True
-        while waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        waiting = False
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    if back_btn.collidepoint(event.pos):
-                        waiting = False
-
-        self.screen.blit(temp_screen, (0, 0))
-        pygame.display.flip()
-
-    def run(self) -> None:
-
-        running = True
-        showing_instructions = False
-
-        while running:
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-
-                elif event.type == pygame.KEYDOWN:
-                    self.handle_keydown(event)
-
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    showing_instructions = self.handle_mouse_click(event, showing_instructions)
-
-            if showing_instructions:
-                self.show_instructions()
-                showing_instructions = False
-
-            self.update()
-            self.render()
-
-            self.clock.tick(FPS)
-
-        pygame.quit()
-        sys.exit()
-
-    def handle_keydown(self, event: pygame.event.Event) -> None:
-
-        if event.key == pygame.K_ESCAPE:
-            self.handle_escape_key()
-        elif event.key == pygame.K_p:
-            self.handle_pause_key()
-        elif self.game_state == GameState.LEVEL_COMPLETE:
-            self.handle_level_complete_key(event)
-
-    def handle_escape_key(self) -> None:
-
-        if self.game_state == GameState.PLAYING:
-            self.game_state = GameState.MENU
-        elif self.game_state == GameState.PAUSED:
-            self.game_state = GameState.PLAYING
-        elif self.game_state in [GameState.GAME_OVER, GameState.WIN]:
-            self.game_state = GameState.MENU
-
-    def handle_pause_key(self) -> None:
-
-        if self.game_state == GameState.PLAYING:
-            self.game_state = GameState.PAUSED
-        elif self.game_state == GameState.PAUSED:
-            self.game_state = GameState.PLAYING
-
-    def handle_level_complete_key(self, event: pygame.event.Event) -> None:
-        if event.key not in [pygame.K_ESCAPE, pygame.K_p]:
-
-            self.game_state = GameState.LOADING
-            print(f"Загрузка спрайтов для уровня {self.level}...")
-
-
-            self.sprite_manager.reload_for_level(self.level, self.on_level_sprites_loaded)
-
-    def handle_mouse_click(self, event: pygame.event.Event, showing_instructions: bool) -> bool:
-
-        if self.game_state == GameState.MENU:
-            mouse_pos = pygame.mouse.get_pos()
-            start_btn = pygame.Rect(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2, 200, 50)
-            instr_btn = pygame.Rect(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 70, 200, 50)
-
-            if start_btn.collidepoint(mouse_pos):
-                self.start()
-            elif instr_btn.collidepoint(mouse_pos):
-                return True
-
+import pygame
+import math
+import random
+import os
+import sys
+import threading
+import time
+from enum import Enum
+from typing import Dict, List, Optional, Any, Tuple
+
+from .SpriteManager import SpriteManager
+from .SoundManager import SoundManager
+from .Player import Player
+from .Enemy import Enemy
+from .Bullet import Bullet
+from .Pickup import Pickup
+from .Particle import Particle
+from .ObjectPool import ObjectPool
+from .GcPolicy import GcPolicy
+from .SlotMap import SlotMap
+from .InputState import FrameInput
+from .InputRecorder import InputRecorder, InputReplay
+from .LevelGenerator import LevelGenerator
+from .ParallaxBackground import ParallaxBackground
+from .RenderTarget import RenderTarget
+from .AnimationClock import AnimationClock
+from .SweptCollision import sweep_rect
+from .SpatialGrid import build_column_grid, grid_collide_all
+from .FrameCapture import FrameCapture
+from .RenderSnapshot import RenderSnapshot, EntityViews
+from .SimulationThread import SimulationThread
+from .SaveState import SaveState
+from .RewindBuffer import RewindBuffer
+from .Netplay import RollbackSession
+from .QualityGovernor import QualityGovernor
+from .Metrics import MetricsRegistry, MetricsExporter
+from .MemoryAccounting import MemoryAccountant
+from .HordeMode import HordeDirector
+from .TextRenderer import TextRenderer
+
+SCREEN_WIDTH = 1200
+SCREEN_HEIGHT = 500
+FPS = 60
+
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+RED = (231, 76, 60)
+GREEN = (46, 204, 113)
+BLUE = (52, 152, 219)
+YELLOW = (241, 196, 15)
+DARK_BLUE = (44, 62, 80)
+PLATFORM_COLOR = (139, 69, 19)
+
+PARTNER_START_X = 90
+
+QUICK_SAVE_PATH = os.path.join('saves', 'quicksave.bin')
+# Быстрое сохранение и загрузка работают с файлом игрока - в записи сессий и при воспроизведении их нет
+SAVE_KEYS = (pygame.K_F5, pygame.K_F9)
+
+# Запас по краям экрана при отсечении сущностей перед отрисовкой
+CULL_MARGIN = 64
+# Сетка широкой фазы пуль игрока - только когда полный перебор дал бы больше проверок
+GRID_MIN_TESTS = 20000
+
+
+class GameState(Enum):
+    MENU = "menu"
+    PLAYING = "playing"
+    PAUSED = "paused"
+    GAME_OVER = "gameOver"
+    WIN = "win"
+    LEVEL_COMPLETE = "levelComplete"
+    LOADING = "loading"
+    HORDE = "horde"
+
+
+# Состояния, в которых идет игра: тики симуляции, прицел, пауза
+ACTIVE_STATES = (GameState.PLAYING, GameState.HORDE)
+
+
+class Game:
+    def __init__(self, gc_mode: str = 'default', record_path: Optional[str] = None,
+                 endless: bool = False, level_generator: Optional[LevelGenerator] = None,
+                 render_scale: float = 1.0, display_flags: int = 0,
+                 frame_capture: Optional[FrameCapture] = None, rewind_seconds: float = 10.0,
+                 adaptive_quality: bool = True, metrics_dir: Optional[str] = None,
+                 metrics_interval: float = 5.0, memory_report: bool = False, surface_budget_mb: float = 64.0,
+                 sprite_report: bool = False):
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), display_flags)
+        pygame.display.set_caption("КОНТРА - Аркадный Автомат")
+        self.clock = pygame.time.Clock()
+
+        self.render_target = RenderTarget(self.screen, render_scale)
+        self.present_display = True
+
+        self.metrics = MetricsRegistry()
+        self.metrics_exporter = MetricsExporter(self.metrics, metrics_dir, metrics_interval) if metrics_dir else None
+        self.register_metrics()
+
+        self.text = TextRenderer(metrics=self.metrics)
+        self.sprite_manager = SpriteManager(render_scale, self.metrics, self.text, sprite_report)
+        self.sound_manager = SoundManager()
+
+        self.game_state = GameState.LOADING
+
+        self.player: Optional[Player] = None
+        # Второй игрок сетевой игры; управляется partner_input
+        self.partner: Optional[Player] = None
+        self.enemies = SlotMap()
+        self.bullets = SlotMap()
+        self.platforms: List[Dict] = []
+        self.platform_index: Dict[int, Dict] = {}
+        self.pickups = SlotMap()
+        self.particles = SlotMap()
+
+        # Большие пулы - под режим орды с тысячами врагов и пуль
+        self.bullet_pool = ObjectPool(Bullet, 8192)
+        self.enemy_pool = ObjectPool(Enemy, 4096)
+        self.particle_pool = ObjectPool(Particle)
+        self.pickup_pool = ObjectPool(Pickup)
+        self.gc_policy = GcPolicy(gc_mode)
+
+        self.score = 0
+        self.lives = 3
+        self.level = 1
+        self.max_level = 3
+        self.endless = endless
+        self.level_generator = level_generator
+        # Режим орды: волны врагов вместо уровней
+        self.horde: Optional[HordeDirector] = None
+
+        self.camera_x = 0
+        self.camera_width = SCREEN_WIDTH
+        self.camera_height = SCREEN_HEIGHT
+
+        self.level_width = 2400
+        self.level_height = 500
+
+        self.background = ParallaxBackground([])
+        self.animation_clock = AnimationClock()
+        self.load_sprites()
+
+
+        self.mouse_pressed = False
+        self.last_mouse_press_time = 0
+
+        self.rng = random.Random()
+        self.seed = 0
+        self.ticks = 0
+        self.frame_input = FrameInput()
+        self.partner_input = FrameInput()
+        self.frame_keydowns: List[int] = []
+        self.recorder = InputRecorder(record_path) if record_path else None
+        self.frame_capture = frame_capture
+        # При записи сессии качество не меняем: число частиц взрыва попадает в воспроизведение
+        self.quality = QualityGovernor(1000.0 / FPS, enabled=adaptive_quality and not record_path)
+
+        # Перемотка: снимки последних rewind_seconds секунд (ключевые + дельты)
+        self.rewind = RewindBuffer(int(rewind_seconds * FPS)) if rewind_seconds > 0 else None
+
+        # Конвейерный режим: тики в потоке симуляции, отрисовка снимков в главном потоке
+        self.sim_lock = threading.Lock()
+        self.entity_views = EntityViews(self)
+
+        # Учет памяти: отчет на каждом LEVEL_COMPLETE и бюджет памяти поверхностей
+        self.memory = MemoryAccountant(self, surface_budget_mb) if memory_report else None
+
+    def register_metrics(self) -> None:
+
+        metrics = self.metrics
+        self.metric_ticks = metrics.counter('ticks_total', "Тики симуляции")
+        self.metric_frames = metrics.counter('frames_total', "Отрисованные кадры")
+        self.metric_update_seconds = metrics.histogram('update_seconds', "Время Game.update")
+        self.metric_render_seconds = metrics.histogram('render_seconds', "Время Game.render")
+        self.metric_fps = metrics.gauge('fps', "FPS по clock.tick")
+        self.metric_broad_tests = metrics.counter('collision_broadphase_tests_total',
+                                                  "Проверки прямоугольников (широкая фаза)")
+        self.metric_narrow_tests = metrics.counter('collision_narrowphase_tests_total',
+                                                   "Попиксельные и swept-проверки (узкая фаза)")
+        self.metric_tests_per_tick = metrics.gauge('collision_tests_per_tick', "Проверки столкновений за последний тик")
+        self.metric_enemies = metrics.gauge('enemies', "Живые враги")
+        self.metric_bullets = metrics.gauge('bullets', "Живые пули")
+        self.metric_particles = metrics.gauge('particles', "Живые частицы")
+        self.metric_quality = metrics.gauge('quality_level', "Уровень снижения качества (0 - полное)")
+        self.metric_enemy_seconds = metrics.histogram('enemy_update_seconds', "Время обновления врагов за тик")
+        self.metric_bullet_seconds = metrics.histogram('bullet_update_seconds', "Время движения пуль за тик")
+        self.metric_collision_seconds = metrics.histogram('collision_seconds', "Время проверки попаданий за тик")
+        self.metric_removal_seconds = metrics.histogram('removal_seconds', "Время удаления сущностей за тик")
+
+    def load_sprites(self) -> None:
+
+        print("Начинаем загрузку спрайтов...")
+        self.sound_manager.load_all_sounds()
+        self.sprite_manager.load_all_sprites(self.on_sprites_loaded)
+
+    def on_sprites_loaded(self) -> None:
+
+        print("Все спрайты загружены!")
+        self.background = ParallaxBackground.from_sprites(self.sprite_manager, self.render_target.height)
+        self.animation_clock.bind(self.sprite_manager)
+        self.game_state = GameState.MENU
+
+    def on_level_sprites_loaded(self) -> None:
+
+        print(f"Спрайты для уровня {self.level} загружены!")
+        self.background = ParallaxBackground.from_sprites(self.sprite_manager, self.render_target.height)
+        self.animation_clock.bind(self.sprite_manager)
+        if self.memory:
+            self.memory.check_budget()
+        self.generate_level()
+        if self.player:
+            self.player.x = 50
+            self.player.y = 400
+            self.player.sync_rect()
+        if self.partner:
+            self.partner.x = PARTNER_START_X
+            self.partner.y = 400
+            self.partner.sync_rect()
+        self.camera_x = 0
+        if self.rewind is not None:
+            self.rewind.clear()
+        self.game_state = GameState.PLAYING
+
+    def start(self, seed: Optional[int] = None) -> None:
+
+        if not self.sprite_manager.is_loading_complete():
+            print("Еще не все спрайты загружены!")
+            return
+
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.rng.seed(self.seed)
+        self.mouse_pressed = False
+        self.last_mouse_press_time = 0
+        self.frame_keydowns = []
+
+        if self.recorder and not self.recorder.finished and not self.recorder.is_recording():
+            self.recorder.begin(self.seed)
+
+        self.game_state = GameState.PLAYING
+        self.score = 0
+        self.lives = 3
+        self.level = 1
+        self.player = Player(self)
+        self.partner = None
+        self.horde = None
+        self.generate_level()
+        if self.rewind is not None:
+            self.rewind.clear()
+
+    def start_horde(self, seed: Optional[int] = None, **options) -> None:
+        """Режим орды на платформах первого уровня; options - параметры HordeDirector"""
+        self.start(seed)
+        if self.game_state != GameState.PLAYING:
+            return
+
+        self.enemy_pool.release_all(self.enemies)
+        self.enemies.clear()
+        self.horde = HordeDirector(self, **options)
+        self.game_state = GameState.HORDE
+        print("Режим орды: продержитесь как можно дольше!")
+
+    def play_state(self) -> GameState:
+        """Состояние, в которое игра возвращается после паузы"""
+        return GameState.HORDE if self.horde else GameState.PLAYING
+
+    def add_partner(self) -> None:
+        """Второй игрок для сетевой игры; вызывается после start()"""
+        self.partner = Player(self)
+        self.partner.x = PARTNER_START_X
+        self.partner.sync_rect()
+
+    def generate_level(self) -> None:
+
+        self.bullet_pool.release_all(self.bullets)
+        self.enemy_pool.release_all(self.enemies)
+        self.pickup_pool.release_all(self.pickups)
+        self.particle_pool.release_all(self.particles)
+
+        self.enemies.clear()
+        self.bullets.clear()
+        # Новый список, а не clear(): снимки отрисовки хранят ссылку на платформы
+        self.set_platforms([])
+        self.pickups.clear()
+        self.particles.clear()
+        self.animation_clock.reset()
+
+        self.level_width = 2000 + (self.level * 400)
+
+        if self.level_generator:
+            self.generate_level_procedural(self.level_generator)
+        elif self.level == 1:
+            self.generate_level_1()
+        elif self.level == 2:
+            self.generate_level_2()
+        elif self.level == 3:
+            self.generate_level_3()
+        else:
+            self.generate_level_procedural(LevelGenerator.for_level(self.seed, self.level))
+
+        self.update_camera()
+        self.update_ui()
+
+    def set_platforms(self, platforms: List[Dict]) -> None:
+
+        self.platforms = platforms
+        self.platform_index = {platform['id']: platform for platform in platforms}
+
+    def generate_level_1(self) -> None:
+
+        self.set_platforms([
+            {'x': 0, 'y': 450, 'width': 400, 'height': 20, 'id': 1},
+            {'x': 450, 'y': 400, 'width': 300, 'height': 20, 'id': 2},
+            {'x': 800, 'y': 350, 'width': 250, 'height': 20, 'id': 3},
+            {'x': 1100, 'y': 300, 'width': 300, 'height': 20, 'id': 4},
+            {'x': 1500, 'y': 400, 'width': 300, 'height': 20, 'id': 5},
+            {'x': 1900, 'y': 350, 'width': 200, 'height': 20, 'id': 6},
+            {'x': 0, 'y': 480, 'width': self.level_width, 'height': 20, 'id': 0}
+        ])
+
+        self.enemies.add(self.enemy_pool.acquire(self, 500, 380, 2))
+        self.enemies.add(self.enemy_pool.acquire(self, 850, 330, 3))
+        self.enemies.add(self.enemy_pool.acquire(self, 1200, 280, 4))
+        self.enemies.add(self.enemy_pool.acquire(self, 1600, 380, 5))
+
+        self.pickups.extend([
+            self.pickup_pool.acquire(self, 420, 370, 'health'),
+            self.pickup_pool.acquire(self, 700, 320, 'ammo'),
+            self.pickup_pool.acquire(self, 1250, 270, 'health'),
+            self.pickup_pool.acquire(self, 1700, 370, 'ammo')
+        ])
+
+    def generate_level_2(self) -> None:
+
+        self.set_platforms([
+            {'x': 0, 'y': 450, 'width': 350, 'height': 20, 'id': 1},
+            {'x': 400, 'y': 400, 'width': 300, 'height': 20, 'id': 2},
+            {'x': 750, 'y': 350, 'width': 280, 'height': 20, 'id': 3},
+            {'x': 1080, 'y': 300, 'width': 320, 'height': 20, 'id': 4},
+            {'x': 1450, 'y': 250, 'width': 250, 'height': 20, 'id': 5},
+            {'x': 1750, 'y': 400, 'width': 200, 'height': 20, 'id': 6},
+            {'x': 2000, 'y': 350, 'width': 180, 'height': 20, 'id': 7},
+            {'x': 2230, 'y': 300, 'width': 170, 'height': 20, 'id': 8},
+            {'x': 0, 'y': 480, 'width': self.level_width, 'height': 20, 'id': 0}
+        ])
+
+        self.enemies.add(self.enemy_pool.acquire(self, 450, 380, 2))
+        self.enemies.add(self.enemy_pool.acquire(self, 800, 330, 3))
+        self.enemies.add(self.enemy_pool.acquire(self, 1150, 280, 4))
+        self.enemies.add(self.enemy_pool.acquire(self, 1550, 230, 5))
+        self.enemies.add(self.enemy_pool.acquire(self, 1850, 380, 6))
+        self.enemies.add(self.enemy_pool.acquire(self, 2100, 330, 7))
+
+        self.pickups.extend([
+            self.pickup_pool.acquire(self, 380, 370, 'ammo'),
+            self.pickup_pool.acquire(self, 900, 270, 'health'),
+            self.pickup_pool.acquire(self, 1300, 220, 'ammo'),
+            self.pickup_pool.acquire(self, 1650, 170, 'health'),
+            self.pickup_pool.acquire(self, 1950, 320, 'ammo'),
+            self.pickup_pool.acquire(self, 2300, 270, 'health')
+        ])
+
+    def generate_level_3(self) -> None:
+
+        self.set_platforms([
+            {'x': 0, 'y': 450, 'width': 300, 'height': 20, 'id': 1},
+            {'x': 350, 'y': 420, 'width': 280, 'height': 20, 'id': 2},
+            {'x': 680, 'y': 390, 'width': 260, 'height': 20, 'id': 3},
+            {'x': 990, 'y': 360, 'width': 240, 'height': 20, 'id': 4},
+            {'x': 1280, 'y': 330, 'width': 220, 'height': 20, 'id': 5},
+            {'x': 1550, 'y': 400, 'width': 200, 'height': 20, 'id': 6},
+            {'x': 1800, 'y': 280, 'width': 180, 'height': 20, 'id': 7},
+            {'x': 2030, 'y': 250, 'width': 160, 'height': 20, 'id': 8},
+            {'x': 2240, 'y': 350, 'width': 140, 'height': 20, 'id': 9},
+            {'x': 2430, 'y': 300, 'width': 120, 'height': 20, 'id': 10},
+            {'x': 2600, 'y': 400, 'width': 100, 'height': 20, 'id': 11},
+            {'x': 0, 'y': 480, 'width': self.level_width, 'height': 20, 'id': 0}
+        ])
+
+        self.enemies.add(self.enemy_pool.acquire(self, 400, 400, 2))
+        self.enemies.add(self.enemy_pool.acquire(self, 730, 370, 3))
+        self.enemies.add(self.enemy_pool.acquire(self, 1040, 340, 4))
+        self.enemies.add(self.enemy_pool.acquire(self, 1350, 310, 5))
+        self.enemies.add(self.enemy_pool.acquire(self, 1650, 380, 6))
+        self.enemies.add(self.enemy_pool.acquire(self, 1900, 260, 7))
+        self.enemies.add(self.enemy_pool.acquire(self, 2130, 230, 8))
+        self.enemies.add(self.enemy_pool.acquire(self, 2340, 330, 9))
+
+        self.pickups.extend([
+            self.pickup_pool.acquire(self, 320, 370, 'health'),
+            self.pickup_pool.acquire(self, 600, 310, 'ammo'),
+            self.pickup_pool.acquire(self, 950, 280, 'health'),
+            self.pickup_pool.acquire(self, 1250, 250, 'ammo'),
+            self.pickup_pool.acquire(self, 1600, 320, 'health'),
+            self.pickup_pool.acquire(self, 1850, 200, 'ammo'),
+            self.pickup_pool.acquire(self, 2100, 150, 'health'),
+            self.pickup_pool.acquire(self, 2400, 250, 'ammo')
+        ])
+
+    def generate_level_procedural(self, generator: LevelGenerator) -> None:
+
+        layout = generator.generate()
+
+        self.level_width = layout.width
+        self.set_platforms(layout.platforms)
+
+        for x, platform_id in layout.enemies:
+            self.enemies.add(self.enemy_pool.acquire(self, x, 0, platform_id))
+
+        self.pickups.extend(self.pickup_pool.acquire(self, x, y, type_) for x, y, type_ in layout.pickups)
+
+    def update_camera(self) -> None:
+
+        if self.player:
+            # В сетевой игре камера общая - между игроками
+            focus_x = (self.player.x + self.partner.x) / 2 if self.partner else self.player.x
+            self.camera_x = focus_x - self.camera_width / 2
+            self.camera_x = max(0, min(self.camera_x, self.level_width - self.camera_width))
+
+    def update(self) -> None:
+
+        if self.game_state not in ACTIVE_STATES:
+            return
+
+        started = time.perf_counter()
+        tests_before = self.metric_broad_tests.value + self.metric_narrow_tests.value
+
+        self.update_playing()
+
+        self.metric_update_seconds.observe(time.perf_counter() - started)
+        self.metric_ticks.inc()
+        self.metric_tests_per_tick.set(self.metric_broad_tests.value + self.metric_narrow_tests.value - tests_before)
+        self.metric_enemies.set(len(self.enemies))
+        self.metric_bullets.set(len(self.bullets))
+        self.metric_particles.set(len(self.particles))
+
+    def update_playing(self) -> None:
+
+        # В орде тысячи сущностей - снимки для перемотки не пишем
+        recording = self.rewind is not None and not self.horde
+        if recording and self.frame_input.keys[pygame.K_BACKSPACE]:
+            self.rewind_frames(-1)
+            return
+
+        self.animation_clock.advance()
+        if self.horde:
+            self.horde.update()
+
+        keys = self.frame_input.keys
+
+        if self.player:
+            self.player.update(keys)
+            if self.partner:
+                self.partner.update(self.partner_input.keys)
+            self.update_camera()
+
+
+            mouse_buttons = self.frame_input.mouse_buttons
+            current_time = self.ticks
+
+            if mouse_buttons[0] and not self.mouse_pressed:
+
+                mouse_pos = self.frame_input.mouse_pos
+
+                self.player.shoot_mouse(mouse_pos)
+                self.mouse_pressed = True
+                self.last_mouse_press_time = current_time
+            elif not mouse_buttons[0]:
+                self.mouse_pressed = False
+
+            elif mouse_buttons[0] and self.mouse_pressed:
+                if current_time - self.last_mouse_press_time > self.player.weapons[self.player.current_weapon][
+                    'fire_rate']:
+                    mouse_pos = self.frame_input.mouse_pos
+                    self.player.shoot_mouse(mouse_pos)
+                    self.last_mouse_press_time = current_time
+
+            # Темп стрельбы второго игрока ограничивает shoot_mouse
+            if self.partner and self.partner_input.mouse_buttons[0]:
+                self.partner.shoot_mouse(self.partner_input.mouse_pos)
+
+        perf_counter = time.perf_counter
+        started = perf_counter()
+        Enemy.update_patrol_batch(self.enemies)
+
+        enemies = self.enemies.items
+        enemy_rects = [enemy.rect for enemy in enemies]
+
+        players = (self.player, self.partner) if self.partner else (self.player,)
+
+        for player in players:
+            if not player:
+                continue
+            hits = player.rect.collidelistall(enemy_rects)
+            self.metric_broad_tests.inc(len(enemy_rects))
+            self.metric_narrow_tests.inc(len(hits))
+            for index in hits:
+                enemy = enemies[index]
+                if not self.check_pixel_collision(player, enemy):
+                    continue
+                player.take_damage(20)
+                enemy.x += enemy.direction * 10
+                enemy.sync_rect()
+
+        # То же, что enemy.is_dead(), без вызова метода на каждого из тысяч врагов
+        for enemy in enemies:
+            if enemy.health <= 0:
+                self.create_explosion(enemy.x + enemy.width / 2, enemy.y + enemy.height / 2)
+                self.enemies.discard(enemy)
+                self.score += 100
+
+        bullets_started = perf_counter()
+        self.metric_enemy_seconds.observe(bullets_started - started)
+        friendly, hostile = Bullet.update_batch(self.bullets, self.level_width)
+        collisions_started = perf_counter()
+        self.metric_bullet_seconds.observe(collisions_started - bullets_started)
+
+        if hostile:
+            self.check_enemy_bullets(players, hostile)
+
+        for player in players:
+            if not player or not self.pickups:
+                continue
+            pickups = self.pickups.items
+            for index in player.rect.collidelistall([pickup.rect for pickup in pickups]):
+                if not self.pickups.is_pending(pickups[index]):
+                    pickups[index].collect(player)
+                    self.pickups.discard(pickups[index])
+
+        for particle in self.particles:
+            particle.update()
+            if not particle.is_alive():
+                self.particles.discard(particle)
+
+        self.check_collisions(enemy_rects, friendly)
+        removal_started = perf_counter()
+        self.metric_collision_seconds.observe(removal_started - collisions_started)
+        self.flush_removals()
+        self.metric_removal_seconds.observe(perf_counter() - removal_started)
+        self.update_ui()
+
+        if len(self.enemies) == 0 and not self.horde:
+            self.level_complete()
+
+        if recording:
+            self.rewind.record(self.save_state())
+
+    def check_collisions(self, enemy_rects: Optional[List[pygame.Rect]] = None,
+                         friendly: Optional[List[Bullet]] = None) -> None:
+        """Попадания пуль игроков во врагов; friendly - пули игроков, еще не помеченные на удаление"""
+        enemies = self.enemies.items
+        if not enemies:
+            return
+        is_pending = self.enemies.is_pending
+        if enemy_rects is None:
+            enemy_rects = [enemy.rect for enemy in enemies]
+
+        bullets = self.bullets
+        if friendly is None:
+            friendly = [bullet for bullet in bullets if not bullet.is_enemy and not bullets.is_pending(bullet)]
+
+        # Много пуль против многих врагов (орда) - широкая фаза по столбцам сетки
+        grid = None
+        if len(friendly) * len(enemy_rects) > GRID_MIN_TESTS:
+            grid = build_column_grid(enemy_rects)
+
+        broad_tests = 0
+        narrow_tests = 0
+        for bullet in friendly:
+            # Широкая фаза - путь пули за тик против врагов одним вызовом C
+            if grid is None:
+                hits = bullet.sweep.collidelistall(enemy_rects)
+                broad_tests += len(enemy_rects)
+            else:
+                hits, tests = grid_collide_all(grid, bullet.sweep)
+                broad_tests += tests
+            narrow_tests += len(hits)
+
+            target = None
+            target_time = 2.0
+            for index in hits:
+                # Убитые в этом тике враги остаются в списке до flush_removals
+                if is_pending(enemies[index]):
+                    continue
+                hit_time = self.check_swept_hit(bullet, enemies[index])
+                if hit_time is not None and hit_time < target_time:
+                    target = enemies[index]
+                    target_time = hit_time
+
+            if target:
+                target.take_damage(bullet.damage)
+                bullets.discard(bullet)
+
+        self.metric_broad_tests.inc(broad_tests)
+        self.metric_narrow_tests.inc(narrow_tests)
+
+    def check_enemy_bullets(self, players: Tuple[Player, ...], hostile: List[Bullet]) -> None:
+        """Попадания пуль врагов в игроков: прямоугольники всех пуль - одним вызовом C на игрока"""
+        bullet_rects = [bullet.rect for bullet in hostile]
+        for player in players:
+            if not player:
+                continue
+            hits = player.rect.collidelistall(bullet_rects)
+            self.metric_broad_tests.inc(len(bullet_rects))
+            self.metric_narrow_tests.inc(len(hits))
+            for index in hits:
+                bullet = hostile[index]
+                if self.bullets.is_pending(bullet) or not self.check_pixel_collision(player, bullet):
+                    continue
+                player.take_damage(bullet.damage)
+                self.bullets.discard(bullet)
+
+    def check_swept_hit(self, bullet, enemy) -> Optional[float]:
+        """Момент первого попадания пули во врага за тик (доля шага) или None"""
+        dx = bullet.x - bullet.prev_x
+        dy = bullet.y - bullet.prev_y
+        interval = sweep_rect(bullet.prev_x, bullet.prev_y, dx, dy, bullet.width, bullet.height, enemy.rect)
+        if interval is None:
+            return None
+
+        t_enter, t_exit = interval
+        enemy_mask = enemy.get_mask()
+        if enemy_mask is None:
+            return t_enter
+
+        # Маски проверяем вдоль отрезка с шагом не больше меньшей стороны пули
+        bullet_mask = bullet.get_mask()
+        distance = math.hypot(dx, dy) * (t_exit - t_enter)
+        steps = max(1, math.ceil(distance / min(bullet.width, bullet.height)))
+        for step in range(steps + 1):
+            t = t_enter + (t_exit - t_enter) * step / steps
+            offset = (int(bullet.prev_x + dx * t) - enemy.rect.x, int(bullet.prev_y + dy * t) - enemy.rect.y)
+            if enemy_mask.overlap(bullet_mask, offset) is not None:
+                return t
+        return None
+
+    def flush_removals(self) -> None:
+        """Удаляем помеченные за тик сущности и возвращаем их в пулы"""
+        self.enemies.flush(self.enemy_pool.release)
+        self.bullets.flush(self.bullet_pool.release)
+        self.pickups.flush(self.pickup_pool.release)
+        self.particles.flush(self.particle_pool.release)
+
+    def check_pixel_collision(self, obj1, obj2) -> bool:
+        """Попиксельная проверка пары с уже пересекшимися прямоугольниками"""
+        mask1 = obj1.get_mask()
+        mask2 = obj2.get_mask()
+        if mask1 is None or mask2 is None:
+            return True
+        offset = (obj2.rect.x - obj1.rect.x, obj2.rect.y - obj1.rect.y)
+        return mask1.overlap(mask2, offset) is not None
+
+    def create_explosion(self, x: float, y: float) -> None:
+
+        for _ in range(self.quality.explosion_particles):
+            self.particles.add(self.particle_pool.acquire(x, y, self.rng))
+        self.sound_manager.play('explosion', self.ticks)
+
+    def update_ui(self) -> None:
+
+        pass
+
+    def render(self, snapshot: Optional[RenderSnapshot] = None) -> None:
+        """snapshot - снимок мира из потока симуляции; без него рисуем живое состояние"""
+        started = time.perf_counter()
+        self.screen.fill(DARK_BLUE)
+
+        game_state = snapshot.game_state if snapshot else self.game_state
+
+        if game_state == GameState.LOADING:
+            self.render_loading_screen()
+        elif game_state in ACTIVE_STATES:
+            self.render_game(snapshot)
+        elif game_state == GameState.MENU:
+            self.render_menu()
+        elif game_state == GameState.PAUSED:
+            self.render_game(snapshot)
+            self.render_pause_screen()
+        elif game_state == GameState.GAME_OVER:
+            self.render_game(snapshot)
+            self.render_game_over_screen()
+        elif game_state == GameState.WIN:
+            self.render_game(snapshot)
+            self.render_win_screen()
+        elif game_state == GameState.LEVEL_COMPLETE:
+            self.render_game(snapshot)
+            self.render_level_complete_screen()
+
+        if self.frame_capture:
+            self.frame_capture.capture(self.screen)
+
+        if self.present_display:
+            pygame.display.flip()
+
+        self.metric_render_seconds.observe(time.perf_counter() - started)
+        self.metric_frames.inc()
+        self.metric_fps.set(self.clock.get_fps())
+        self.metric_quality.set(self.quality.level)
+        if self.metrics_exporter:
+            self.metrics_exporter.maybe_flush()
+
+    def use_offscreen_surface(self) -> None:
+        """Рисуем во внеэкранную поверхность без вывода на дисплей (замеры, захват)"""
+        self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        self.render_target = RenderTarget(self.screen, self.render_target.scale)
+        self.present_display = False
+
+    def render_game(self, snapshot: Optional[RenderSnapshot] = None) -> None:
+
+        world = self.render_target.surface
+        scale = self.render_target.scale
+        camera_x = snapshot.camera_x if snapshot else self.camera_x
+        platforms = snapshot.platforms if snapshot else self.platforms
+
+        clip_rect = world.get_clip()
+        world.set_clip(pygame.Rect(0, 0, self.render_target.width, self.render_target.height))
+
+        self.render_background(world, camera_x)
+
+        self.render_platforms(world, scale, camera_x, platforms)
+
+        if snapshot:
+            snapshot.draw_entities(world, scale, self.entity_views)
+        else:
+            self.render_entities(world, scale)
+
+        world.set_clip(clip_rect)
+
+        self.render_target.present()
+
+        self.render_ui(snapshot.hud if snapshot else None)
+
+        game_state = snapshot.game_state if snapshot else self.game_state
+        if game_state in ACTIVE_STATES:
+            mouse_pos = snapshot.mouse_pos if snapshot else self.frame_input.mouse_pos
+            crosshair_size = 12
+            crosshair_color = (255, 255, 255, 180)
+
+
+            pygame.draw.line(
+                self.screen, crosshair_color,
+                (mouse_pos[0], mouse_pos[1] - crosshair_size),
+                (mouse_pos[0], mouse_pos[1] + crosshair_size),
+                2
+            )
+
+            pygame.draw.line(
+                self.screen, crosshair_color,
+                (mouse_pos[0] - crosshair_size, mouse_pos[1]),
+                (mouse_pos[0] + crosshair_size, mouse_pos[1]),
+                2
+            )
+
+
+            pygame.draw.circle(
+                self.screen, (255, 0, 0, 200),
+                mouse_pos, 3
+            )
+
+    def cull_bounds(self) -> Tuple[float, float]:
+        """Границы по x, вне которых сущности не рисуются и не попадают в снимок отрисовки"""
+        # Сущности за краями экрана не рисуем - в орде это больше половины уровня
+        return self.camera_x - CULL_MARGIN, self.camera_x + self.camera_width + CULL_MARGIN
+
+    def render_entities(self, world: pygame.Surface, scale: float) -> None:
+
+        camera_x = self.camera_x
+        left, right = self.cull_bounds()
+
+        for pickup in self.pickups:
+            if left < pickup.x < right:
+                pickup.draw(world, camera_x, scale)
+
+        enemy_frames = self.animation_clock.frames['enemyWalk']
+        if self.quality.use_sprites:
+            Enemy.draw_batch(world, self.enemies.items, camera_x, scale, left, right, enemy_frames,
+                             self.animation_clock.mirrored['enemyWalk'])
+        else:
+            for enemy in self.enemies:
+                if left < enemy.x < right:
+                    enemy.draw(world, camera_x, scale, enemy_frames)
+
+        Bullet.draw_batch(world, self.bullets.items, camera_x, scale, left, right, self.sprite_manager)
+
+        for particle in self.particles:
+            if left < particle.x < right:
+                particle.draw(world, camera_x, scale)
+
+        if self.partner:
+            self.partner.draw(world, self.camera_x, scale)
+
+        if self.player:
+            self.player.draw(world, self.camera_x, scale)
+
+    def render_background(self, world: pygame.Surface, camera_x: float) -> None:
+
+        self.background.draw(world, camera_x * self.render_target.scale,
+                             self.render_target.width, self.render_target.height, self.quality.background_layers)
+
+    def render_platforms(self, world: pygame.Surface, scale: float, camera_x: float, platforms: List[Dict]) -> None:
+
+        platform_sprite = self.sprite_manager.get_sprite('platform')
+        for platform in platforms:
+            if (platform['x'] + platform['width'] > camera_x and
+                    platform['x'] < camera_x + SCREEN_WIDTH):
+
+                draw_x = int((platform['x'] - camera_x) * scale)
+                draw_y = int(platform['y'] * scale)
+                width = int(platform['width'] * scale)
+
+                if platform_sprite:
+
+                    # Последний тайл обрезаем через area вместо масштабирования каждый кадр
+                    tile_width = platform_sprite.get_width()
+                    tile_height = platform_sprite.get_height()
+                    for x_offset in range(0, width, tile_width):
+                        sprite_width = min(tile_width, width - x_offset)
+                        world.blit(platform_sprite, (draw_x + x_offset, draw_y),
+                                   (0, 0, sprite_width, tile_height))
+                else:
+
+                    pygame.draw.rect(
+                        world,
+                        PLATFORM_COLOR,
+                        (
+                            draw_x,
+                            draw_y,
+                            width,
+                            int(platform['height'] * scale)
+                        )
+                    )
+
+    def hud_values(self) -> Tuple[str, int, int, int, int, int, int]:
+        """Значения интерфейса: подпись и номер уровня (волны), жизни, здоровье, счет, патроны, враги"""
+        player = self.player
+        return ("WAVE: " if self.horde else "LEVEL: ", self.horde.wave if self.horde else self.level, self.lives,
+                player.health if player else 0, self.score,
+                player.weapons['pistol']['ammo'] if player else 0, len(self.enemies))
+
+    def render_ui(self, hud: Optional[Tuple] = None) -> None:
+        """hud - значения из снимка отрисовки; без него берем живое состояние"""
+        level_label, level, lives, health, score, ammo, enemies = hud or self.hud_values()
+
+        ui_rect = pygame.Rect(15, 15, 180, 140)
+
+        ui_surface = pygame.Surface((ui_rect.width, ui_rect.height), pygame.SRCALPHA)
+        ui_surface.fill((44, 62, 80, 200))
+        self.screen.blit(ui_surface, ui_rect)
+
+        pygame.draw.rect(self.screen, YELLOW, ui_rect, 3, border_radius=8)
+
+        # (подпись, значение, цвет, число знаков); значения собираются из глифов цифр
+        fields = [
+            (level_label, level, YELLOW, 0),
+            ("LIVES: ", lives, RED, 0),
+            ("HEALTH: ", health, GREEN, 0),
+            ("SCORE: ", score, BLUE, 6),
+            ("AMMO: ", ammo, YELLOW, 0),
+            ("ENEMIES: ", enemies, RED, 0)
+        ]
+
+        for i, (label, value, color, digits) in enumerate(fields):
+            self.text.draw_field(self.screen, 'small', label, value, color, (30, 25 + i * 22), digits)
+
+    def render_loading_screen(self) -> None:
+
+        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 200))
+        self.screen.blit(overlay, (0, 0))
+
+        progress = self.sprite_manager.loaded_sprites / max(self.sprite_manager.total_sprites, 1)
+
+        self.text.draw(self.screen, 'large',
+                       f"LOADING: {self.sprite_manager.loaded_sprites}/{self.sprite_manager.total_sprites}",
+                       WHITE, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 20))
+
+        bar_width = 400
+        bar_height = 20
+        bar_x = SCREEN_WIDTH // 2 - bar_width // 2
+        bar_y = SCREEN_HEIGHT // 2 + 20
+
+        pygame.draw.rect(self.screen, (100, 100, 100), (bar_x, bar_y, bar_width, bar_height))
+        fill_width = int(bar_width * progress)
+        pygame.draw.rect(self.screen, GREEN, (bar_x, bar_y, fill_width, bar_height))
+        pygame.draw.rect(self.screen, WHITE, (bar_x, bar_y, bar_width, bar_height), 2)
+
+    def render_menu(self) -> None:
+
+        menu_rect = pygame.Rect(SCREEN_WIDTH // 2 - 200, SCREEN_HEIGHT // 2 - 150, 400, 300)
+
+        menu_surface = pygame.Surface((menu_rect.width, menu_rect.height), pygame.SRCALPHA)
+        menu_surface.fill((26, 26, 46, 200))
+        self.screen.blit(menu_surface, menu_rect)
+
+        pygame.draw.rect(self.screen, YELLOW, menu_rect, 5, border_radius=15)
+
+        self.text.draw(self.screen, 'large', "🎮 CONTRA 🎮", YELLOW, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 100))
+
+        self.render_menu_buttons()
+
+    def render_menu_buttons(self) -> None:
+
+        start_btn = pygame.Rect(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2, 200, 50)
+        pygame.draw.rect(self.screen, RED, start_btn, border_radius=10)
+        pygame.draw.rect(self.screen, WHITE, start_btn, 3, border_radius=10)
+
+        self.text.draw(self.screen, 'medium', "INSERT COIN", WHITE, start_btn.center)
+
+        instr_btn = pygame.Rect(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 70, 200, 50)
+        pygame.draw.rect(self.screen, BLUE, instr_btn, border_radius=10)
+        pygame.draw.rect(self.screen, WHITE, instr_btn, 3, border_radius=10)
+
+        self.text.draw(self.screen, 'medium', "HOW TO PLAY", WHITE, instr_btn.center)
+        self.text.draw(self.screen, 'small', "H: HORDE MODE", YELLOW, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 135))
+
+    def render_pause_screen(self) -> None:
+
+        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 128))
+        self.screen.blit(overlay, (0, 0))
+
+        self.text.draw(self.screen, 'large', "PAUSED", YELLOW, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 20))
+        self.text.draw(self.screen, 'small', "PRESS P TO CONTINUE", WHITE, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20))
+
+    def render_game_over_screen(self) -> None:
+
+        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 200))
+        self.screen.blit(overlay, (0, 0))
+
+        self.text.draw(self.screen, 'large', "GAME OVER", RED, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 40))
+        self.text.draw(self.screen, 'medium', f"FINAL SCORE: {self.score}", WHITE, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+
+        level_label = f"WAVE: {self.horde.wave}" if self.horde else f"LEVEL: {self.level}"
+        self.text.draw(self.screen, 'medium', level_label, WHITE, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 25))
+        self.text.draw(self.screen, 'small', "PRESS ESC FOR MENU", WHITE, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 60))
+
+    def render_win_screen(self) -> None:
+
+        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 200))
+        self.screen.blit(overlay, (0, 0))
+
+        self.text.draw(self.screen, 'large', "VICTORY!", GREEN, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
+        self.text.draw(self.screen, 'medium', f"FINAL SCORE: {self.score}", WHITE,
+                       (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 20))
+        self.text.draw(self.screen, 'medium', f"LIVES: {self.lives}", WHITE, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 5))
+        self.text.draw(self.screen, 'medium', f"LEVELS: {self.max_level}", WHITE,
+                       (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 30))
+        self.text.draw(self.screen, 'small', "PRESS ESC FOR MENU", WHITE, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 70))
+
+    def render_level_complete_screen(self) -> None:
+
+        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 200))
+        self.screen.blit(overlay, (0, 0))
+
+        self.text.draw(self.screen, 'large', "LEVEL COMPLETE!", GREEN, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 30))
+        self.text.draw(self.screen, 'medium', f"SCORE: {self.score}", YELLOW, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+        self.text.draw(self.screen, 'medium', f"LIVES: {self.lives}", YELLOW, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 25))
+        self.text.draw(self.screen, 'small', "PRESS ANY KEY TO CONTINUE", WHITE,
+                       (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 60))
+
+    def level_complete(self) -> None:
+        """Завершение уровня и переход к следующему"""
+        self.level += 1
+        if self.memory:
+            self.memory.on_level_complete()
+        if self.endless or self.level <= self.max_level:
+            self.game_state = GameState.LEVEL_COMPLETE
+        else:
+            self.win_game()
+
+    def game_over(self) -> None:
+
+        self.game_state = GameState.GAME_OVER
+
+    def win_game(self) -> None:
+
+        self.game_state = GameState.WIN
+
+    def show_instructions(self) -> None:
+
+        temp_screen = self.screen.copy()
+
+        instructions_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        instructions_surface.fill((0, 0, 0, 220))
+
+        self.text.draw(instructions_surface, 'large', "🎯 HOW TO PLAY", BLUE, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 100))
+
+        instructions = [
+            "←→ ARROWS: MOVE",
+            "SPACE/W/↑: JUMP",
+            "MOUSE: AIM",
+            "LEFT CLICK: SHOOT",
+            "P KEY: PAUSE",
+            "ESC: MENU",
+            "DESTROY ALL ENEMIES!"
+        ]
+
+        for i, instruction in enumerate(instructions):
+            self.text.draw(instructions_surface, 'medium', instruction, WHITE,
+                           (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 40 + i * 30))
+
+        back_btn = pygame.Rect(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 100, 200, 50)
+        pygame.draw.rect(instructions_surface, RED, back_btn, border_radius=10)
+        pygame.draw.rect(instructions_surface, WHITE, back_btn, 3, border_radius=10)
+
+        self.text.draw(instructions_surface, 'medium', "BACK", WHITE, back_btn.center)
+
+        self.screen.blit(temp_screen, (0, 0))
+        self.screen.blit(instructions_surface, (0, 0))
+        pygame.display.flip()
+
+        waiting = True
+        while waiting:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        waiting = False
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    if back_btn.collidepoint(event.pos):
+                        waiting = False
+
+        self.screen.blit(temp_screen, (0, 0))
+        pygame.display.flip()
+
+    def run(self) -> None:
+
+        running = True
+        showing_instructions = False
+
+        while running:
+
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+
+                elif event.type == pygame.KEYDOWN:
+                    if event.key not in SAVE_KEYS:
+                        self.frame_keydowns.append(event.key)
+                    self.handle_keydown(event)
+
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    showing_instructions = self.handle_mouse_click(event, showing_instructions)
+
+            if showing_instructions:
+                self.show_instructions()
+                showing_instructions = False
+
+            self.gc_policy.update(self.game_state in ACTIVE_STATES)
+
+            self.poll_input()
+            self.update()
+            self.render()
+
+            self.clock.tick(FPS)
+            if self.game_state in ACTIVE_STATES:
+                self.quality.update(self.clock.get_rawtime())
+
+        self.close_outputs()
+
+        pygame.quit()
+        sys.exit()
+
+    def run_pipelined(self) -> None:
+        """Конвейерный режим: тики симуляции в отдельном потоке, здесь - события, ввод и отрисовка"""
+        simulation = SimulationThread(self, FPS)
+        simulation.start()
+
+        running = True
+        showing_instructions = False
+
+        while running:
+
+            frame_keydowns: List[int] = []
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+
+                elif event.type == pygame.KEYDOWN:
+                    if event.key in SAVE_KEYS:
+                        with self.sim_lock:
+                            self.handle_keydown(event)
+                    else:
+                        frame_keydowns.append(event.key)
+
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    with self.sim_lock:
+                        showing_instructions = self.handle_mouse_click(event, showing_instructions)
+
+            if showing_instructions:
+                self.show_instructions()
+                showing_instructions = False
+
+            simulation.submit(FrameInput.sample(frame_keydowns))
+
+            snapshot = simulation.latest_snapshot()
+            if snapshot and snapshot.game_state in ACTIVE_STATES:
+                self.render(snapshot)
+            else:
+                # Вне игры симуляция простаивает, а переходы (загрузка уровня) меняют мир целиком
+                with self.sim_lock:
+                    self.render(snapshot)
+
+            self.clock.tick(FPS)
+            if snapshot and snapshot.game_state in ACTIVE_STATES:
+                self.quality.update(self.clock.get_rawtime())
+
+        simulation.stop()
+
+        self.close_outputs()
+
+        pygame.quit()
+        sys.exit()
+
+    def run_netplay(self, session: RollbackSession) -> None:
+        """Сетевая игра: ввод кадра уходит в сессию отката, ESC - выход"""
+        running = True
+
+        while running:
+
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    running = False
+
+            session.advance(FrameInput.sample([]))
+            self.render()
+
+            self.clock.tick(FPS)
+
+        session.close()
+        print(f"Сетевая игра: кадров {session.frame}, откатов {session.rollbacks}, "
+              f"пересчитано {session.resimulated}, ожиданий {session.stalls}")
+
+        self.close_outputs()
+
+        pygame.quit()
+        sys.exit()
+
+    def close_outputs(self) -> None:
+        """Завершаем запись сессии, захват кадров и выгрузку метрик"""
+        if self.recorder:
+            self.recorder.finish()
+        if self.frame_capture:
+            self.frame_capture.close()
+        if self.metrics_exporter:
+            self.metrics_exporter.close()
+
+    def poll_input(self) -> None:
+        """Снимаем ввод кадра; при записи сессии сохраняем его"""
+        self.frame_input = FrameInput.sample(self.frame_keydowns)
+        self.frame_keydowns = []
+        self.ticks = self.frame_input.ticks
+        self.record_frame(self.frame_input)
+
+    def record_frame(self, frame: FrameInput) -> None:
+
+        if self.recorder and self.recorder.is_recording():
+            if self.game_state == GameState.MENU:
+                self.recorder.finish()
+            else:
+                self.recorder.record(frame)
+
+    def simulate_frame(self, frame: FrameInput) -> None:
+        """Тик потока симуляции: ввод кадра записывается так, как его увидела симуляция"""
+        self.gc_policy.update(self.game_state in ACTIVE_STATES)
+        self.record_frame(frame)
+        self.replay_frame(frame)
+
+    def simulate_netplay_frame(self, frame: int, player_input: FrameInput, partner_input: FrameInput) -> None:
+        """Тик сетевой игры: ввод обоих игроков, время игры - по номеру кадра"""
+        self.frame_input = player_input
+        self.partner_input = partner_input
+        self.ticks = frame * 1000 // FPS
+
+        # Следующий уровень - по выстрелу любого из игроков, в один и тот же кадр у обоих
+        if self.game_state == GameState.LEVEL_COMPLETE and (
+                player_input.mouse_buttons[0] or partner_input.mouse_buttons[0]):
+            self.handle_level_complete_key(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN))
+
+        self.update()
+
+    def replay_frame(self, frame: FrameInput) -> None:
+        """Один кадр записанной сессии: нажатия клавиш, ввод и виртуальное время"""
+        for key in frame.keydowns:
+            if key not in SAVE_KEYS:
+                self.handle_keydown(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+        self.frame_input = frame
+        self.ticks = frame.ticks
+        self.update()
+
+    def run_replay(self, replay: InputReplay, render: bool = True, fps: int = 0) -> int:
+        """Воспроизводим сессию с начала; fps=0 - без ограничения скорости"""
+        replay.rewind()
+        self.start(replay.seed)
+
+        frames = 0
+        frame = replay.next_frame()
+        while frame is not None and self.game_state != GameState.MENU:
+            self.gc_policy.update(self.game_state in ACTIVE_STATES)
+            self.replay_frame(frame)
+            if render:
+                self.render()
+            if fps:
+                pygame.event.pump()
+                self.clock.tick(fps)
+
+            frames += 1
+            frame = replay.next_frame()
+
+        self.gc_policy.update(False)
+        return frames
+
+    def handle_keydown(self, event: pygame.event.Event) -> None:
+
+        if event.key == pygame.K_ESCAPE:
+            self.handle_escape_key()
+        elif event.key == pygame.K_p:
+            self.handle_pause_key()
+        elif event.key == pygame.K_F5:
+            self.quick_save()
+        elif event.key == pygame.K_F9:
+            self.quick_load()
+        elif event.key == pygame.K_h and self.game_state == GameState.MENU:
+            self.start_horde()
+        elif event.key in (pygame.K_COMMA, pygame.K_PERIOD) and self.game_state == GameState.PAUSED:
+            self.rewind_frames(-1 if event.key == pygame.K_COMMA else 1)
+        elif self.game_state == GameState.LEVEL_COMPLETE:
+            self.handle_level_complete_key(event)
+
+    def handle_escape_key(self) -> None:
+
+        if self.game_state in ACTIVE_STATES:
+            self.game_state = GameState.MENU
+        elif self.game_state == GameState.PAUSED:
+            self.game_state = self.play_state()
+        elif self.game_state in [GameState.GAME_OVER, GameState.WIN]:
+            self.game_state = GameState.MENU
+
+    def handle_pause_key(self) -> None:
+
+        if self.game_state in ACTIVE_STATES:
+            self.game_state = GameState.PAUSED
+        elif self.game_state == GameState.PAUSED:
+            self.game_state = self.play_state()
+
+    def handle_level_complete_key(self, event: pygame.event.Event) -> None:
+        if event.key not in [pygame.K_ESCAPE, pygame.K_p]:
+
+            self.game_state = GameState.LOADING
+            print(f"Загрузка спрайтов для уровня {self.level}...")
+
+
+            sprite_level = (self.level - 1) % self.max_level + 1
+            self.sound_manager.load_sounds_for_level(sprite_level)
+            self.sprite_manager.reload_for_level(sprite_level, self.on_level_sprites_loaded)
+
+    def save_state(self) -> bytes:
+
+        return SaveState.capture(self)
+
+    def load_state(self, data: bytes) -> None:
+        """Продолжаем игру из снимка; при необходимости подгружаем спрайты и звуки его уровня"""
+        SaveState.restore(self, data)
+        self.horde = None
+        if self.rewind is not None:
+            self.rewind.clear()
+
+        sprite_level = (self.level - 1) % self.max_level + 1
+        if self.sprite_manager.current_level != sprite_level:
+            self.sound_manager.load_sounds_for_level(sprite_level)
+            self.sprite_manager.reload_for_level(sprite_level, self.on_state_sprites_loaded)
+
+    def rewind_frames(self, frames: int) -> None:
+        """Перемотка по буферу на frames тиков (отрицательные - назад); состояние игры не меняется"""
+        # Перемотка выключена (--rewind-seconds 0, сетевая игра) или в орде снимки не пишутся
+        if self.rewind is None or self.horde:
+            return
+
+        data = self.rewind.step_back(-frames) if frames < 0 else self.rewind.step_forward(frames)
+        if data is None:
+            return
+
+        game_state = self.game_state
+        SaveState.restore(self, data)
+        self.game_state = game_state
+
+    def on_state_sprites_loaded(self) -> None:
+
+        self.background = ParallaxBackground.from_sprites(self.sprite_manager, self.render_target.height)
+        self.animation_clock.bind(self.sprite_manager)
+
+    def quick_save(self, path: str = QUICK_SAVE_PATH) -> None:
+
+        if self.game_state not in (GameState.PLAYING, GameState.PAUSED):
+            return
+        if self.horde:
+            print("Сохранение в режиме орды не поддерживается")
+            return
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = self.save_state()
+        with open(path, 'wb') as f:
+            f.write(data)
+        print(f"Игра сохранена в {path} ({len(data)} байт)")
+
+    def quick_load(self, path: str = QUICK_SAVE_PATH) -> None:
+
+        if self.game_state == GameState.LOADING or not os.path.exists(path):
+            return
+
+        with open(path, 'rb') as f:
+            self.load_state(f.read())
+        print(f"Игра загружена из {path}")
+
+    def handle_mouse_click(self, event: pygame.event.Event, showing_instructions: bool) -> bool:
+
+        if self.game_state == GameState.MENU:
+            mouse_pos = pygame.mouse.get_pos()
+            start_btn = pygame.Rect(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2, 200, 50)
+            instr_btn = pygame.Rect(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 70, 200, 50)
+
+            if start_btn.collidepoint(mouse_pos):
+                self.start()
+            elif instr_btn.collidepoint(mouse_pos):
+                return True
+
         return showing_instructions
\ No newline at end of file
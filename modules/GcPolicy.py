@@ -0,0 +1,63 @@
+import gc
+from typing import Optional, Tuple
+
+
+class GcPolicy:
+    """Управление циклическим сборщиком мусора во время игрового процесса.
+
+    Режимы:
+        'default'  - сборщик не трогаем;
+        'disabled' - сборщик выключен во время PLAYING;
+        'tuned'    - во время PLAYING подняты пороги, долгоживущие объекты заморожены.
+    В любом режиме, кроме 'default', при выходе из PLAYING (переход уровня,
+    пауза, меню) выполняется полная сборка.
+    """
+
+    MODES = ('default', 'disabled', 'tuned')
+    TUNED_THRESHOLD = (50000, 50, 100)
+
+    def __init__(self, mode: str = 'default'):
+        if mode not in self.MODES:
+            raise ValueError(f"Неизвестный режим GC: {mode}")
+        self.mode = mode
+        self.active = False
+        self.saved_threshold: Optional[Tuple[int, int, int]] = None
+        self.collections = 0
+
+    def update(self, playing: bool) -> None:
+
+        if self.mode == 'default' or playing == self.active:
+            return
+
+        if playing:
+            self.enter_playing()
+        else:
+            self.leave_playing()
+
+    def enter_playing(self) -> None:
+
+        self.active = True
+        if self.mode == 'disabled':
+            gc.disable()
+        elif self.mode == 'tuned':
+            self.saved_threshold = gc.get_threshold()
+            gc.freeze()
+            gc.set_threshold(*self.TUNED_THRESHOLD)
+
+    def leave_playing(self) -> None:
+
+        self.active = False
+        if self.mode == 'disabled':
+            gc.enable()
+        elif self.mode == 'tuned':
+            gc.unfreeze()
+            if self.saved_threshold:
+                gc.set_threshold(*self.saved_threshold)
+        self.collect()
+
+    def collect(self) -> None:
+
+        if self.mode == 'default':
+            return
+        gc.collect()
+        self.collections += 1
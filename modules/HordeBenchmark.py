@@ -0,0 +1,123 @@
+import time
+from typing import Dict, List
+
+from .Game import Game, GameState, FPS
+from .FrameTimeHarness import FrameStats
+from .SoakHarness import SoakBot
+
+# Фазы тика из гистограмм метрик Game
+TICK_PHASES = (
+    ('enemy_update_seconds', 'враги'),
+    ('bullet_update_seconds', 'пули'),
+    ('collision_seconds', 'попадания'),
+    ('removal_seconds', 'удаление'),
+)
+
+
+class HordeBenchmark:
+    """Замер режима орды против цели: target_enemies живых врагов и target_bullets
+    пуль при 60 FPS на одном ядре.
+
+    Орда наращивается до целевых чисел быстрее, чем в игре (высокая частота
+    появления и стрельбы, лимиты HordeDirector равны целям). Игрок бессмертен
+    и управляется SoakBot, поэтому стреляет и двигает камеру как в игре. Затем
+    frames кадров замеряются update и render по отдельности, а из гистограмм
+    метрик берется среднее время фаз тика: враги, пули, попадания, удаление.
+    """
+
+    def __init__(self, target_enemies: int = 2000, target_bullets: int = 5000, frames: int = 600,
+                 budget_ms: float = 1000.0 / FPS, seed: int = 1, render_scale: float = 1.0,
+                 max_ramp_frames: int = 60 * FPS):
+        self.target_enemies = target_enemies
+        self.target_bullets = target_bullets
+        self.frames = frames
+        self.budget_ms = budget_ms
+        self.seed = seed
+        self.render_scale = render_scale
+        self.max_ramp_frames = max_ramp_frames
+
+        self.game = Game(render_scale=render_scale, adaptive_quality=False, rewind_seconds=0)
+        self.game.use_offscreen_surface()
+        self.bot = SoakBot(self.game)
+        self.frame = 0
+
+    def step(self) -> float:
+        """Один кадр; возвращает время update в миллисекундах"""
+        game = self.game
+        game.player.invulnerable = True
+        game.player.invulnerable_timer = self.max_ramp_frames + self.frames
+
+        frame = self.bot.next_input(self.frame * 1000 // FPS)
+        self.frame += 1
+
+        started = time.perf_counter()
+        game.replay_frame(frame)
+        return (time.perf_counter() - started) * 1000.0
+
+    def ramp_up(self) -> bool:
+
+        game = self.game
+        game.start_horde(self.seed, base_rate=self.target_enemies / 5.0, rate_growth=1.0,
+                         max_enemies=self.target_enemies, max_bullets=self.target_bullets, fire_interval=20)
+
+        while self.frame < self.max_ramp_frames:
+            self.step()
+            if (len(game.enemies) >= self.target_enemies * 0.98 and
+                    len(game.bullets) >= self.target_bullets * 0.95):
+                return True
+        return False
+
+    def phase_totals(self) -> Dict[str, float]:
+
+        histograms = self.game.metrics.histograms
+        return {name: histograms[name].sum for name, _ in TICK_PHASES}
+
+    def run(self) -> bool:
+        """Возвращает True, если p95 кадра (update + render) укладывается в бюджет"""
+        game = self.game
+        reached = self.ramp_up()
+        if not reached:
+            print(f"⚠ За {self.max_ramp_frames} кадров орда не достигла цели: "
+                  f"врагов {len(game.enemies)}, пуль {len(game.bullets)}")
+
+        update_ms: List[float] = []
+        render_ms: List[float] = []
+        total_ms: List[float] = []
+        enemies = 0
+        bullets = 0
+        phases_before = self.phase_totals()
+
+        for _ in range(self.frames):
+            if game.game_state != GameState.HORDE:
+                break
+            update = self.step()
+            started = time.perf_counter()
+            game.render()
+            render = (time.perf_counter() - started) * 1000.0
+
+            update_ms.append(update)
+            render_ms.append(render)
+            total_ms.append(update + render)
+            enemies += len(game.enemies)
+            bullets += len(game.bullets)
+
+        measured = len(total_ms)
+        if not measured:
+            print("✗ Орда закончилась до замера")
+            return False
+
+        phases_after = self.phase_totals()
+        total = FrameStats.from_samples(total_ms)
+        print(f"Орда: в среднем врагов {enemies // measured}, пуль {bullets // measured}, "
+              f"{measured} кадров")
+        print(f"  кадр:   {total}")
+        print(f"  update: {FrameStats.from_samples(update_ms)}")
+        print(f"  render: {FrameStats.from_samples(render_ms)}")
+        print("  фазы тика, мс: " + ', '.join(
+            f"{label} {(phases_after[name] - phases_before[name]) * 1000.0 / measured:.2f}"
+            for name, label in TICK_PHASES))
+
+        passed = reached and total.p95 <= self.budget_ms
+        status = "достигнута" if passed else "не достигнута"
+        print(f"Цель {self.budget_ms:.1f} мс на кадр (p95 {total.p95:.2f} мс): {status}")
+        return passed
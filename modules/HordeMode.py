@@ -0,0 +1,122 @@
+import math
+from typing import Dict, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from modules.Game import Game
+    from modules.Enemy import Enemy
+
+TICKS_PER_SECOND = 60
+ENEMY_WIDTH = 40
+ENEMY_HEIGHT = 60
+# Враги не появляются ближе к игроку, чем на это расстояние по x
+SAFE_DISTANCE = 200
+SPAWN_ATTEMPTS = 4
+ENEMY_BULLET_DAMAGE = 10
+
+
+class HordeDirector:
+    """Режим выживания (орда): волны врагов на платформах уровня.
+
+    Каждая волна длится wave_seconds; враги появляются с частотой base_rate в
+    секунду, и с каждой волной частота растет в rate_growth раз. Живых врагов
+    не больше max_enemies, пуль - не больше max_bullets. Враги стреляют в
+    ближайшего игрока: за тик стреляет в среднем len(enemies) / fire_interval
+    случайных врагов - без таймера на каждого врага и без прохода по всем
+    врагам каждый тик. Вся случайность - game.rng, как и в обычных уровнях.
+    """
+
+    def __init__(self, game: 'Game', base_rate: float = 2.0, rate_growth: float = 1.6,
+                 wave_seconds: float = 15.0, max_enemies: int = 3000, max_bullets: int = 6000,
+                 fire_interval: int = 120):
+        self.game = game
+        self.base_rate = base_rate
+        self.rate_growth = rate_growth
+        self.wave_ticks = max(1, int(wave_seconds * TICKS_PER_SECOND))
+        self.max_enemies = max_enemies
+        self.max_bullets = max_bullets
+        self.fire_interval = max(1, fire_interval)
+
+        self.platforms: List[Dict] = list(game.platforms)
+        self.wave = 1
+        self.ticks = 0
+        self.spawn_budget = 0.0
+        self.fire_budget = 0.0
+        self.spawned = 0
+
+    def spawn_rate(self) -> float:
+
+        return self.base_rate * self.rate_growth ** (self.wave - 1)
+
+    def update(self) -> None:
+
+        self.ticks += 1
+        if self.ticks % self.wave_ticks == 0:
+            self.next_wave()
+
+        game = self.game
+        self.spawn_budget += self.spawn_rate() / TICKS_PER_SECOND
+        while self.spawn_budget >= 1.0 and len(game.enemies) < self.max_enemies:
+            self.spawn_budget -= 1.0
+            self.spawn_enemy()
+        # При полном лимите бюджет не копится - иначе после убийств враги появятся пачкой
+        self.spawn_budget = min(self.spawn_budget, 1.0)
+
+        enemies = game.enemies.items
+        if not enemies:
+            return
+        self.fire_budget += len(enemies) / self.fire_interval
+        rng = game.rng
+        while self.fire_budget >= 1.0:
+            self.fire_budget -= 1.0
+            if len(game.bullets) >= self.max_bullets:
+                self.fire_budget = 0.0
+                break
+            self.fire(enemies[rng.randrange(len(enemies))])
+
+    def next_wave(self) -> None:
+
+        self.wave += 1
+        game = self.game
+        print(f"Волна {self.wave}: {self.spawn_rate():.1f} врагов/с, живых {len(game.enemies)}")
+
+        # С каждой волной - аптечка и патроны на случайных платформах
+        for type_ in ('health', 'ammo'):
+            platform = game.rng.choice(self.platforms)
+            x = platform['x'] + game.rng.uniform(0, max(0, platform['width'] - 20))
+            game.pickups.add(game.pickup_pool.acquire(game, x, platform['y'] - 30, type_))
+
+    def spawn_enemy(self) -> None:
+
+        game = self.game
+        rng = game.rng
+        player_x = game.player.x if game.player else 0.0
+        for _ in range(SPAWN_ATTEMPTS):
+            platform = rng.choice(self.platforms)
+            x = platform['x'] + rng.uniform(0, max(0, platform['width'] - ENEMY_WIDTH))
+            if abs(x - player_x) >= SAFE_DISTANCE:
+                break
+        else:
+            return
+
+        enemy = game.enemy_pool.acquire(game, x, platform['y'] - ENEMY_HEIGHT, platform['id'])
+        enemy.direction = 1 if rng.random() < 0.5 else -1
+        game.enemies.add(enemy)
+        self.spawned += 1
+
+    def fire(self, enemy: 'Enemy') -> None:
+
+        game = self.game
+        x = enemy.x + enemy.width / 2
+        y = enemy.y + enemy.height / 2
+
+        target = game.player
+        if target is None:
+            return
+        if game.partner and abs(game.partner.x - x) < abs(target.x - x):
+            target = game.partner
+
+        dx = target.x + target.width / 2 - x
+        dy = target.y + target.height / 2 - y
+        direction = 'right' if dx >= 0 else 'left'
+        bullet = game.bullet_pool.acquire(game, x, y, direction, True, ENEMY_BULLET_DAMAGE, math.atan2(dy, dx))
+        game.bullets.add(bullet)
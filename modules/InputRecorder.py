@@ -0,0 +1,86 @@
+import struct
+from typing import BinaryIO, List, Optional
+
+from .InputState import FrameInput
+
+# magic, версия формата, seed генератора случайных чисел
+HEADER_FORMAT = struct.Struct('<4sHQ')
+MAGIC = b'CTRR'
+VERSION = 1
+
+
+class InputRecorder:
+    """Запись покадрового ввода сессии в компактный бинарный файл"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file: Optional[BinaryIO] = None
+        self.frames = 0
+        self.finished = False
+
+    def begin(self, seed: int) -> None:
+
+        self.file = open(self.path, 'wb')
+        self.file.write(HEADER_FORMAT.pack(MAGIC, VERSION, seed))
+        self.frames = 0
+        print(f"Запись ввода в {self.path} (seed {seed})")
+
+    def is_recording(self) -> bool:
+
+        return self.file is not None
+
+    def record(self, frame: FrameInput) -> None:
+
+        if self.file:
+            self.file.write(frame.pack())
+            self.frames += 1
+
+    def finish(self) -> None:
+
+        if self.file:
+            self.file.close()
+            self.file = None
+            self.finished = True
+            print(f"Запись завершена: {self.frames} кадров")
+
+
+class InputReplay:
+    """Воспроизведение записанной сессии кадр за кадром"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        magic, version, seed = HEADER_FORMAT.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: не файл записи ввода")
+        if version != VERSION:
+            raise ValueError(f"{path}: неподдерживаемая версия записи {version}")
+
+        self.seed = seed
+        self.frames: List[FrameInput] = []
+
+        offset = HEADER_FORMAT.size
+        while offset < len(data):
+            frame, offset = FrameInput.unpack_from(data, offset)
+            self.frames.append(frame)
+
+        self.position = 0
+
+    def next_frame(self) -> Optional[FrameInput]:
+
+        if self.position >= len(self.frames):
+            return None
+        frame = self.frames[self.position]
+        self.position += 1
+        return frame
+
+    def rewind(self) -> None:
+
+        self.position = 0
+
+    def __len__(self) -> int:
+
+        return len(self.frames)
@@ -0,0 +1,105 @@
+import pygame
+import struct
+from typing import Dict, List, Optional, Tuple
+
+# Клавиши, которые читает игровой процесс, и их биты в маске
+TRACKED_KEYS: Tuple[int, ...] = (
+    pygame.K_a,
+    pygame.K_d,
+    pygame.K_LEFT,
+    pygame.K_RIGHT,
+    pygame.K_SPACE,
+    pygame.K_UP,
+    pygame.K_w,
+    pygame.K_BACKSPACE,
+)
+KEY_BITS: Dict[int, int] = {key: 1 << i for i, key in enumerate(TRACKED_KEYS)}
+
+# ticks, маска клавиш, мышь x/y, кнопки мыши, число нажатий клавиш в кадре
+FRAME_FORMAT = struct.Struct('<IBhhBB')
+KEYDOWN_FORMAT = struct.Struct('<I')
+
+
+class KeyState:
+    """Состояние клавиш в виде битовой маски, индексируется как pygame.key.get_pressed()"""
+
+    __slots__ = ('mask',)
+
+    def __init__(self, mask: int = 0):
+        self.mask = mask
+
+    def __getitem__(self, key: int) -> bool:
+
+        bit = KEY_BITS.get(key)
+        return bit is not None and (self.mask & bit) != 0
+
+    @classmethod
+    def from_pressed(cls, pressed) -> 'KeyState':
+
+        mask = 0
+        for key, bit in KEY_BITS.items():
+            if pressed[key]:
+                mask |= bit
+        return cls(mask)
+
+
+class FrameInput:
+    """Ввод одного кадра: клавиши, мышь, нажатия клавиш и время"""
+
+    __slots__ = ('keys', 'mouse_pos', 'mouse_buttons', 'keydowns', 'ticks')
+
+    def __init__(self, keys: Optional[KeyState] = None, mouse_pos: Tuple[int, int] = (0, 0),
+                 mouse_buttons: Tuple[bool, bool, bool] = (False, False, False),
+                 keydowns: Optional[List[int]] = None, ticks: int = 0):
+        self.keys = keys if keys is not None else KeyState()
+        self.mouse_pos = mouse_pos
+        self.mouse_buttons = mouse_buttons
+        self.keydowns = keydowns if keydowns is not None else []
+        self.ticks = ticks
+
+    @classmethod
+    def sample(cls, keydowns: List[int]) -> 'FrameInput':
+        """Снимаем текущее состояние ввода pygame"""
+        buttons = pygame.mouse.get_pressed()
+        return cls(
+            KeyState.from_pressed(pygame.key.get_pressed()),
+            pygame.mouse.get_pos(),
+            (bool(buttons[0]), bool(buttons[1]), bool(buttons[2])),
+            keydowns,
+            pygame.time.get_ticks()
+        )
+
+    def pack(self) -> bytes:
+
+        buttons = (self.mouse_buttons[0] | (self.mouse_buttons[1] << 1) | (self.mouse_buttons[2] << 2))
+        data = FRAME_FORMAT.pack(
+            self.ticks & 0xFFFFFFFF,
+            self.keys.mask,
+            self.mouse_pos[0],
+            self.mouse_pos[1],
+            buttons,
+            len(self.keydowns)
+        )
+        for key in self.keydowns:
+            data += KEYDOWN_FORMAT.pack(key)
+        return data
+
+    @classmethod
+    def unpack_from(cls, data: bytes, offset: int = 0) -> Tuple['FrameInput', int]:
+        """Читаем кадр из буфера, возвращаем кадр и смещение следующего"""
+        ticks, mask, mouse_x, mouse_y, buttons, keydown_count = FRAME_FORMAT.unpack_from(data, offset)
+        offset += FRAME_FORMAT.size
+
+        keydowns = []
+        for _ in range(keydown_count):
+            keydowns.append(KEYDOWN_FORMAT.unpack_from(data, offset)[0])
+            offset += KEYDOWN_FORMAT.size
+
+        frame = cls(
+            KeyState(mask),
+            (mouse_x, mouse_y),
+            (bool(buttons & 1), bool(buttons & 2), bool(buttons & 4)),
+            keydowns,
+            ticks
+        )
+        return frame, offset
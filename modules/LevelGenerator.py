@@ -0,0 +1,161 @@
+import random
+from typing import Dict, List, Tuple
+
+from .Player import PLAYER_SPEED, JUMP_POWER, GRAVITY
+
+GROUND_Y = 480
+MIN_PLATFORM_Y = 120
+MAX_PLATFORM_Y = 450
+PLATFORM_HEIGHT = 20
+ENEMY_WIDTH = 40
+PICKUP_OFFSET = 30
+
+
+def jump_height(jump_power: float = JUMP_POWER, gravity: float = GRAVITY) -> float:
+    """Максимальная высота прыжка при той же схеме интегрирования, что в Player.update"""
+    height = 0.0
+    velocity = -jump_power
+    while True:
+        velocity += gravity
+        if velocity >= 0:
+            return height
+        height -= velocity
+
+
+def jump_reach(rise: float, jump_power: float = JUMP_POWER, gravity: float = GRAVITY,
+               speed: float = PLAYER_SPEED) -> float:
+    """Горизонтальная дальность прыжка на платформу выше на rise пикселей (отрицательный - ниже)"""
+    height = 0.0
+    velocity = -jump_power
+    frames = 0
+    reach_frames = 0
+    while height >= min(rise, 0) - 500:
+        velocity += gravity
+        height -= velocity
+        frames += 1
+        if velocity > 0 and height >= rise:
+            reach_frames = frames
+        elif velocity > 0 and height < rise:
+            break
+    return reach_frames * speed
+
+
+class LevelLayout:
+    """Результат генерации: платформы, враги (x, id платформы) и предметы (x, y, тип)"""
+
+    __slots__ = ('width', 'platforms', 'enemies', 'pickups')
+
+    def __init__(self, width: int):
+        self.width = width
+        self.platforms: List[Dict] = []
+        self.enemies: List[Tuple[float, int]] = []
+        self.pickups: List[Tuple[float, float, str]] = []
+
+
+class LevelGenerator:
+    """Процедурный генератор уровней с фиксированным seed.
+
+    Платформы строятся цепочкой слева направо так, чтобы каждую следующую можно
+    было достать прыжком с предыдущей (с запасом safety). platform_density -
+    вероятность дополнительной верхней платформы над звеном цепочки.
+    """
+
+    def __init__(self, seed: int, width: int = 2400, platform_density: float = 0.3,
+                 enemies_per_platform: float = 0.7, pickups_per_platform: float = 0.6,
+                 platform_width: Tuple[int, int] = (120, 320), safety: float = 0.75):
+        self.seed = seed
+        self.width = width
+        self.platform_density = platform_density
+        self.enemies_per_platform = enemies_per_platform
+        self.pickups_per_platform = pickups_per_platform
+        self.platform_width = platform_width
+        self.safety = safety
+
+        self.max_rise = jump_height() * safety
+
+    @classmethod
+    def for_level(cls, seed: int, level: int) -> 'LevelGenerator':
+        """Уровни бесконечного режима: ширина и плотность растут с номером уровня"""
+        return cls(
+            (seed << 16) ^ level,
+            width=2000 + level * 400,
+            platform_density=min(0.8, 0.2 + level * 0.05),
+            enemies_per_platform=min(3.0, 0.5 + level * 0.15),
+            pickups_per_platform=0.6
+        )
+
+    @classmethod
+    def stress(cls, seed: int, width: int) -> 'LevelGenerator':
+        """Мир для нагрузочного тестирования: плотные платформы, много врагов и предметов"""
+        return cls(seed, width=width, platform_density=0.8, enemies_per_platform=6.0,
+                   pickups_per_platform=3.0, platform_width=(240, 480))
+
+    def generate(self) -> LevelLayout:
+
+        rng = random.Random(self.seed)
+        layout = LevelLayout(self.width)
+        platforms = layout.platforms
+
+        x = 0.0
+        y = float(MAX_PLATFORM_Y)
+        width = rng.randint(*self.platform_width)
+        platforms.append(self.make_platform(len(platforms) + 1, x, y, width))
+
+        while True:
+            rise = rng.uniform(-self.max_rise, self.max_rise)
+            next_y = max(MIN_PLATFORM_Y, min(MAX_PLATFORM_Y, y - rise))
+            reach = jump_reach(y - next_y) * self.safety
+
+            gap = rng.uniform(min(30.0, reach), max(30.0, reach))
+            next_x = x + width + gap
+            next_width = rng.randint(*self.platform_width)
+            if next_x + next_width > self.width:
+                break
+
+            if rng.random() < self.platform_density:
+                self.add_upper_platform(rng, platforms, x, y, width)
+
+            x, y, width = next_x, next_y, next_width
+            platforms.append(self.make_platform(len(platforms) + 1, x, y, width))
+
+        for platform in platforms:
+            self.populate(rng, layout, platform)
+
+        platforms.append(self.make_platform(0, 0, GROUND_Y, self.width))
+        return layout
+
+    def add_upper_platform(self, rng: random.Random, platforms: List[Dict],
+                           x: float, y: float, width: int) -> None:
+
+        upper_y = y - rng.uniform(self.max_rise * 0.6, self.max_rise)
+        if upper_y < MIN_PLATFORM_Y:
+            return
+        upper_width = rng.randint(self.platform_width[0], max(self.platform_width[0], width))
+        upper_x = x + rng.uniform(0, max(0.0, width - upper_width * 0.5))
+        platforms.append(self.make_platform(len(platforms) + 1, upper_x, upper_y, upper_width))
+
+    def populate(self, rng: random.Random, layout: LevelLayout, platform: Dict) -> None:
+
+        span = platform['width'] - ENEMY_WIDTH
+
+        for _ in range(self.sample_count(rng, self.enemies_per_platform)):
+            layout.enemies.append((platform['x'] + rng.uniform(0, span), platform['id']))
+
+        for _ in range(self.sample_count(rng, self.pickups_per_platform)):
+            type_ = 'health' if rng.random() < 0.5 else 'ammo'
+            layout.pickups.append((
+                platform['x'] + rng.uniform(0, platform['width'] - 20),
+                platform['y'] - PICKUP_OFFSET,
+                type_
+            ))
+
+    def sample_count(self, rng: random.Random, mean: float) -> int:
+
+        count = int(mean)
+        if rng.random() < mean - count:
+            count += 1
+        return count
+
+    def make_platform(self, platform_id: int, x: float, y: float, width: int) -> Dict:
+
+        return {'x': int(x), 'y': int(y), 'width': int(width), 'height': PLATFORM_HEIGHT, 'id': platform_id}
@@ -0,0 +1,160 @@
+import sys
+import tracemalloc
+from typing import Dict, Iterable, List, Optional, TYPE_CHECKING
+
+import pygame
+
+if TYPE_CHECKING:
+    from modules.Game import Game
+
+MB = 1024 * 1024
+
+
+def surface_bytes(surface: pygame.Surface) -> int:
+
+    return surface.get_pitch() * surface.get_height()
+
+
+def mask_bytes(mask: pygame.mask.Mask) -> int:
+    """Маска хранится битами, строки выровнены по 64-битным словам"""
+    width, height = mask.get_size()
+    return (width + 63) // 64 * 8 * height
+
+
+def objects_bytes(objects: Iterable) -> int:
+    """Сами объекты сущностей и их прямоугольники (вложенные структуры не обходим)"""
+    total = 0
+    for obj in objects:
+        total += sys.getsizeof(obj)
+        rect = getattr(obj, 'rect', None)
+        if rect is not None:
+            total += sys.getsizeof(rect)
+    return total
+
+
+class MemoryAccountant:
+    """Учет памяти для поиска утечек между уровнями.
+
+    Поверхности и маски pygame выделяет SDL - tracemalloc их не видит, поэтому
+    они считаются отдельно по размерам: спрайты, маски и буферы отрисовки.
+    Контейнеры сущностей Game (SlotMap, пулы, платформы, буфер перемотки)
+    считаются через sys.getsizeof. На каждом LEVEL_COMPLETE снимается снимок
+    tracemalloc и печатаются места выделения, где память Python выросла с
+    прошлого уровня. Если поверхности превышают бюджет, печатается
+    предупреждение.
+    """
+
+    def __init__(self, game: 'Game', surface_budget_mb: float = 64.0, top: int = 10, trace_frames: int = 1):
+        self.game = game
+        self.surface_budget = int(surface_budget_mb * MB)
+        self.top = top
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(trace_frames)
+        metrics = game.metrics
+        self.metric_surfaces = metrics.gauge('surface_bytes', "Память поверхностей и масок pygame")
+        self.metric_entities = metrics.gauge('entity_bytes', "Память контейнеров сущностей Game")
+        self.metric_traced = metrics.gauge('python_traced_bytes', "Память Python по tracemalloc")
+
+        self.previous = self.take_snapshot()
+        self.previous_surfaces = sum(self.surface_usage().values())
+        self.reports: List[Dict] = []
+
+    def take_snapshot(self) -> tracemalloc.Snapshot:
+
+        snapshot = tracemalloc.take_snapshot()
+        return snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        ))
+
+    def surface_usage(self) -> Dict[str, int]:
+
+        sprite_manager = self.game.sprite_manager
+        counted = set()
+
+        def unique(surfaces: Iterable[Optional[pygame.Surface]]) -> int:
+
+            total = 0
+            for surface in surfaces:
+                if surface is not None and id(surface) not in counted:
+                    counted.add(id(surface))
+                    total += surface_bytes(surface)
+            return total
+
+        sprites = unique(sprite_manager.sprites.values())
+        sprites += unique(frame for frames in sprite_manager.animations.values() for frame in frames)
+        sprites += unique(sprite_manager.mirrored.values())
+
+        masks = sum(mask_bytes(mask) for pair in sprite_manager.masks.values() for mask in pair)
+        masks += sum(mask_bytes(mask) for mask in sprite_manager.solid_masks.values())
+
+        background = unique(layer.surface for layer in self.game.background.layers)
+        counted.add(id(self.game.screen))
+        render_target = unique([self.game.render_target.surface])
+        text = unique(self.game.text.cache.values())
+
+        return {'sprites': sprites, 'masks': masks, 'background': background, 'render_target': render_target,
+                'text': text}
+
+    def entity_usage(self) -> Dict[str, int]:
+
+        game = self.game
+        usage = {}
+        for name in ('enemies', 'bullets', 'pickups', 'particles'):
+            container = getattr(game, name)
+            usage[name] = objects_bytes(container.items) + sum(
+                sys.getsizeof(getattr(container, slot)) for slot in container.__slots__)
+
+        usage['pools'] = sum(objects_bytes(pool.free) + sys.getsizeof(pool.free)
+                             for pool in (game.bullet_pool, game.pickup_pool, game.particle_pool, game.enemy_pool))
+        usage['platforms'] = sys.getsizeof(game.platforms) + sum(map(sys.getsizeof, game.platforms))
+        usage['rewind'] = game.rewind.size if game.rewind is not None else 0
+        return usage
+
+    def check_budget(self, surfaces: Optional[Dict[str, int]] = None) -> bool:
+
+        surfaces = surfaces if surfaces is not None else self.surface_usage()
+        total = sum(surfaces.values())
+        self.metric_surfaces.set(total)
+        if total > self.surface_budget:
+            print(f"⚠ Поверхности занимают {total / MB:.1f} МБ - больше бюджета "
+                  f"{self.surface_budget / MB:.1f} МБ")
+            return False
+        return True
+
+    def on_level_complete(self) -> Dict:
+        """Отчет о памяти при завершении уровня: поверхности, сущности и рост аллокаций Python"""
+        surfaces = self.surface_usage()
+        entities = self.entity_usage()
+        surfaces_total = sum(surfaces.values())
+        entities_total = sum(entities.values())
+        self.metric_entities.set(entities_total)
+
+        snapshot = self.take_snapshot()
+        growth = [stat for stat in snapshot.compare_to(self.previous, 'lineno') if stat.size_diff > 0]
+        traced = sum(stat.size for stat in snapshot.statistics('filename'))
+        self.metric_traced.set(traced)
+
+        print(f"Память после уровня {self.game.level - 1}: поверхности {surfaces_total / MB:.2f} МБ "
+              f"({', '.join(f'{name} {size / MB:.2f}' for name, size in surfaces.items())}), "
+              f"изменение {(surfaces_total - self.previous_surfaces) / MB:+.2f} МБ; "
+              f"сущности {entities_total / 1024:.1f} КБ; Python {traced / MB:.2f} МБ")
+        for stat in growth[:self.top]:
+            frame = stat.traceback[0]
+            print(f"  +{stat.size_diff / 1024:.1f} КБ (+{stat.count_diff} блоков) {frame.filename}:{frame.lineno}")
+
+        self.check_budget(surfaces)
+
+        report = {
+            'level': self.game.level - 1,
+            'surfaces': surfaces,
+            'entities': entities,
+            'python_bytes': traced,
+            'growth': [(str(stat.traceback[0]), stat.size_diff, stat.count_diff) for stat in growth[:self.top]]
+        }
+        self.reports.append(report)
+        self.previous = snapshot
+        self.previous_surfaces = surfaces_total
+        return report
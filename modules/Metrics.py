@@ -0,0 +1,219 @@
+import json
+import os
+import queue
+import socket
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+METRIC_PREFIX = 'contra_'
+STOP = None
+
+# Границы корзин гистограмм времени, секунды
+TIME_BUCKETS: Tuple[float, ...] = (0.001, 0.002, 0.004, 0.008, 0.0167, 0.033, 0.066, 0.25, 1.0)
+
+
+class Counter:
+    """Монотонно растущий счетчик"""
+
+    __slots__ = ('name', 'help', 'value')
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+
+        self.value += amount
+
+
+class Gauge:
+    """Текущее значение: число сущностей, FPS, размер кэша"""
+
+    __slots__ = ('name', 'help', 'value')
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+
+        self.value = value
+
+
+class Histogram:
+    """Распределение значений по фиксированным корзинам, сумма и количество"""
+
+    __slots__ = ('name', 'help', 'buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = TIME_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        # Последняя корзина - +Inf
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Реестр метрик. Обновление - изменение поля объекта метрики, без блокировок и аллокаций.
+
+    Метрики создаются один раз (повторный вызов с тем же именем возвращает
+    существующую), горячий код держит ссылку на объект метрики.
+    """
+
+    def __init__(self):
+        self.counters: Dict[str, Counter] = {}
+        self.gauges: Dict[str, Gauge] = {}
+        self.histograms: Dict[str, Histogram] = {}
+
+    def counter(self, name: str, help_text: str = '') -> Counter:
+
+        if name not in self.counters:
+            self.counters[name] = Counter(name, help_text)
+        return self.counters[name]
+
+    def gauge(self, name: str, help_text: str = '') -> Gauge:
+
+        if name not in self.gauges:
+            self.gauges[name] = Gauge(name, help_text)
+        return self.gauges[name]
+
+    def histogram(self, name: str, help_text: str = '', buckets: Tuple[float, ...] = TIME_BUCKETS) -> Histogram:
+
+        if name not in self.histograms:
+            self.histograms[name] = Histogram(name, help_text, buckets)
+        return self.histograms[name]
+
+    def snapshot(self) -> Dict:
+        """Копия значений для записи в другом потоке"""
+        return {
+            'counters': {name: counter.value for name, counter in self.counters.items()},
+            'gauges': {name: gauge.value for name, gauge in self.gauges.items()},
+            'histograms': {
+                name: {'buckets': list(histogram.buckets), 'counts': list(histogram.counts),
+                       'sum': histogram.sum, 'count': histogram.count}
+                for name, histogram in self.histograms.items()
+            }
+        }
+
+    def help_texts(self) -> Dict[str, str]:
+
+        texts = {}
+        for metrics in (self.counters, self.gauges, self.histograms):
+            texts.update((name, metric.help) for name, metric in metrics.items())
+        return texts
+
+
+def format_prometheus(snapshot: Dict, help_texts: Dict[str, str]) -> str:
+    """Текст в формате Prometheus exposition (для textfile collector node_exporter)"""
+    lines: List[str] = []
+
+    def header(name: str, kind: str) -> str:
+
+        full_name = METRIC_PREFIX + name
+        if help_texts.get(name):
+            lines.append(f"# HELP {full_name} {help_texts[name]}")
+        lines.append(f"# TYPE {full_name} {kind}")
+        return full_name
+
+    for name, value in snapshot['counters'].items():
+        lines.append(f"{header(name, 'counter')} {value!r}")
+
+    for name, value in snapshot['gauges'].items():
+        lines.append(f"{header(name, 'gauge')} {value!r}")
+
+    for name, histogram in snapshot['histograms'].items():
+        full_name = header(name, 'histogram')
+        cumulative = 0
+        for bound, count in zip(histogram['buckets'], histogram['counts']):
+            cumulative += count
+            lines.append(f'{full_name}_bucket{{le="{bound!r}"}} {cumulative}')
+        lines.append(f'{full_name}_bucket{{le="+Inf"}} {histogram["count"]}')
+        lines.append(f"{full_name}_sum {histogram['sum']!r}")
+        lines.append(f"{full_name}_count {histogram['count']}")
+
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsExporter:
+    """Периодическая выгрузка снимков реестра: строка JSON в metrics.jsonl и файл contra.prom.
+
+    Главный цикл раз в interval секунд только копирует значения и кладет снимок
+    в очередь; запись на диск идет в фоновом потоке. Если поток не успевает и
+    очередь полна, снимок пропускается - цикл игры никогда не ждет диска.
+    .prom-файл заменяется атомарно (os.replace), чтобы коллектор не прочитал
+    его наполовину записанным.
+    """
+
+    def __init__(self, registry: MetricsRegistry, output_dir: str, interval: float = 5.0):
+        self.registry = registry
+        self.output_dir = output_dir
+        self.interval = interval
+        self.instance = socket.gethostname()
+
+        os.makedirs(output_dir, exist_ok=True)
+        self.jsonl_path = os.path.join(output_dir, 'metrics.jsonl')
+        self.prom_path = os.path.join(output_dir, 'contra.prom')
+
+        self.queue: queue.Queue = queue.Queue(maxsize=4)
+        self.next_flush = time.monotonic() + interval
+        self.flushed = 0
+        self.skipped = 0
+
+        self.thread = threading.Thread(target=self.write_loop, name='MetricsExporter', daemon=True)
+        self.thread.start()
+
+    def maybe_flush(self) -> None:
+
+        now = time.monotonic()
+        if now < self.next_flush:
+            return
+        self.next_flush = now + self.interval
+        self.flush()
+
+    def flush(self) -> None:
+
+        snapshot = self.registry.snapshot()
+        snapshot['timestamp'] = time.time()
+        snapshot['instance'] = self.instance
+        try:
+            self.queue.put_nowait((snapshot, self.registry.help_texts()))
+        except queue.Full:
+            self.skipped += 1
+
+    def write_loop(self) -> None:
+
+        while True:
+            item = self.queue.get()
+            if item is STOP:
+                break
+
+            snapshot, help_texts = item
+            try:
+                with open(self.jsonl_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(snapshot) + '\n')
+
+                temp_path = self.prom_path + '.tmp'
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    f.write(format_prometheus(snapshot, help_texts))
+                os.replace(temp_path, self.prom_path)
+                self.flushed += 1
+            except OSError as e:
+                print(f"✗ Ошибка записи метрик: {e}")
+
+    def close(self) -> None:
+        """Последний снимок и остановка потока записи"""
+        self.flush()
+        self.queue.put(STOP)
+        self.thread.join()
@@ -0,0 +1,263 @@
+import heapq
+import random
+import socket
+import struct
+import time
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from .InputState import FrameInput
+
+if TYPE_CHECKING:
+    from modules.Game import Game
+
+# magic, номер игрока отправителя, последний полученный кадр собеседника (+1, 0 - ничего),
+# первый кадр в пакете, число кадров, кадр и контрольная сумма подтвержденного состояния
+PACKET_HEADER = struct.Struct('<4sBIIHII')
+MAGIC = b'CTNP'
+MAX_PACKET_FRAMES = 64
+# Сколько кадров храним свои контрольные суммы - пока не придут суммы собеседника
+CHECKSUM_WINDOW = 240
+
+
+def input_signature(frame_input: FrameInput) -> Tuple:
+    """То, что влияет на симуляцию: клавиши и кнопка; позиция мыши - только при выстреле"""
+    firing = frame_input.mouse_buttons[0]
+    return frame_input.keys.mask, firing, frame_input.mouse_pos if firing else None
+
+
+class LinkSimulator:
+    """Задержка, разброс задержки и потери исходящих пакетов - для проверки на 127.0.0.1"""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, loss: float = 0.0, seed: int = 0):
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.loss = loss
+        self.rng = random.Random(seed)
+        self.queue: List[Tuple[float, int, bytes, Tuple[str, int]]] = []
+        self.sequence = 0
+        self.sent = 0
+        self.dropped = 0
+
+    def send(self, sock: socket.socket, data: bytes, address: Tuple[str, int], now: float) -> None:
+
+        if self.loss and self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+
+        delay = self.latency + (self.rng.uniform(0.0, self.jitter) if self.jitter else 0.0)
+        if delay <= 0:
+            self.deliver(sock, data, address)
+            return
+
+        self.sequence += 1
+        heapq.heappush(self.queue, (now + delay, self.sequence, data, address))
+
+    def flush(self, sock: socket.socket, now: float) -> None:
+
+        while self.queue and self.queue[0][0] <= now:
+            _, _, data, address = heapq.heappop(self.queue)
+            self.deliver(sock, data, address)
+
+    def deliver(self, sock: socket.socket, data: bytes, address: Tuple[str, int]) -> None:
+
+        try:
+            sock.sendto(data, address)
+            self.sent += 1
+        except OSError:
+            # Собеседник еще не открыл порт - пакет потерян, ввод уйдет повторно со следующим
+            self.dropped += 1
+
+
+class RollbackSession:
+    """Сетевая игра вдвоем с откатом (rollback).
+
+    По сети идут только кадры ввода: каждый пакет несет все кадры, которые
+    собеседник еще не подтвердил, поэтому потерянный пакет восполняется
+    следующим. Локальный ввод применяется с задержкой input_delay кадров;
+    недостающий ввод собеседника предсказывается повтором последнего
+    известного. Перед каждым кадром сохраняется снимок SaveState; если пришедший
+    ввод расходится с предсказанием, игра откатывается к снимку этого кадра и
+    пересчитывается через Game.update до текущего. Если собеседник отстал
+    больше чем на max_rollback кадров, кадр не выполняется (ожидание).
+
+    Игрок 0 управляет game.player, игрок 1 - game.partner; у обоих процессов
+    одинаковые seed и порядок тиков, время игры - номер кадра.
+    """
+
+    def __init__(self, game: 'Game', player_index: int, local_port: int, remote_address: Tuple[str, int],
+                 link: Optional[LinkSimulator] = None, input_delay: int = 2, max_rollback: int = 8,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.game = game
+        self.player_index = player_index
+        self.remote_address = remote_address
+        self.link = link or LinkSimulator()
+        self.input_delay = input_delay
+        self.max_rollback = max_rollback
+        self.clock = clock
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(('127.0.0.1' if remote_address[0] in ('127.0.0.1', 'localhost') else '', local_port))
+        self.sock.setblocking(False)
+
+        # Кадры до input_delay у обоих пусты и известны заранее
+        self.local_inputs: Dict[int, FrameInput] = {frame: FrameInput() for frame in range(input_delay)}
+        self.remote_inputs: Dict[int, FrameInput] = {frame: FrameInput() for frame in range(input_delay)}
+        self.predicted: Dict[int, Tuple] = {}
+        self.snapshots: Dict[int, bytes] = {}
+
+        self.frame = 0
+        self.confirmed_frame = input_delay - 1
+        self.remote_ack = input_delay - 1
+        self.rollback_frame: Optional[int] = None
+
+        self.checksums: Dict[int, int] = {}
+        self.last_checksum = (0, 0)
+        self.desync_frame = 0
+
+        self.rollbacks = 0
+        self.resimulated = 0
+        self.stalls = 0
+        self.desyncs = 0
+
+    def advance(self, frame_input: FrameInput) -> bool:
+        """Один кадр: прием ввода, откат при ошибке предсказания, тик. False - ждем собеседника"""
+        self.poll()
+
+        if self.frame - self.confirmed_frame > self.max_rollback:
+            self.stalls += 1
+            self.send_inputs()
+            self.link.flush(self.sock, self.clock())
+            return False
+
+        self.local_inputs[self.frame + self.input_delay] = FrameInput(
+            frame_input.keys, frame_input.mouse_pos, frame_input.mouse_buttons)
+        self.send_inputs()
+
+        if self.rollback_frame is not None:
+            self.rollback()
+
+        self.simulate(self.frame)
+        self.frame += 1
+        self.forget_old_frames()
+
+        self.link.flush(self.sock, self.clock())
+        return True
+
+    def poll(self) -> None:
+
+        while True:
+            try:
+                data, _ = self.sock.recvfrom(4096)
+            except (BlockingIOError, ConnectionResetError):
+                break
+            self.receive(data)
+
+    def receive(self, data: bytes) -> None:
+
+        if len(data) < PACKET_HEADER.size:
+            return
+        magic, sender, ack, first, count, checksum_frame, checksum = PACKET_HEADER.unpack_from(data, 0)
+        if magic != MAGIC or sender == self.player_index:
+            return
+
+        # Обрезанный или чужой пакет отбрасываем целиком, не применяя его начало
+        offset = PACKET_HEADER.size
+        inputs = []
+        try:
+            for _ in range(count):
+                remote_input, offset = FrameInput.unpack_from(data, offset)
+                inputs.append(remote_input)
+        except struct.error:
+            return
+
+        self.remote_ack = max(self.remote_ack, ack - 1)
+
+        for frame, remote_input in enumerate(inputs, first):
+            if frame <= self.confirmed_frame or frame in self.remote_inputs:
+                continue
+
+            self.remote_inputs[frame] = remote_input
+            predicted = self.predicted.pop(frame, None)
+            if predicted is not None and predicted != input_signature(remote_input):
+                if self.rollback_frame is None or frame < self.rollback_frame:
+                    self.rollback_frame = frame
+
+        while self.confirmed_frame + 1 in self.remote_inputs:
+            self.confirmed_frame += 1
+
+        if (checksum_frame > self.desync_frame and checksum_frame in self.checksums and
+                self.checksums[checksum_frame] != checksum):
+            self.desync_frame = checksum_frame
+            self.desyncs += 1
+            print(f"✗ Рассинхронизация на кадре {checksum_frame}")
+
+    def send_inputs(self) -> None:
+
+        first = max(self.remote_ack + 1, self.frame + self.input_delay - MAX_PACKET_FRAMES + 1)
+        last = max(self.local_inputs)
+        frames = [self.local_inputs[frame].pack() for frame in range(first, last + 1)]
+
+        checksum_frame, checksum = self.last_checksum
+        header = PACKET_HEADER.pack(MAGIC, self.player_index, self.confirmed_frame + 1, first, len(frames),
+                                    checksum_frame, checksum)
+        self.link.send(self.sock, header + b''.join(frames), self.remote_address, self.clock())
+
+    def remote_input(self, frame: int) -> FrameInput:
+
+        remote_input = self.remote_inputs.get(frame)
+        if remote_input is None:
+            remote_input = self.remote_inputs[self.confirmed_frame]
+            self.predicted[frame] = input_signature(remote_input)
+        return remote_input
+
+    def simulate(self, frame: int) -> None:
+
+        game = self.game
+        state = game.save_state()
+        self.snapshots[frame] = state
+        if frame - 1 <= self.confirmed_frame:
+            # Все входы до кадра известны - состояние одинаково у обоих игроков
+            self.checksums[frame] = zlib.crc32(state)
+            self.last_checksum = (frame, self.checksums[frame])
+
+        local_input = self.local_inputs[frame]
+        remote_input = self.remote_input(frame)
+        if self.player_index == 0:
+            game.simulate_netplay_frame(frame, local_input, remote_input)
+        else:
+            game.simulate_netplay_frame(frame, remote_input, local_input)
+
+    def rollback(self) -> None:
+        """Возврат к снимку кадра с ошибкой предсказания и пересчет до текущего кадра"""
+        start = self.rollback_frame
+        self.rollback_frame = None
+        self.rollbacks += 1
+
+        for frame in range(start, self.frame):
+            self.predicted.pop(frame, None)
+
+        sound_enabled = self.game.sound_manager.enabled
+        self.game.sound_manager.enabled = False
+        self.game.load_state(self.snapshots[start])
+        for frame in range(start, self.frame):
+            self.simulate(frame)
+            self.resimulated += 1
+        self.game.sound_manager.enabled = sound_enabled
+
+    def forget_old_frames(self) -> None:
+
+        oldest = min(self.frame, self.confirmed_frame + 1) - 1
+        for frame in [frame for frame in self.snapshots if frame < oldest]:
+            del self.snapshots[frame]
+        for frame in [frame for frame in self.checksums if frame < self.frame - CHECKSUM_WINDOW]:
+            del self.checksums[frame]
+
+        keep = min(oldest, self.remote_ack)
+        for frames in (self.local_inputs, self.remote_inputs):
+            for frame in [frame for frame in frames if frame < keep and frame != self.confirmed_frame]:
+                del frames[frame]
+
+    def close(self) -> None:
+
+        self.sock.close()
@@ -0,0 +1,42 @@
+from typing import Any, Callable, Iterable, List
+
+
+class ObjectPool:
+    """Free-list пул для часто создаваемых объектов (пули, частицы, предметы).
+
+    Объекты должны иметь метод reset() с той же сигнатурой, что и __init__.
+    """
+
+    __slots__ = ('factory', 'free', 'max_size', 'created', 'reused')
+
+    def __init__(self, factory: Callable[..., Any], max_size: int = 2048):
+        self.factory = factory
+        self.free: List[Any] = []
+        self.max_size = max_size
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args: Any) -> Any:
+
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+            self.reused += 1
+            return obj
+
+        self.created += 1
+        return self.factory(*args)
+
+    def release(self, obj: Any) -> None:
+
+        if len(self.free) < self.max_size:
+            self.free.append(obj)
+
+    def release_all(self, objects: Iterable[Any]) -> None:
+
+        for obj in objects:
+            self.release(obj)
+
+    def __len__(self) -> int:
+
+        return len(self.free)
@@ -0,0 +1,70 @@
+import pygame
+from typing import List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from modules.SpriteManager import SpriteManager
+
+# Слои от дальнего к ближнему: имя спрайта и скорость прокрутки относительно камеры
+BACKGROUND_LAYERS = (
+    ('background', 0.35),
+    ('backgroundMid', 0.6),
+    ('backgroundNear', 0.85),
+)
+
+
+class ParallaxLayer:
+    """Один слой фона: бесшовно зацикленная поверхность со своей скоростью прокрутки.
+
+    Рисуется только видимое окно поверхности (blit с area), максимум двумя blit'ами
+    на стыке.
+    """
+
+    __slots__ = ('surface', 'scroll_factor', 'y', 'width', 'height', 'area')
+
+    def __init__(self, surface: pygame.Surface, scroll_factor: float, y: int = 0):
+        self.surface = surface
+        self.scroll_factor = scroll_factor
+        self.y = y
+        self.width = surface.get_width()
+        self.height = surface.get_height()
+        self.area = pygame.Rect(0, 0, 0, self.height)
+
+    def draw(self, screen: pygame.Surface, camera_x: float, view_width: int) -> None:
+
+        offset = int(camera_x * self.scroll_factor) % self.width
+        area = self.area
+        drawn = 0
+
+        while drawn < view_width:
+            area.x = offset
+            area.width = min(self.width - offset, view_width - drawn)
+            screen.blit(self.surface, (drawn, self.y), area)
+            drawn += area.width
+            offset = 0
+
+
+class ParallaxBackground:
+
+    def __init__(self, layers: List[ParallaxLayer], fill_color: tuple = (15, 52, 96)):
+        self.layers = layers
+        self.fill_color = fill_color
+
+    @classmethod
+    def from_sprites(cls, sprite_manager: 'SpriteManager', screen_height: int) -> 'ParallaxBackground':
+
+        layers = []
+        for name, scroll_factor in BACKGROUND_LAYERS:
+            surface: Optional[pygame.Surface] = sprite_manager.get_sprite(name)
+            if surface:
+                layers.append(ParallaxLayer(surface, scroll_factor, screen_height - surface.get_height()))
+        return cls(layers)
+
+    def draw(self, screen: pygame.Surface, camera_x: float, view_width: int, view_height: int,
+             max_layers: Optional[int] = None) -> None:
+        """max_layers - рисовать только столько дальних слоев (снижение качества)"""
+        if not self.layers or self.layers[0].height < view_height:
+            screen.fill(self.fill_color, (0, 0, view_width, view_height))
+
+        layers = self.layers if max_layers is None else self.layers[:max_layers]
+        for layer in layers:
+            layer.draw(screen, camera_x, view_width)
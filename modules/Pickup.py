@@ -1,53 +1,65 @@
-import pygame
-from typing import TYPE_CHECKING
-
-if TYPE_CHECKING:
-    from modules.Game import Game
-    from modules.Player import Player
-
-
-class Pickup:
-    def __init__(self, game: 'Game', x: float, y: float, type_: str):
-        self.game = game
-        self.x = x
-        self.y = y
-        self.width = 20
-        self.height = 20
-        self.type = type_
-
-    def collect(self, player: 'Player') -> None:
-
-        if self.type == 'health':
-            player.health = min(player.health + 30, 100)
-        elif self.type == 'ammo':
-            weapon = player.weapons.get(player.current_weapon)
-            if weapon:
-                weapon['ammo'] = weapon['max_ammo']
-
-    def get_rect(self) -> pygame.Rect:
-
-        return pygame.Rect(self.x, self.y, self.width, self.height)
-
-    def render(self) -> None:
-
-        pass
-
-    def draw(self, screen: pygame.Surface, camera_x: float) -> None:
-
-        sprite = None
-
-        if self.type == 'health':
-            sprite = self.game.sprite_manager.get_sprite('health')
-        elif self.type == 'ammo':
-            sprite = self.game.sprite_manager.get_sprite('ammo')
-
-        if sprite:
-            screen.blit(sprite, (int(self.x - camera_x), int(self.y)))
-        else:
-
-            color = (255, 0, 0) if self.type == 'health' else (255, 255, 0)
-            pygame.draw.rect(
-                screen,
-                color,
-                (int(self.x - camera_x), int(self.y), self.width, self.height)
+import pygame
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from modules.Game import Game
+    from modules.Player import Player
+
+
+class Pickup:
+    __slots__ = ('game', 'x', 'y', 'width', 'height', 'type', 'handle', 'rect')
+
+    def __init__(self, game: 'Game', x: float, y: float, type_: str):
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(game, x, y, type_)
+
+    def reset(self, game: 'Game', x: float, y: float, type_: str) -> None:
+
+        self.game = game
+        self.x = x
+        self.y = y
+        self.width = 20
+        self.height = 20
+        self.type = type_
+        self.rect.update(int(x), int(y), self.width, self.height)
+
+    def collect(self, player: 'Player') -> None:
+
+        if self.type == 'health':
+            player.health = min(player.health + 30, 100)
+        elif self.type == 'ammo':
+            weapon = player.weapons.get(player.current_weapon)
+            if weapon:
+                weapon['ammo'] = weapon['max_ammo']
+        player.game.sound_manager.play('pickup', player.game.ticks)
+
+    def get_rect(self) -> pygame.Rect:
+
+        return self.rect
+
+    def render(self) -> None:
+
+        pass
+
+    def draw(self, screen: pygame.Surface, camera_x: float, scale: float = 1.0) -> None:
+
+        sprite = None
+
+        if self.type == 'health':
+            sprite = self.game.sprite_manager.get_sprite('health')
+        elif self.type == 'ammo':
+            sprite = self.game.sprite_manager.get_sprite('ammo')
+
+        screen_x = int((self.x - camera_x) * scale)
+        screen_y = int(self.y * scale)
+
+        if sprite:
+            screen.blit(sprite, (screen_x, screen_y))
+        else:
+
+            color = (255, 0, 0) if self.type == 'health' else (255, 255, 0)
+            pygame.draw.rect(
+                screen,
+                color,
+                (screen_x, screen_y, int(self.width * scale), int(self.height * scale))
             )
\ No newline at end of file
@@ -0,0 +1,80 @@
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+# Уровни от полного качества к самому дешевому: частиц на взрыв, полоски здоровья врагов,
+# слоев фона (None - все), спрайты (False - простые прямоугольники). Полоски здоровья
+# рисуются только у прямоугольников, поэтому выключаются вместе со спрайтами
+QUALITY_LEVELS: Tuple[Tuple[int, bool, Optional[int], bool], ...] = (
+    (8, True, None, True),
+    (4, True, None, True),
+    (2, True, 1, True),
+    (2, False, 1, False),
+)
+
+
+class QualityGovernor:
+    """Держит бюджет кадра, снижая качество отрисовки.
+
+    Получает время работы кадра (без ожидания в clock.tick) и считает скользящее
+    среднее за window кадров. Если среднее выше degrade_ratio бюджета - качество
+    снижается на один уровень. Вернуть уровень можно, только если среднее
+    держится ниже restore_ratio бюджета restore_frames кадров подряд (гистерезис:
+    без него качество переключалось бы туда-обратно каждые window кадров). После
+    каждого переключения окно собирается заново. Все переключения печатаются и
+    сохраняются в changes.
+    """
+
+    def __init__(self, budget_ms: float = 1000.0 / 60, window: int = 30, degrade_ratio: float = 0.95,
+                 restore_ratio: float = 0.6, restore_frames: int = 180, enabled: bool = True):
+        self.budget_ms = budget_ms
+        self.degrade_ratio = degrade_ratio
+        self.restore_ratio = restore_ratio
+        self.restore_frames = restore_frames
+        self.enabled = enabled
+
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.total = 0.0
+        self.calm_frames = 0
+        self.changes: List[Tuple[int, int, float]] = []
+
+        self.level = 0
+        self.explosion_particles, self.health_bars, self.background_layers, self.use_sprites = QUALITY_LEVELS[0]
+
+    def update(self, frame_ms: float) -> None:
+
+        if not self.enabled:
+            return
+
+        samples = self.samples
+        if len(samples) == samples.maxlen:
+            self.total -= samples[0]
+        samples.append(frame_ms)
+        self.total += frame_ms
+        if len(samples) < samples.maxlen:
+            return
+
+        mean = self.total / len(samples)
+        if mean > self.budget_ms * self.degrade_ratio:
+            self.calm_frames = 0
+            if self.level < len(QUALITY_LEVELS) - 1:
+                self.set_level(self.level + 1, mean)
+        elif mean < self.budget_ms * self.restore_ratio:
+            self.calm_frames += 1
+            if self.calm_frames >= self.restore_frames and self.level > 0:
+                self.set_level(self.level - 1, mean)
+        else:
+            self.calm_frames = 0
+
+    def set_level(self, level: int, mean: float = 0.0) -> None:
+
+        previous = self.level
+        self.level = level
+        self.explosion_particles, self.health_bars, self.background_layers, self.use_sprites = QUALITY_LEVELS[level]
+
+        self.samples.clear()
+        self.total = 0.0
+        self.calm_frames = 0
+
+        self.changes.append((previous, level, mean))
+        print(f"Качество: уровень {previous} -> {level} "
+              f"(среднее {mean:.1f} мс при бюджете {self.budget_ms:.1f} мс)")
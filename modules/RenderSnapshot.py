@@ -0,0 +1,194 @@
+import threading
+from collections import namedtuple
+from functools import partial
+from operator import attrgetter
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import pygame
+
+from .Player import Player
+from .Enemy import Enemy
+from .Bullet import Bullet
+from .Pickup import Pickup
+from .Particle import Particle
+
+if TYPE_CHECKING:
+    from modules.Game import Game, GameState
+
+# Поля, которые нужны отрисовке; снимаются одним вызовом attrgetter на сущность
+PLAYER_FIELDS = attrgetter('x', 'y', 'facing', 'current_animation', 'animation_frame',
+                           'invulnerable', 'invulnerable_timer')
+ENEMY_FIELDS = attrgetter('x', 'y', 'direction', 'animation_phase', 'health')
+BULLET_FIELDS = attrgetter('x', 'y', 'width', 'height', 'is_enemy', 'is_angled', 'angle')
+PICKUP_FIELDS = attrgetter('x', 'y', 'type')
+PARTICLE_FIELDS = attrgetter('x', 'y', 'size', 'life', 'color')
+
+# Враги и пули снимка - именованные кортежи: Enemy.draw_batch и Bullet.draw_batch читают их как сущности
+EnemyFields = namedtuple('EnemyFields', ['x', 'y', 'direction', 'animation_phase', 'health'])
+BulletFields = namedtuple('BulletFields', ['x', 'y', 'width', 'height', 'is_enemy', 'is_angled', 'angle'])
+# tuple.__new__ вместо _make: без вызова Python-функции на каждую сущность
+make_enemy_fields = partial(tuple.__new__, EnemyFields)
+make_bullet_fields = partial(tuple.__new__, BulletFields)
+
+
+class RenderSnapshot:
+    """Неизменяемый снимок мира после тика симуляции: только то, что нужно для отрисовки.
+
+    Сущности хранятся кортежами значений, без ссылок на живые объекты, поэтому
+    поток отрисовки может рисовать снимок, пока симуляция считает следующий тик.
+    В снимок попадают только сущности в границах отсечения камеры
+    (Game.cull_bounds), значения интерфейса и позиция мыши того же тика.
+    Платформы хранятся ссылкой: после Game.set_platforms список не меняется.
+    """
+
+    __slots__ = ('tick', 'game_state', 'camera_x', 'bounds', 'enemy_walk_index', 'player', 'partner',
+                 'enemies', 'bullets', 'pickups', 'particles', 'platforms', 'hud', 'mouse_pos')
+
+    def __init__(self, tick: int, game_state: 'GameState', camera_x: float, bounds: Tuple[float, float],
+                 enemy_walk_index: int, player: Optional[Tuple], enemies: List[EnemyFields],
+                 bullets: List[BulletFields], pickups: List[Tuple], particles: List[Tuple],
+                 platforms: List[Dict], hud: Tuple, mouse_pos: Tuple[int, int],
+                 partner: Optional[Tuple] = None):
+        self.tick = tick
+        self.game_state = game_state
+        self.camera_x = camera_x
+        self.bounds = bounds
+        self.enemy_walk_index = enemy_walk_index
+        self.player = player
+        self.partner = partner
+        self.enemies = enemies
+        self.bullets = bullets
+        self.pickups = pickups
+        self.particles = particles
+        self.platforms = platforms
+        self.hud = hud
+        self.mouse_pos = mouse_pos
+
+    @classmethod
+    def capture(cls, game: 'Game') -> 'RenderSnapshot':
+
+        left, right = bounds = game.cull_bounds()
+        enemies = [enemy for enemy in game.enemies.items if left < enemy.x < right]
+        bullets = [bullet for bullet in game.bullets.items if left < bullet.x < right]
+        return cls(
+            game.animation_clock.ticks,
+            game.game_state,
+            game.camera_x,
+            bounds,
+            game.animation_clock.indices['enemyWalk'],
+            PLAYER_FIELDS(game.player) if game.player else None,
+            list(map(make_enemy_fields, map(ENEMY_FIELDS, enemies))),
+            list(map(make_bullet_fields, map(BULLET_FIELDS, bullets))),
+            [PICKUP_FIELDS(pickup) for pickup in game.pickups.items if left < pickup.x < right],
+            [PARTICLE_FIELDS(particle) for particle in game.particles.items if left < particle.x < right],
+            game.platforms,
+            game.hud_values(),
+            game.frame_input.mouse_pos,
+            PLAYER_FIELDS(game.partner) if game.partner else None
+        )
+
+    def draw_entities(self, world: pygame.Surface, scale: float, views: 'EntityViews') -> None:
+        """Рисуем снимок так же, как живое состояние: враги и пули пакетно, остальное - через
+        методы draw переиспользуемых объектов-представлений"""
+        camera_x = self.camera_x
+        left, right = self.bounds
+
+        pickup = views.pickup
+        for pickup.x, pickup.y, pickup.type in self.pickups:
+            pickup.draw(world, camera_x, scale)
+
+        enemy = views.enemy
+        enemy_frames = views.enemy_frames(self.enemy_walk_index)
+
+        def draw_enemy(fields: EnemyFields) -> None:
+
+            enemy.x, enemy.y, enemy.direction, enemy.animation_phase, enemy.health = fields
+            enemy.draw(world, camera_x, scale, enemy_frames)
+
+        if views.game.quality.use_sprites:
+            Enemy.draw_batch(world, self.enemies, camera_x, scale, left, right, enemy_frames,
+                             views.mirrored_frames(enemy_frames), draw_enemy)
+        else:
+            for fields in self.enemies:
+                draw_enemy(fields)
+
+        bullet = views.bullet
+
+        def draw_bullet(fields: BulletFields) -> None:
+
+            (bullet.x, bullet.y, bullet.width, bullet.height,
+             bullet.is_enemy, bullet.is_angled, bullet.angle) = fields
+            bullet.draw(world, camera_x, scale)
+
+        Bullet.draw_batch(world, self.bullets, camera_x, scale, left, right, views.game.sprite_manager, draw_bullet)
+
+        particle = views.particle
+        for particle.x, particle.y, particle.size, particle.life, particle.color in self.particles:
+            particle.draw(world, camera_x, scale)
+
+        player = views.player
+        for fields in (self.partner, self.player):
+            if fields:
+                (player.x, player.y, player.facing, player.current_animation, player.animation_frame,
+                 player.invulnerable, player.invulnerable_timer) = fields
+                player.draw(world, camera_x, scale)
+
+
+class EntityViews:
+    """По одному объекту каждого класса сущностей без __init__ - только для draw"""
+
+    def __init__(self, game: 'Game'):
+        self.game = game
+
+        self.player = Player.__new__(Player)
+        self.player.game = game
+        self.player.width = 40
+        self.player.height = 60
+
+        self.enemy = Enemy.__new__(Enemy)
+        self.enemy.game = game
+        self.enemy.width = 40
+        self.enemy.height = 60
+
+        self.bullet = Bullet.__new__(Bullet)
+        self.bullet.game = game
+
+        self.pickup = Pickup.__new__(Pickup)
+        self.pickup.game = game
+        self.pickup.width = 20
+        self.pickup.height = 20
+
+        self.particle = Particle.__new__(Particle)
+
+    def enemy_frames(self, index: int) -> List[pygame.Surface]:
+
+        animation = self.game.sprite_manager.get_animation('enemyWalk')
+        return animation[index:] + animation[:index]
+
+    def mirrored_frames(self, frames: List[pygame.Surface]) -> List[Optional[pygame.Surface]]:
+
+        mirror = self.game.sprite_manager.mirror
+        return [mirror(frame) if frame else None for frame in frames]
+
+
+class SnapshotBuffer:
+    """Двойной буфер снимков: симуляция собирает следующий снимок, отрисовка читает опубликованный.
+
+    Снимки неизменяемы, поэтому публикация - замена одной ссылки: ни одна из
+    сторон не ждет другую.
+    """
+
+    def __init__(self):
+        self.front: Optional[RenderSnapshot] = None
+        self.published = 0
+        self.ready = threading.Event()
+
+    def publish(self, snapshot: RenderSnapshot) -> None:
+
+        self.front = snapshot
+        self.published += 1
+        self.ready.set()
+
+    def latest(self) -> Optional[RenderSnapshot]:
+
+        return self.front
@@ -0,0 +1,36 @@
+import pygame
+
+
+class RenderTarget:
+    """Внутренний буфер, в который рисуется игровой мир.
+
+    При scale == 1 мир рисуется прямо в поверхность экрана. При scale < 1
+    (например 0.5 - пиксель-арт 600x250) мир рисуется в уменьшенный буфер и один
+    раз за кадр растягивается на экран (ближайший сосед). Интерфейс рисуется
+    поверх уже в логическом разрешении экрана, поэтому координаты мыши остаются
+    в логическом пространстве.
+    """
+
+    def __init__(self, display: pygame.Surface, scale: float = 1.0):
+        if not 0 < scale <= 1:
+            raise ValueError(f"Масштаб рендера должен быть в (0, 1]: {scale}")
+
+        self.display = display
+        self.scale = scale
+        self.display_size = display.get_size()
+        self.width = max(1, round(self.display_size[0] * scale))
+        self.height = max(1, round(self.display_size[1] * scale))
+
+        if scale == 1:
+            self.surface = display
+        else:
+            self.surface = pygame.Surface((self.width, self.height)).convert()
+
+    def is_scaled(self) -> bool:
+
+        return self.surface is not self.display
+
+    def present(self) -> None:
+
+        if self.surface is not self.display:
+            pygame.transform.scale(self.surface, self.display_size, self.display)
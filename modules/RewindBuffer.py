@@ -0,0 +1,162 @@
+import re
+import struct
+from typing import List, Optional
+
+# Дельта: длина нового состояния, число измененных участков; участок: смещение, длина, затем байты
+DELTA_HEADER = struct.Struct('<IH')
+RUN_HEADER = struct.Struct('<II')
+# Ненулевые байты XOR двух состояний; разрывы короче поля double склеиваются в один участок
+CHANGED_RUNS = re.compile(rb'[^\x00]+(?:\x00{1,7}[^\x00]+)*')
+
+
+def encode_delta(previous: bytes, current: bytes) -> bytes:
+    """Дельта между соседними снимками: только участки, которые изменились"""
+    common = min(len(previous), len(current))
+    diff = (int.from_bytes(previous[:common], 'little') ^
+            int.from_bytes(current[:common], 'little')).to_bytes(common, 'little')
+
+    runs = [match.span() for match in CHANGED_RUNS.finditer(diff)]
+    if len(current) > common:
+        runs.append((common, len(current)))
+
+    parts = [DELTA_HEADER.pack(len(current), len(runs))]
+    for start, end in runs:
+        parts.append(RUN_HEADER.pack(start, end - start))
+        parts.append(current[start:end])
+    return b''.join(parts)
+
+
+def apply_delta(state: bytearray, delta: bytes) -> None:
+
+    length, count = DELTA_HEADER.unpack_from(delta, 0)
+    del state[length:]
+
+    offset = DELTA_HEADER.size
+    for _ in range(count):
+        start, size = RUN_HEADER.unpack_from(delta, offset)
+        offset += RUN_HEADER.size
+        state[start:start + size] = delta[offset:offset + size]
+        offset += size
+
+
+class RewindBuffer:
+    """Кольцевой буфер снимков SaveState за последние capacity тиков.
+
+    Снимки хранятся группами: полный ключевой снимок раз в keyframe_interval
+    тиков, за ним дельты к предыдущему тику (только измененные байты). Старые
+    группы вытесняются целиком - по числу тиков и по бюджету памяти в байтах.
+    Любой тик восстанавливается от ключевого снимка своей группы не более чем
+    за keyframe_interval дельт; шаг вперед от последнего восстановленного тика -
+    одна дельта.
+
+    Во время перемотки cursor указывает на показанный тик; следующий record()
+    отбрасывает более новые тики - история продолжается от этого места.
+    """
+
+    def __init__(self, capacity: int = 600, keyframe_interval: int = 60, budget_bytes: int = 2 * 1024 * 1024):
+        self.capacity = max(1, capacity)
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.budget_bytes = budget_bytes
+
+        self.groups: List[List[bytes]] = []
+        self.count = 0
+        self.size = 0
+        self.last: Optional[bytes] = None
+        self.cursor: Optional[int] = None
+
+        self.cached_index = -1
+        self.cached_state = bytearray()
+
+    def __len__(self) -> int:
+
+        return self.count
+
+    def clear(self) -> None:
+
+        self.groups = []
+        self.count = 0
+        self.size = 0
+        self.last = None
+        self.cursor = None
+        self.cached_index = -1
+
+    def is_rewinding(self) -> bool:
+
+        return self.cursor is not None
+
+    def record(self, state: bytes) -> None:
+
+        if self.cursor is not None:
+            self.truncate(self.cursor)
+
+        if self.count % self.keyframe_interval == 0:
+            entry = state
+            self.groups.append([entry])
+        else:
+            entry = encode_delta(self.last, state)
+            self.groups[-1].append(entry)
+
+        self.size += len(entry)
+        self.count += 1
+        self.last = state
+
+        while len(self.groups) > 1 and (self.count > self.capacity or self.size > self.budget_bytes):
+            self.evict()
+
+    def evict(self) -> None:
+        """Вытесняем самую старую группу; номера оставшихся тиков сдвигаются на ее длину"""
+        group = self.groups.pop(0)
+        self.count -= len(group)
+        self.size -= sum(map(len, group))
+        self.cached_index -= len(group)
+
+    def truncate(self, index: int) -> None:
+        """Оставляем тики до index включительно"""
+        self.last = self.state_at(index)
+
+        group_index, position = divmod(index, self.keyframe_interval)
+        removed = self.groups[group_index][position + 1:] + [
+            entry for group in self.groups[group_index + 1:] for entry in group]
+        del self.groups[group_index][position + 1:]
+        del self.groups[group_index + 1:]
+
+        self.size -= sum(map(len, removed))
+        self.count = index + 1
+        self.cursor = None
+
+    def state_at(self, index: int) -> bytes:
+
+        group_index, position = divmod(index, self.keyframe_interval)
+        group = self.groups[group_index]
+
+        cached_group, cached_position = divmod(self.cached_index, self.keyframe_interval)
+        if self.cached_index >= 0 and cached_group == group_index and cached_position <= position:
+            state = self.cached_state
+            first = cached_position + 1
+        else:
+            state = bytearray(group[0])
+            first = 1
+
+        for delta in group[first:position + 1]:
+            apply_delta(state, delta)
+
+        self.cached_index = index
+        self.cached_state = state
+        return bytes(state)
+
+    def step_back(self, ticks: int = 1) -> Optional[bytes]:
+
+        if self.count == 0:
+            return None
+
+        current = self.count - 1 if self.cursor is None else self.cursor
+        self.cursor = max(0, current - ticks)
+        return self.state_at(self.cursor)
+
+    def step_forward(self, ticks: int = 1) -> Optional[bytes]:
+
+        if self.cursor is None:
+            return None
+
+        self.cursor = min(self.count - 1, self.cursor + ticks)
+        return self.state_at(self.cursor)
@@ -0,0 +1,207 @@
+import struct
+from array import array
+from typing import List, TYPE_CHECKING
+
+from .Player import Player
+
+if TYPE_CHECKING:
+    from modules.Game import Game
+
+# magic, версия формата
+HEADER_FORMAT = struct.Struct('<4sH')
+MAGIC = b'CTSV'
+VERSION = 2
+
+# Состояние игры: GameState, счет, жизни, уровень, seed, время, камера, ширина уровня,
+# мышь (зажата, время нажатия), тик анимаций, есть ли игрок и второй игрок, число записей каждого вида
+GAME_RECORD = struct.Struct('<BIhHQIdI?II??IIIII')
+# Генератор случайных чисел: версия, есть ли gauss_next, gauss_next; далее 625 слов состояния MT
+RNG_RECORD = struct.Struct('<B?d')
+RNG_WORDS = 625
+PLATFORM_RECORD = struct.Struct('<iiiiI')
+PLAYER_RECORD = struct.Struct('<dddd?Bh?hBHIHHI')
+ENEMY_RECORD = struct.Struct('<ddhdbIddB')
+BULLET_RECORD = struct.Struct('<ddddB?hd')
+PICKUP_RECORD = struct.Struct('<ddB')
+PARTICLE_RECORD = struct.Struct('<dddddhBBB')
+
+FACINGS = ('right', 'left')
+ANIMATIONS = ('idle', 'walk', 'jump')
+PICKUP_TYPES = ('health', 'ammo')
+
+
+def pack_player(player: Player) -> bytes:
+
+    weapon = player.weapons['pistol']
+    return PLAYER_RECORD.pack(
+        player.x, player.y, player.velocity_x, player.velocity_y, player.is_jumping,
+        FACINGS.index(player.facing), player.health, player.invulnerable, player.invulnerable_timer,
+        ANIMATIONS.index(player.current_animation), player.animation_frame, player.animation_start,
+        weapon['ammo'], weapon['max_ammo'], player.last_shot
+    )
+
+
+def restore_player(player: Player, data: bytes, offset: int) -> None:
+
+    (player.x, player.y, player.velocity_x, player.velocity_y, player.is_jumping, facing, player.health,
+     player.invulnerable, player.invulnerable_timer, animation, player.animation_frame, player.animation_start,
+     ammo, max_ammo, player.last_shot) = PLAYER_RECORD.unpack_from(data, offset)
+    player.facing = FACINGS[facing]
+    player.current_animation = ANIMATIONS[animation]
+    player.weapons['pistol']['ammo'] = ammo
+    player.weapons['pistol']['max_ammo'] = max_ammo
+    player.sync_rect()
+
+
+class SaveState:
+    """Бинарный снимок игры: записи фиксированного размера (struct) для каждой сущности.
+
+    В снимок попадает только состояние симуляции - без ссылок на Game, спрайты и
+    шрифты. Числа с плавающей точкой хранятся как double, поэтому игра,
+    продолженная из снимка, идет точно так же, как исходная (с тем же вводом).
+    Снимок делается между тиками, когда отложенных удалений нет.
+    """
+
+    @staticmethod
+    def capture(game: 'Game') -> bytes:
+
+        # Состояние игры храним индексом в перечислении GameState
+        game_states = list(type(game.game_state))
+        player = game.player
+        partner = game.partner
+        platforms = game.platforms
+        enemies = game.enemies.items
+        bullets = game.bullets.items
+        pickups = game.pickups.items
+        particles = game.particles.items
+
+        rng_version, rng_words, gauss_next = game.rng.getstate()
+
+        parts: List[bytes] = [
+            HEADER_FORMAT.pack(MAGIC, VERSION),
+            GAME_RECORD.pack(
+                game_states.index(game.game_state),
+                game.score, game.lives, game.level, game.seed, game.ticks, game.camera_x,
+                game.level_width, game.mouse_pressed, game.last_mouse_press_time,
+                game.animation_clock.ticks, player is not None, partner is not None,
+                len(platforms), len(enemies), len(bullets), len(pickups), len(particles)
+            ),
+            RNG_RECORD.pack(rng_version, gauss_next is not None, gauss_next or 0.0),
+            array('I', rng_words).tobytes()
+        ]
+
+        if player:
+            parts.append(pack_player(player))
+        if partner:
+            parts.append(pack_player(partner))
+
+        pack = PLATFORM_RECORD.pack
+        parts.extend([pack(p['x'], p['y'], p['width'], p['height'], p['id']) for p in platforms])
+
+        pack = ENEMY_RECORD.pack
+        parts.extend([pack(e.x, e.y, e.health, e.speed, e.direction, e.platform_id,
+                           e.patrol_min, e.patrol_max, e.animation_phase) for e in enemies])
+
+        pack = BULLET_RECORD.pack
+        parts.extend([pack(b.x, b.y, b.prev_x, b.prev_y, b.direction == 'left', b.is_enemy,
+                           b.damage, b.angle) for b in bullets])
+
+        pack = PICKUP_RECORD.pack
+        parts.extend([pack(p.x, p.y, PICKUP_TYPES.index(p.type)) for p in pickups])
+
+        pack = PARTICLE_RECORD.pack
+        parts.extend([pack(p.x, p.y, p.size, p.speed_x, p.speed_y, p.life, *p.color) for p in particles])
+
+        return b''.join(parts)
+
+    @staticmethod
+    def restore(game: 'Game', data: bytes) -> None:
+        """Восстанавливаем игру из снимка; спрайты уровня должны быть уже загружены"""
+        magic, version = HEADER_FORMAT.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Не снимок состояния игры")
+        if version != VERSION:
+            raise ValueError(f"Неподдерживаемая версия снимка {version}")
+        offset = HEADER_FORMAT.size
+
+        (state_index, game.score, game.lives, game.level, game.seed, game.ticks, game.camera_x,
+         game.level_width, game.mouse_pressed, game.last_mouse_press_time, animation_ticks, has_player,
+         has_partner, platform_count, enemy_count, bullet_count, pickup_count, particle_count) = GAME_RECORD.unpack_from(data, offset)
+        offset += GAME_RECORD.size
+
+        rng_version, has_gauss, gauss_next = RNG_RECORD.unpack_from(data, offset)
+        offset += RNG_RECORD.size
+        rng_words = array('I')
+        rng_words.frombytes(data[offset:offset + RNG_WORDS * 4])
+        offset += RNG_WORDS * 4
+
+        game.bullet_pool.release_all(game.bullets)
+        game.pickup_pool.release_all(game.pickups)
+        game.particle_pool.release_all(game.particles)
+        game.enemy_pool.release_all(game.enemies)
+        game.enemies.clear()
+        game.bullets.clear()
+        game.pickups.clear()
+        game.particles.clear()
+
+        game.game_state = list(type(game.game_state))[state_index]
+        game.animation_clock.ticks = animation_ticks
+        game.animation_clock.refresh(True)
+
+        if has_player:
+            game.player = game.player or Player(game)
+            restore_player(game.player, data, offset)
+            offset += PLAYER_RECORD.size
+        else:
+            game.player = None
+
+        if has_partner:
+            game.partner = game.partner or Player(game)
+            restore_player(game.partner, data, offset)
+            offset += PLAYER_RECORD.size
+        else:
+            game.partner = None
+
+        end = offset + platform_count * PLATFORM_RECORD.size
+        game.set_platforms([{'x': x, 'y': y, 'width': width, 'height': height, 'id': platform_id}
+                            for x, y, width, height, platform_id in PLATFORM_RECORD.iter_unpack(data[offset:end])])
+        offset = end
+
+        end = offset + enemy_count * ENEMY_RECORD.size
+        for x, y, health, speed, direction, platform_id, patrol_min, patrol_max, phase in \
+                ENEMY_RECORD.iter_unpack(data[offset:end]):
+            enemy = game.enemy_pool.acquire(game, x, y, platform_id)
+            enemy.x, enemy.y = x, y
+            enemy.health = health
+            enemy.speed = speed
+            enemy.direction = direction
+            enemy.patrol_min, enemy.patrol_max = patrol_min, patrol_max
+            enemy.animation_phase = phase
+            enemy.sync_rect()
+            game.enemies.add(enemy)
+        offset = end
+
+        end = offset + bullet_count * BULLET_RECORD.size
+        for x, y, prev_x, prev_y, left, is_enemy, damage, angle in BULLET_RECORD.iter_unpack(data[offset:end]):
+            bullet = game.bullet_pool.acquire(game, x, y, 'left' if left else 'right', is_enemy, damage, angle)
+            bullet.prev_x, bullet.prev_y = prev_x, prev_y
+            bullet.update_sweep()
+            game.bullets.add(bullet)
+        offset = end
+
+        end = offset + pickup_count * PICKUP_RECORD.size
+        game.pickups.extend(game.pickup_pool.acquire(game, x, y, PICKUP_TYPES[type_index])
+                            for x, y, type_index in PICKUP_RECORD.iter_unpack(data[offset:end]))
+        offset = end
+
+        end = offset + particle_count * PARTICLE_RECORD.size
+        for x, y, size, speed_x, speed_y, life, r, g, b in PARTICLE_RECORD.iter_unpack(data[offset:end]):
+            particle = game.particle_pool.acquire(x, y, game.rng)
+            particle.size = size
+            particle.speed_x, particle.speed_y = speed_x, speed_y
+            particle.life = life
+            particle.color = (r, g, b)
+            game.particles.add(particle)
+
+        # Частицы из пула берут случайные числа - состояние генератора восстанавливаем последним
+        game.rng.setstate((rng_version, tuple(rng_words), gauss_next if has_gauss else None))
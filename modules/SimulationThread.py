@@ -0,0 +1,87 @@
+import threading
+import time
+from typing import List, Optional, TYPE_CHECKING
+
+import pygame
+
+from .InputState import FrameInput
+from .RenderSnapshot import RenderSnapshot, SnapshotBuffer
+
+if TYPE_CHECKING:
+    from modules.Game import Game
+
+
+class SimulationThread(threading.Thread):
+    """Тики симуляции в отдельном потоке с фиксированным шагом.
+
+    Главный поток снимает ввод и отдает его через submit(); поток симуляции на
+    каждом тике берет последний ввод (нажатия клавиш копятся, чтобы не
+    потеряться между тиками), выполняет Game.simulate_frame под game.sim_lock и
+    публикует RenderSnapshot в буфер. Отрисовка и симуляция идут каждая со своим
+    бюджетом времени: медленный кадр отрисовки не задерживает физику.
+    """
+
+    def __init__(self, game: 'Game', fps: int = 60):
+        super().__init__(name='Simulation', daemon=True)
+        self.game = game
+        self.interval = 1.0 / fps
+        self.snapshots = SnapshotBuffer()
+
+        self.input_lock = threading.Lock()
+        self.latest_input = FrameInput()
+        self.pending_keydowns: List[int] = []
+        self.running = True
+
+        self.ticks = 0
+        self.late_ticks = 0
+
+    def submit(self, frame_input: FrameInput) -> None:
+
+        with self.input_lock:
+            self.latest_input = frame_input
+            self.pending_keydowns.extend(frame_input.keydowns)
+
+    def take_input(self) -> FrameInput:
+
+        with self.input_lock:
+            latest = self.latest_input
+            keydowns = self.pending_keydowns
+            self.pending_keydowns = []
+        return FrameInput(latest.keys, latest.mouse_pos, latest.mouse_buttons, keydowns, pygame.time.get_ticks())
+
+    def step(self) -> None:
+
+        game = self.game
+        frame = self.take_input()
+        with game.sim_lock:
+            game.simulate_frame(frame)
+            snapshot = RenderSnapshot.capture(game)
+        self.snapshots.publish(snapshot)
+        self.ticks += 1
+
+    def run(self) -> None:
+
+        perf_counter = time.perf_counter
+        next_tick = perf_counter()
+
+        while self.running:
+            self.step()
+
+            next_tick += self.interval
+            delay = next_tick - perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -self.interval:
+                # Отстали больше чем на тик - не догоняем серией тиков, а сдвигаем расписание
+                self.late_ticks += 1
+                next_tick = perf_counter()
+
+    def stop(self) -> None:
+
+        self.running = False
+        if self.is_alive():
+            self.join()
+
+    def latest_snapshot(self) -> Optional[RenderSnapshot]:
+
+        return self.snapshots.latest()
@@ -0,0 +1,140 @@
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+SLOT_BITS = 32
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+
+class SlotMap:
+    """Контейнер сущностей с поколенческими дескрипторами.
+
+    Сущности хранятся плотным списком, удаление - перестановкой с последним
+    элементом за O(1). Во время тика сущности только помечаются на удаление
+    (discard), а фактическое удаление выполняется один раз в flush().
+    Элементы должны иметь атрибут handle - в него записывается дескриптор.
+    """
+
+    __slots__ = ('items', 'dense_slots', 'slot_dense', 'slot_generation', 'free_slots',
+                 'pending', 'slot_pending')
+
+    def __init__(self, items: Iterable[Any] = ()):
+        self.items: List[Any] = []
+        self.dense_slots: List[int] = []
+        self.slot_dense: List[int] = []
+        self.slot_generation: List[int] = []
+        self.free_slots: List[int] = []
+        self.pending: List[int] = []
+        self.slot_pending: List[bool] = []
+
+        self.extend(items)
+
+    def add(self, item: Any) -> int:
+
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            slot = len(self.slot_dense)
+            self.slot_dense.append(-1)
+            self.slot_generation.append(0)
+            self.slot_pending.append(False)
+
+        self.slot_dense[slot] = len(self.items)
+        self.items.append(item)
+        self.dense_slots.append(slot)
+
+        handle = (self.slot_generation[slot] << SLOT_BITS) | slot
+        item.handle = handle
+        return handle
+
+    def extend(self, items: Iterable[Any]) -> None:
+
+        for item in items:
+            self.add(item)
+
+    def get(self, handle: int) -> Optional[Any]:
+
+        slot = handle & SLOT_MASK
+        if slot >= len(self.slot_dense) or self.slot_generation[slot] != handle >> SLOT_BITS:
+            return None
+        index = self.slot_dense[slot]
+        return self.items[index] if index >= 0 else None
+
+    def is_pending(self, item: Any) -> bool:
+
+        return self.slot_pending[item.handle & SLOT_MASK]
+
+    def discard(self, item: Any) -> None:
+        """Отложенное удаление: сущность остается в контейнере до flush()"""
+        slot = item.handle & SLOT_MASK
+        if self.slot_pending[slot] or self.slot_generation[slot] != item.handle >> SLOT_BITS:
+            return
+        self.slot_pending[slot] = True
+        self.pending.append(slot)
+
+    def remove(self, item: Any) -> None:
+
+        slot = item.handle & SLOT_MASK
+        if self.slot_generation[slot] == item.handle >> SLOT_BITS and self.slot_dense[slot] >= 0:
+            self.remove_slot(slot)
+
+    def remove_slot(self, slot: int) -> Any:
+
+        index = self.slot_dense[slot]
+        items = self.items
+        item = items[index]
+
+        last_slot = self.dense_slots[-1]
+        last_item = items.pop()
+        self.dense_slots.pop()
+        if last_item is not item:
+            items[index] = last_item
+            self.dense_slots[index] = last_slot
+            self.slot_dense[last_slot] = index
+
+        self.slot_dense[slot] = -1
+        self.slot_generation[slot] += 1
+        self.slot_pending[slot] = False
+        self.free_slots.append(slot)
+        return item
+
+    def flush(self, on_remove: Optional[Callable[[Any], None]] = None) -> int:
+
+        pending = self.pending
+        if not pending:
+            return 0
+
+        for slot in pending:
+            item = self.remove_slot(slot)
+            if on_remove:
+                on_remove(item)
+
+        count = len(pending)
+        pending.clear()
+        return count
+
+    def clear(self) -> None:
+
+        for slot in self.dense_slots:
+            self.slot_dense[slot] = -1
+            self.slot_generation[slot] += 1
+            self.slot_pending[slot] = False
+            self.free_slots.append(slot)
+
+        self.items.clear()
+        self.dense_slots.clear()
+        self.pending.clear()
+
+    def __iter__(self) -> Iterator[Any]:
+
+        return iter(self.items)
+
+    def __len__(self) -> int:
+
+        return len(self.items)
+
+    def __bool__(self) -> bool:
+
+        return bool(self.items)
+
+    def __getitem__(self, index: int) -> Any:
+
+        return self.items[index]
@@ -0,0 +1,329 @@
+import gc
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+from .Game import Game, GameState, FPS, ACTIVE_STATES
+from .InputState import FrameInput, KeyState, KEY_BITS
+from .FrameTimeHarness import FrameStats
+from .LevelGenerator import jump_height
+
+MB = 1024 * 1024
+
+
+def current_rss() -> int:
+    """Резидентная память процесса в байтах; 0 - если платформа ее не сообщает"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # Без /proc доступен только пик: в macOS в байтах, в остальных системах в КБ
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class SoakBot:
+    """Простой бот, который проходит уровни через тот же путь ввода, что и запись сессий.
+
+    Цель - ближайший враг (без патронов - ближайший ящик патронов). Бот идет к
+    цели до engage_distance, прыгает на платформу из Game.platforms, если цель
+    выше и платформа на пути достижима прыжком, и держит кнопку мыши, целясь в
+    центр врага; темп стрельбы ограничивает сама игра. Если бот не сдвигается
+    stuck_frames кадров, он прыгает.
+    """
+
+    def __init__(self, game: Game, engage_distance: float = 250.0, fire_distance: float = 600.0,
+                 stuck_frames: int = 45):
+        self.game = game
+        self.engage_distance = engage_distance
+        self.fire_distance = fire_distance
+        self.stuck_frames = stuck_frames
+        self.max_rise = jump_height() - 10
+
+        self.last_x = 0.0
+        self.still_frames = 0
+
+    def target(self) -> Tuple[Optional[Tuple[float, float]], bool]:
+        """Центр цели и признак врага (False - идем за патронами)"""
+        player = self.game.player
+        center_x = player.x + player.width / 2
+
+        if player.weapons[player.current_weapon]['ammo'] <= 0:
+            ammo = [pickup for pickup in self.game.pickups if pickup.type == 'ammo']
+            if ammo:
+                pickup = min(ammo, key=lambda item: abs(item.x - center_x))
+                return (pickup.x + pickup.width / 2, pickup.y + pickup.height / 2), False
+
+        if not self.game.enemies:
+            return None, False
+        enemy = min(self.game.enemies, key=lambda item: abs(item.x + item.width / 2 - center_x))
+        return (enemy.x + enemy.width / 2, enemy.y + enemy.height / 2), True
+
+    def step_platform(self, direction: int, target_y: float) -> Optional[Dict]:
+        """Ближайшая по ходу платформа выше ног игрока, на которую можно запрыгнуть"""
+        player = self.game.player
+        feet = player.y + player.height
+        best = None
+        for platform in self.game.platforms:
+            rise = feet - platform['y']
+            if rise <= 5 or rise > self.max_rise or platform['y'] < target_y:
+                continue
+            if direction > 0:
+                distance = platform['x'] - (player.x + player.width)
+            else:
+                distance = player.x - (platform['x'] + platform['width'])
+            if distance > self.engage_distance:
+                continue
+            if best is None or distance < best[0]:
+                best = (distance, platform)
+        return best[1] if best else None
+
+    def next_input(self, ticks: int) -> FrameInput:
+
+        game = self.game
+        if game.game_state == GameState.LEVEL_COMPLETE:
+            return FrameInput(keydowns=[pygame.K_RETURN], ticks=ticks)
+        if game.game_state not in ACTIVE_STATES or not game.player:
+            return FrameInput(ticks=ticks)
+
+        player = game.player
+        target, is_enemy = self.target()
+        if target is None:
+            return FrameInput(ticks=ticks)
+
+        target_x, target_y = target
+        dx = target_x - (player.x + player.width / 2)
+        direction = 1 if dx > 0 else -1
+
+        mask = 0
+        if not is_enemy or abs(dx) > self.engage_distance:
+            mask |= KEY_BITS[pygame.K_d] if direction > 0 else KEY_BITS[pygame.K_a]
+
+        if abs(player.x - self.last_x) < 0.5 and mask:
+            self.still_frames += 1
+        else:
+            self.still_frames = 0
+        self.last_x = player.x
+
+        if not player.is_jumping:
+            platform = None
+            if target_y < player.y:
+                platform = self.step_platform(direction, target_y)
+            if self.still_frames > self.stuck_frames or (
+                    platform is not None and platform['x'] - 60 < player.x < platform['x'] + platform['width']):
+                mask |= KEY_BITS[pygame.K_SPACE]
+                self.still_frames = 0
+
+        firing = is_enemy and abs(dx) <= self.fire_distance
+        mouse_pos = (int(target_x - game.camera_x), int(target_y))
+        return FrameInput(KeyState(mask), mouse_pos, (firing, False, False), ticks=ticks)
+
+
+class LevelRun:
+    """Итог прохождения одного уровня в одном цикле"""
+
+    __slots__ = ('cycle', 'level', 'outcome', 'frames', 'stats', 'objects', 'rss')
+
+    def __init__(self, cycle: int, level: int, outcome: str, frames: int, stats: FrameStats,
+                 objects: Dict[str, int], rss: int):
+        self.cycle = cycle
+        self.level = level
+        self.outcome = outcome
+        self.frames = frames
+        self.stats = stats
+        self.objects = objects
+        self.rss = rss
+
+    def to_dict(self) -> Dict:
+
+        return {
+            'cycle': self.cycle,
+            'level': self.level,
+            'outcome': self.outcome,
+            'frames': self.frames,
+            'frame_ms': self.stats.to_dict(),
+            'objects': self.objects,
+            'rss': self.rss
+        }
+
+
+class SoakHarness:
+    """Длительный прогон: бот играет все уровни по кругу без ограничения FPS.
+
+    Цикл - одна игра от start() до победы, проигрыша или застревания бота
+    (max_level_frames кадров на уровне); следующий цикл начинается заново.
+    После каждого уровня записываются перцентили времени кадра, число объектов
+    (все объекты gc, живые сущности, свободные объекты пулов) и RSS процесса.
+
+    Дрейф ищется отдельно для каждого уровня: первые warmup_cycles циклов
+    пропускаются, остальные делятся пополам, и медиана второй половины
+    сравнивается с медианой первой. Время кадра считается выросшим больше чем на
+    tolerance (доля) плюс slack_ms, объекты gc - больше чем на object_tolerance,
+    RSS - больше чем на rss_slack_mb.
+    """
+
+    def __init__(self, game: Game, cycles: int = 0, duration: float = 0.0, seed: int = 1,
+                 warmup_cycles: int = 1, tolerance: float = 0.15, slack_ms: float = 0.25,
+                 object_tolerance: float = 0.05, rss_slack_mb: float = 16.0,
+                 max_level_frames: int = 120 * FPS, report_path: Optional[str] = None):
+        self.game = game
+        self.cycles = cycles
+        self.duration = duration
+        self.seed = seed
+        self.warmup_cycles = warmup_cycles
+        self.tolerance = tolerance
+        self.slack_ms = slack_ms
+        self.object_tolerance = object_tolerance
+        self.rss_slack = rss_slack_mb * MB
+        self.max_level_frames = max_level_frames
+        self.report_path = report_path
+
+        self.bot = SoakBot(game)
+        self.runs: List[LevelRun] = []
+        self.cycle = 0
+        self.frames = 0
+        self.outcomes: Dict[str, int] = {}
+
+    def count_objects(self) -> Dict[str, int]:
+
+        game = self.game
+        return {
+            # Записи самого прогона (LevelRun и его FrameStats) не считаем
+            'gc': len(gc.get_objects()) - 2 * len(self.runs),
+            'enemies': len(game.enemies),
+            'bullets': len(game.bullets),
+            'particles': len(game.particles),
+            'pickups': len(game.pickups),
+            'pooled': sum(len(pool.free) for pool in
+                          (game.bullet_pool, game.particle_pool, game.pickup_pool, game.enemy_pool))
+        }
+
+    def finish_level(self, level: int, outcome: str, frames: int, samples: List[float]) -> None:
+
+        run = LevelRun(self.cycle, level, outcome, frames, FrameStats.from_samples(samples),
+                       self.count_objects(), current_rss())
+        self.runs.append(run)
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+        objects = run.objects
+        print(f"Цикл {run.cycle} уровень {level} ({outcome}): {run.stats} | "
+              f"объекты gc {objects['gc']}, пули {objects['bullets']}, частицы {objects['particles']}, "
+              f"в пулах {objects['pooled']} | RSS {run.rss / MB:.1f} МБ")
+
+        if self.report_path:
+            with open(self.report_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(run.to_dict()) + '\n')
+
+    def play_cycle(self) -> None:
+        """Одна игра ботом от начала до победы, проигрыша или застревания"""
+        game = self.game
+        game.start(self.seed + self.cycle)
+        perf_counter = time.perf_counter
+
+        level = game.level
+        level_frames = 0
+        samples: List[float] = []
+
+        while True:
+            frame = self.bot.next_input(self.frames * 1000 // FPS)
+            steady = game.game_state == GameState.PLAYING and not frame.keydowns
+
+            started = perf_counter()
+            game.gc_policy.update(game.game_state == GameState.PLAYING)
+            game.replay_frame(frame)
+            game.render()
+            elapsed = (perf_counter() - started) * 1000.0
+
+            self.frames += 1
+            level_frames += 1
+            if steady and game.game_state == GameState.PLAYING:
+                samples.append(elapsed)
+
+            state = game.game_state
+            if state == GameState.LEVEL_COMPLETE:
+                self.finish_level(level, 'пройден', level_frames, samples)
+            elif state == GameState.WIN:
+                self.finish_level(level, 'победа', level_frames, samples)
+                break
+            elif state == GameState.GAME_OVER:
+                self.finish_level(level, 'проигрыш', level_frames, samples)
+                break
+            elif level_frames >= self.max_level_frames:
+                self.finish_level(level, 'застрял', level_frames, samples)
+                break
+            else:
+                continue
+
+            # Уровень пройден: следующий кадр бота нажмет клавишу продолжения
+            level = game.level
+            level_frames = 0
+            samples = []
+
+        game.gc_policy.update(False)
+
+    def find_drift(self) -> List[str]:
+
+        warnings = []
+        levels = sorted({run.level for run in self.runs})
+        for level in levels:
+            runs = [run for run in self.runs
+                    if run.level == level and run.cycle >= self.warmup_cycles and run.stats.frames]
+            if len(runs) < 4:
+                continue
+            half = len(runs) // 2
+            early, late = runs[:half], runs[half:]
+            # Медиана, а не среднее: один цикл, прерванный планировщиком, не должен давать дрейф
+            median = statistics.median
+
+            for metric in ('p50', 'p95'):
+                before = median([getattr(run.stats, metric) for run in early])
+                after = median([getattr(run.stats, metric) for run in late])
+                if after > before * (1.0 + self.tolerance) + self.slack_ms:
+                    warnings.append(f"уровень {level} {metric}: {before:.3f} -> {after:.3f} мс")
+
+            before = median([run.objects['gc'] for run in early])
+            after = median([run.objects['gc'] for run in late])
+            if after > before * (1.0 + self.object_tolerance):
+                warnings.append(f"уровень {level} объекты gc: {before:.0f} -> {after:.0f}")
+
+            before = median([run.rss for run in early])
+            after = median([run.rss for run in late])
+            if after > before + self.rss_slack:
+                warnings.append(f"уровень {level} RSS: {before / MB:.1f} -> {after / MB:.1f} МБ")
+
+        return warnings
+
+    def run(self) -> bool:
+        """Возвращает False, если найден рост времени кадра, объектов или памяти"""
+        started = time.monotonic()
+        try:
+            while True:
+                self.play_cycle()
+                self.cycle += 1
+                if self.cycles and self.cycle >= self.cycles:
+                    break
+                if self.duration and time.monotonic() - started >= self.duration:
+                    break
+        except KeyboardInterrupt:
+            print("Прогон остановлен")
+
+        elapsed = time.monotonic() - started
+        outcomes = ', '.join(f"{outcome} {count}" for outcome, count in sorted(self.outcomes.items()))
+        print(f"Циклов: {self.cycle}, кадров: {self.frames}, {self.frames / max(elapsed, 1e-9):.0f} кадров/с; "
+              f"уровни: {outcomes}")
+
+        warnings = self.find_drift()
+        for warning in warnings:
+            print(f"⚠ Дрейф: {warning}")
+        return not warnings
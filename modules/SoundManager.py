@@ -0,0 +1,163 @@
+import pygame
+import os
+import random
+from array import array
+from typing import Dict, List, Optional
+
+# Эффект: приоритет (кого можно вытеснить), минимальный интервал между запусками (мс), громкость
+SOUND_EFFECTS: Dict[str, tuple] = {
+    'shoot': (1, 60, 0.35),
+    'hit': (2, 150, 0.6),
+    'jump': (1, 100, 0.4),
+    'pickup': (2, 80, 0.6),
+    'explosion': (3, 40, 0.7),
+}
+
+
+class SoundManager:
+    """Банк звуковых эффектов.
+
+    Все эффекты уровня декодируются при загрузке (файлы из sounds/ или
+    синтезированные фолбэки) и проигрываются через фиксированный пул каналов.
+    Если свободного канала нет, вытесняется самый старый звук с приоритетом не
+    выше нового; частые повторы одного эффекта отсекаются по интервалу. Во время
+    игры ничего не загружается и не создается.
+    """
+
+    def __init__(self, channels: int = 12):
+        self.sounds: Dict[str, pygame.mixer.Sound] = {}
+        self.base_path = "sounds"
+        self.current_level = 1
+        self.enabled = pygame.mixer.get_init() is not None
+
+        self.level_sounds: Dict[int, Dict[str, str]] = {
+            1: {},
+            2: {},
+            3: {}
+        }
+
+        self.channels: List[pygame.mixer.Channel] = []
+        self.channel_started: List[int] = []
+        self.channel_priority: List[int] = []
+        self.last_played: Dict[str, int] = {name: -1_000_000 for name in SOUND_EFFECTS}
+
+        if self.enabled:
+            pygame.mixer.set_num_channels(channels)
+            self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+            self.channel_started = [0] * channels
+            self.channel_priority = [0] * channels
+
+    def load_all_sounds(self) -> None:
+
+        for level in self.level_sounds:
+            self.level_sounds[level] = {
+                'shoot': 'shoot.wav',
+                'hit': 'hit.wav',
+                'jump': 'jump.wav',
+                'pickup': 'pickup.wav',
+                'explosion': f'explosion_level{level}.wav',
+            }
+
+        self.load_sounds_for_level(1)
+
+    def load_sounds_for_level(self, level: int) -> None:
+
+        if not self.enabled:
+            return
+
+        self.current_level = level
+        self.stop_all()
+        self.sounds.clear()
+
+        for name, filename in self.level_sounds.get(level, {}).items():
+            self.load_sound(name, filename, level)
+
+    def load_sound(self, name: str, filename: str, level: int = 1) -> None:
+
+        path = os.path.join(self.base_path, filename)
+        sound = None
+        try:
+            if os.path.exists(path):
+                sound = pygame.mixer.Sound(path)
+                print(f"✓ Загружен звук уровня {level}: {name} из {path}")
+        except pygame.error as e:
+            print(f"✗ Ошибка загрузки звука {name}: {e}")
+
+        if sound is None:
+            sound = self.create_fallback_sound(name, level)
+        if sound is not None:
+            sound.set_volume(SOUND_EFFECTS[name][2])
+            self.sounds[name] = sound
+
+    def create_fallback_sound(self, name: str, level: int = 1) -> Optional[pygame.mixer.Sound]:
+        """Синтезируем короткий эффект; высота тона зависит от уровня"""
+        frequency, sample_format, channels = pygame.mixer.get_init()
+        if sample_format != -16:
+            return None
+
+        pitch = 1.0 + 0.12 * (level - 1)
+        rng = random.Random(level)
+
+        if name == 'shoot':
+            duration, start, end, noise = 0.08, 900.0, 500.0, 0.0
+        elif name == 'hit':
+            duration, start, end, noise = 0.14, 220.0, 110.0, 0.2
+        elif name == 'jump':
+            duration, start, end, noise = 0.12, 300.0, 640.0, 0.0
+        elif name == 'pickup':
+            duration, start, end, noise = 0.15, 660.0, 1320.0, 0.0
+        else:
+            duration, start, end, noise = 0.35, 120.0, 40.0, 0.85
+
+        count = int(frequency * duration)
+        samples = array('h', bytes(2 * count * channels))
+        phase = 0.0
+        for i in range(count):
+            progress = i / count
+            tone = (start + (end - start) * progress) * pitch
+            phase += tone / frequency
+            square = 1.0 if phase % 1.0 < 0.5 else -1.0
+            value = square * (1.0 - noise) + rng.uniform(-1.0, 1.0) * noise
+            sample = int(value * (1.0 - progress) ** 2 * 12000)
+            for channel in range(channels):
+                samples[i * channels + channel] = sample
+
+        return pygame.mixer.Sound(buffer=samples.tobytes())
+
+    def play(self, name: str, ticks: int) -> None:
+        """Запуск эффекта; ticks - игровое время в мс для ограничения частоты"""
+        if not self.enabled:
+            return
+
+        sound = self.sounds.get(name)
+        if sound is None:
+            return
+
+        priority, min_interval, _ = SOUND_EFFECTS[name]
+        if 0 <= ticks - self.last_played[name] < min_interval:
+            return
+
+        index = self.find_channel(priority)
+        if index < 0:
+            return
+
+        self.channels[index].play(sound)
+        self.channel_started[index] = ticks
+        self.channel_priority[index] = priority
+        self.last_played[name] = ticks
+
+    def find_channel(self, priority: int) -> int:
+        """Свободный канал или самый старый звук с приоритетом не выше; -1 - все заняты важнее"""
+        oldest = -1
+        for index, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return index
+            if self.channel_priority[index] <= priority and (
+                    oldest < 0 or self.channel_started[index] < self.channel_started[oldest]):
+                oldest = index
+        return oldest
+
+    def stop_all(self) -> None:
+
+        for channel in self.channels:
+            channel.stop()
@@ -0,0 +1,44 @@
+from typing import Dict, List, Tuple
+
+import pygame
+
+# Ширина столбца сетки широкой фазы - 128 пикселей
+GRID_CELL_SHIFT = 7
+
+
+def build_column_grid(rects: List[pygame.Rect]) -> Dict[int, Tuple[List[int], List[pygame.Rect]]]:
+    """Раскладываем прямоугольники по вертикальным столбцам сетки: столбец -> (индексы, прямоугольники).
+
+    Индексы в каждом столбце идут по возрастанию, как в исходном списке.
+    """
+    grid: Dict[int, Tuple[List[int], List[pygame.Rect]]] = {}
+    for index, rect in enumerate(rects):
+        for column in range(rect.left >> GRID_CELL_SHIFT, ((rect.right - 1) >> GRID_CELL_SHIFT) + 1):
+            cell = grid.get(column)
+            if cell is None:
+                cell = grid[column] = ([], [])
+            cell[0].append(index)
+            cell[1].append(rect)
+    return grid
+
+
+def grid_collide_all(grid: Dict[int, Tuple[List[int], List[pygame.Rect]]], rect: pygame.Rect) -> Tuple[List[int], int]:
+    """Индексы пересеченных прямоугольников по возрастанию (как collidelistall) и число проверок"""
+    first = rect.left >> GRID_CELL_SHIFT
+    last = (rect.right - 1) >> GRID_CELL_SHIFT
+    if first == last:
+        cell = grid.get(first)
+        if cell is None:
+            return [], 0
+        indices, rects = cell
+        return [indices[hit] for hit in rect.collidelistall(rects)], len(rects)
+
+    hits = set()
+    tests = 0
+    for column in range(first, last + 1):
+        cell = grid.get(column)
+        if cell is not None:
+            indices, rects = cell
+            hits.update(indices[hit] for hit in rect.collidelistall(rects))
+            tests += len(rects)
+    return sorted(hits), tests
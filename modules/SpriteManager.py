@@ -1,293 +1,574 @@
-import pygame
-import os
-from typing import Dict, List, Optional, Any, Callable
-
-
-class SpriteManager:
-
-    def __init__(self):
-        self.sprites: Dict[str, pygame.Surface] = {}
-        self.animations: Dict[str, List[pygame.Surface]] = {}
-        self.loaded_sprites = 0
-        self.total_sprites = 0
-        self.base_path = "sprites"
-
-        # Словари для спрайтов по уровням
-        self.level_sprites: Dict[int, Dict[str, str]] = {
-            1: {},  # Спрайты для уровня 1
-            2: {},  # Спрайты для уровня 2  
-            3: {}  # Спрайты для уровня 3
-        }
-
-        # Текущий уровень для загрузки нужных спрайтов
-        self.current_level = 1
-
-        if not os.path.exists(self.base_path):
-            os.makedirs(self.base_path)
-            print(f"Создана папка {self.base_path}. Поместите туда спрайты.")
-
-    def load_all_sprites(self, callback: Callable) -> None:
-        """Загружаем все спрайты для всех уровней"""
-
-        # Определяем спрайты для каждого уровня
-        self.level_sprites[1] = {
-            # Player
-            'playerIdle': 'player.png',
-            'playerWalking1': 'PlayerWalking1.png',
-            'playerWalking2': 'PlayerWalking2.png',
-            'playerJumping1': 'PlayerJumping1.png',
-            'playerJumping2': 'PlayerJumping2.png',
-
-            # Enemies
-            'enemy1': 'enemy1_level1.png',
-            'enemy2': 'enemy2_level1.png',
-            'enemy3': 'enemy3_level1.png',
-            'enemy4': 'enemy4_level1.png',
-
-            # Platforms and objects
-            'platform': 'platform_level1.png',
-            'health': 'health.png',
-            'ammo': 'bullets.png',
-            'background': 'background_level1.jpg',
-
-        }
-
-        self.level_sprites[2] = {
-            # Player
-            'playerIdle': 'player.png',
-            'playerWalking1': 'PlayerWalking1.png',
-            'playerWalking2': 'PlayerWalking2.png',
-            'playerJumping1': 'PlayerJumping1.png',
-            'playerJumping2': 'PlayerJumping2.png',
-
-            # Enemies
-            'enemy1': 'enemy1_level2.png',
-            'enemy2': 'enemy2_level2.png',
-            'enemy3': 'enemy3_level2.png',
-            'enemy4': 'enemy4_level2.png',
-
-            # Platforms and objects
-            'platform': 'platform_level2.jpg',
-            'health': 'health.png',
-            'ammo': 'bullets.png',
-            'background': 'background_level2.jpg',
-
-        }
-
-        self.level_sprites[3] = {
-            # Player
-            'playerIdle': 'player.png',
-            'playerWalking1': 'PlayerWalking1.png',
-            'playerWalking2': 'PlayerWalking2.png',
-            'playerJumping1': 'PlayerJumping1.png',
-            'playerJumping2': 'PlayerJumping2.png',
-
-            # Enemies
-            'enemy1': 'enemy1_level3.png',
-            'enemy2': 'enemy2_level3.png',
-            'enemy3': 'enemy3_level3.png',
-            'enemy4': 'enemy4_level3.png',
-
-            # Platforms and objects
-            'platform': 'platform_level3.png',
-            'health': 'health.png',
-            'ammo': 'bullets.png',
-            'background': 'background_level3.png',
-
-        }
-
-
-        self.total_sprites = sum(len(sprites) for sprites in self.level_sprites.values())
-
-
-        self.load_sprites_for_level(1, callback)
-
-    def load_sprites_for_level(self, level: int, callback: Callable) -> None:
-
-        print(f"Загрузка спрайтов для уровня {level}...")
-
-
-        self.loaded_sprites = 0
-        self.current_level = level
-
-        sprite_list = self.level_sprites.get(level, {})
-
-        for sprite_name, sprite_file in sprite_list.items():
-            self.load_sprite(sprite_name, sprite_file, callback, level)
-
-    def load_sprite(self, name: str, filename: str, callback: Callable, level: int = 1) -> None:
-
-        try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            project_root = os.path.dirname(os.path.dirname(current_dir))
-            path = os.path.join(project_root, self.base_path, filename)
-
-            if not os.path.exists(path):
-                path = os.path.join(self.base_path, filename)
-
-            if os.path.exists(path):
-                img = pygame.image.load(path).convert_alpha()
-                img = self.scale_sprite(name, img)
-                self.sprites[name] = img
-                print(f"✓ Загружен спрайт уровня {level}: {name} из {path}")
-            else:
-                self.create_fallback_sprite(name, level)
-                print(f"⚠ Файл не найден: {filename}, создан фолбэк для: {name}")
-        except Exception as e:
-            print(f"✗ Ошибка загрузки спрайта {name}: {e}")
-            self.create_fallback_sprite(name, level)
-
-        self.loaded_sprites += 1
-
-
-        if self.loaded_sprites == len(self.level_sprites[self.current_level]):
-            self.init_animations()
-            print(f"✅ Все спрайты для уровня {self.current_level} загружены!")
-            callback()
-
-    def scale_sprite(self, name: str, img: pygame.Surface) -> pygame.Surface:
-
-        if 'player' in name:
-            return pygame.transform.scale(img, (40, 60))
-        elif 'enemy' in name:
-            return pygame.transform.scale(img, (40, 60))
-        elif name == 'platform':
-            return pygame.transform.scale(img, (100, 20))
-        elif name in ['health', 'ammo', 'bullet']:
-            return pygame.transform.scale(img, (20, 20))
-        elif name == 'background':
-            return pygame.transform.scale(img, (2400, 500))
-        return img
-
-    def create_fallback_sprite(self, name: str, level: int = 1) -> None:
-
-
-        colors_by_level = {
-            1: {
-                'player': (233, 69, 96, 255),  # #e94560
-                'enemy': (0, 170, 0, 255),  # #00aa00
-                'platform': (139, 69, 19, 255),  # #8b4513
-                'health': (255, 0, 0, 255),  # Красный
-                'ammo': (255, 255, 0, 255),  # Желтый
-                'bullet': (255, 255, 0, 255),  # Желтый
-                'background': (15, 52, 96, 255)  # #0f3460
-            },
-            2: {
-                'player': (65, 105, 225, 255),  # #4169e1
-                'enemy': (178, 34, 34, 255),  # #b22222
-                'platform': (107, 142, 35, 255),  # #6b8e23
-                'health': (255, 165, 0, 255),  # Оранжевый
-                'ammo': (0, 255, 255, 255),  # Голубой
-                'bullet': (0, 255, 255, 255),  # Голубой
-                'background': (25, 25, 112, 255)  # #191970
-            },
-            3: {
-                'player': (147, 112, 219, 255),  # #9370db
-                'enemy': (255, 140, 0, 255),  # #ff8c00
-                'platform': (188, 143, 143, 255),  # #bc8f8f
-                'health': (255, 20, 147, 255),  # Розовый
-                'ammo': (50, 205, 50, 255),  # #32cd32
-                'bullet': (50, 205, 50, 255),  # #32cd32
-                'background': (47, 79, 79, 255)  # #2f4f4f
-            }
-        }
-
-        colors = colors_by_level.get(level, colors_by_level[1])
-
-        if 'player' in name:
-            self.sprites[name] = self.create_text_sprite(40, 60, colors['player'], f"P{level}")
-        elif 'enemy' in name:
-            self.sprites[name] = self.create_text_sprite(40, 60, colors['enemy'], f"E{name[-1]}")
-        else:
-            if name == 'platform':
-                self.sprites[name] = pygame.Surface((100, 20))
-                self.sprites[name].fill(colors['platform'])
-            elif name == 'health':
-                self.sprites[name] = self.create_health_sprite(level)
-            elif name == 'ammo':
-                self.sprites[name] = self.create_ammo_sprite(level)
-            elif name == 'bullet':
-                self.sprites[name] = pygame.Surface((8, 4))
-                self.sprites[name].fill(colors['bullet'])
-            elif name == 'background':
-                self.sprites[name] = pygame.Surface((2400, 500))
-                self.sprites[name].fill(colors['background'])
-
-    def create_text_sprite(self, width: int, height: int, color: tuple, text: str) -> pygame.Surface:
-
-        img = pygame.Surface((width, height), pygame.SRCALPHA)
-        img.fill(color)
-
-        font = pygame.font.Font(None, 12)
-        text_surface = font.render(text, True, (255, 255, 255))
-        text_rect = text_surface.get_rect(center=(width // 2, height // 2))
-        img.blit(text_surface, text_rect)
-
-        return img
-
-    def create_health_sprite(self, level: int = 1) -> pygame.Surface:
-
-        img = pygame.Surface((20, 20), pygame.SRCALPHA)
-        if level == 1:
-            pygame.draw.polygon(img, (255, 0, 0), [(10, 2), (2, 10), (10, 18), (18, 10)])
-        elif level == 2:
-            pygame.draw.circle(img, (255, 165, 0), (10, 10), 9)
-        else:
-            pygame.draw.rect(img, (255, 20, 147), (5, 5, 10, 10))
-        return img
-
-    def create_ammo_sprite(self, level: int = 1) -> pygame.Surface:
-
-        img = pygame.Surface((20, 20), pygame.SRCALPHA)
-        if level == 1:
-            pygame.draw.circle(img, (255, 255, 0), (10, 10), 8)
-        elif level == 2:
-            pygame.draw.rect(img, (0, 255, 255), (6, 6, 8, 8))
-        else:
-            pygame.draw.circle(img, (50, 205, 50), (10, 10), 8)
-        return img
-
-    def init_animations(self) -> None:
-
-        self.animations['playerWalk'] = [
-            self.sprites.get('playerWalking1'),
-            self.sprites.get('playerWalking2')
-        ]
-
-        self.animations['playerJump'] = [
-            self.sprites.get('playerJumping1'),
-            self.sprites.get('playerJumping2')
-        ]
-
-        self.animations['enemyWalk'] = [
-            self.sprites.get('enemy1'),
-            self.sprites.get('enemy2'),
-            self.sprites.get('enemy3'),
-            self.sprites.get('enemy4')
-        ]
-
-    def get_sprite(self, name: str) -> Optional[pygame.Surface]:
-
-        return self.sprites.get(name)
-
-    def get_animation(self, name: str) -> List[pygame.Surface]:
-
-        return self.animations.get(name, [])
-
-    def get_animation_frame(self, name: str, frame: int) -> Optional[pygame.Surface]:
-
-        animation = self.animations.get(name, [])
-        if animation and 0 <= frame < len(animation):
-            return animation[frame]
-        return None
-
-    def is_loading_complete(self) -> bool:
-
-        return self.loaded_sprites >= len(self.level_sprites.get(self.current_level, {}))
-
-    def reload_for_level(self, level: int, callback: Callable) -> None:
-
-        if level in self.level_sprites:
-            self.sprites.clear()  # Очищаем старые спрайты
-            self.animations.clear()  # Очищаем анимации
+import pygame
+import os
+import random
+import time
+from typing import Dict, List, Optional, Any, Callable, Tuple
+
+from .Metrics import MetricsRegistry
+from .TextRenderer import TextRenderer
+
+# Кадры анимаций: имя анимации -> имена спрайтов
+ANIMATION_FRAMES: Dict[str, List[str]] = {
+    'playerWalk': ['playerWalking1', 'playerWalking2'],
+    'playerJump': ['playerJumping1', 'playerJumping2'],
+    'enemyWalk': ['enemy1', 'enemy2', 'enemy3', 'enemy4'],
+}
+
+# Спрайты, для которых при загрузке строятся маски столкновений
+MASKED_SPRITE_PREFIXES = ('player', 'enemy')
+
+# Классы поверхностей по способу вывода
+OPAQUE = 'opaque'
+COLORKEY = 'colorkey'
+ALPHA = 'alpha'
+# Цвет прозрачности для спрайтов, у которых альфа только 0 или 255
+TRANSPARENT_KEY = (255, 0, 255)
+# Доля полностью прозрачных пикселей, начиная с которой полупрозрачному спрайту включается RLE
+ALPHA_RLE_MIN_TRANSPARENT = 0.25
+BLIT_COST_REPEATS = 5
+
+
+def classify_surface(surface: pygame.Surface) -> str:
+    """opaque - без прозрачности, colorkey - альфа только 0 или 255, alpha - есть полупрозрачные пиксели"""
+    if surface.get_colorkey() is not None:
+        return COLORKEY
+    if not surface.get_flags() & pygame.SRCALPHA:
+        return OPAQUE
+
+    # from_surface отмечает пиксели с альфой больше порога
+    solid = pygame.mask.from_surface(surface, 254).count()
+    if solid == surface.get_width() * surface.get_height():
+        return OPAQUE
+    if solid == pygame.mask.from_surface(surface, 0).count():
+        return COLORKEY
+    return ALPHA
+
+
+def transparent_share(surface: pygame.Surface) -> float:
+    """Доля пикселей с нулевой альфой"""
+    pixels = surface.get_width() * surface.get_height()
+    return 1 - pygame.mask.from_surface(surface, 0).count() / max(1, pixels)
+
+
+def measure_blit(surface: pygame.Surface, target: pygame.Surface) -> float:
+    """Лучшее из BLIT_COST_REPEATS время одного blit в угол target, микросекунды"""
+    pixels = surface.get_width() * surface.get_height()
+    count = max(1, min(100, 200000 // max(1, pixels)))
+    best = float('inf')
+    for _ in range(BLIT_COST_REPEATS):
+        started = time.perf_counter()
+        for _ in range(count):
+            target.blit(surface, (0, 0))
+        best = min(best, (time.perf_counter() - started) / count)
+    return best * 1e6
+
+
+class SpriteManager:
+
+    def __init__(self, render_scale: float = 1.0, metrics: Optional[MetricsRegistry] = None,
+                 text: Optional[TextRenderer] = None, report_formats: bool = False):
+        self.render_scale = render_scale
+        self.report_formats = report_formats
+        self.text = text or TextRenderer(metrics=metrics)
+        self.sprites: Dict[str, pygame.Surface] = {}
+        self.animations: Dict[str, List[pygame.Surface]] = {}
+        # Маски (обычная, зеркальная) в логическом разрешении мира
+        self.masks: Dict[str, Tuple[pygame.mask.Mask, pygame.mask.Mask]] = {}
+        self.animation_masks: Dict[str, List[Optional[Tuple[pygame.mask.Mask, pygame.mask.Mask]]]] = {}
+        self.solid_masks: Dict[Tuple[int, int], pygame.mask.Mask] = {}
+        self.circle_sprites: Dict[Tuple[Tuple[int, int, int], int], pygame.Surface] = {}
+        # Отраженные по горизонтали спрайты в том же формате, что и исходные
+        self.mirrored: Dict[pygame.Surface, pygame.Surface] = {}
+        # Имя спрайта -> источник (файл или фолбэк уровня)
+        self.sprite_sources: Dict[str, str] = {}
+        # (источник, размер) -> (класс поверхности, RLE); переживает перезагрузку уровней
+        self.format_cache: Dict[Tuple[str, Tuple[int, int]], Tuple[str, bool]] = {}
+        # Имя спрайта -> (класс поверхности, RLE, оценка времени blit в микросекундах); только с report_formats
+        self.blit_costs: Dict[str, Tuple[str, bool, float]] = {}
+        self.loaded_sprites = 0
+        self.total_sprites = 0
+        self.base_path = "sprites"
+
+        metrics = metrics or MetricsRegistry()
+        self.metric_load_seconds = metrics.counter('sprite_load_seconds_total', "Время загрузки и подготовки спрайтов")
+        self.metric_loaded = metrics.counter('sprites_loaded_total', "Загруженные спрайты (включая фолбэки)")
+        self.metric_cache_entries = metrics.gauge('sprite_cache_entries', "Спрайты и кадры анимаций в кэше")
+        self.metric_cache_bytes = metrics.gauge('sprite_cache_bytes', "Память пикселей спрайтов в кэше")
+
+        # Словари для спрайтов по уровням
+        self.level_sprites: Dict[int, Dict[str, str]] = {
+            1: {},  # Спрайты для уровня 1
+            2: {},  # Спрайты для уровня 2  
+            3: {}  # Спрайты для уровня 3
+        }
+
+        # Текущий уровень для загрузки нужных спрайтов
+        self.current_level = 1
+
+        if not os.path.exists(self.base_path):
+            os.makedirs(self.base_path)
+            print(f"Создана папка {self.base_path}. Поместите туда спрайты.")
+
+    def load_all_sprites(self, callback: Callable) -> None:
+        """Загружаем все спрайты для всех уровней"""
+
+        # Определяем спрайты для каждого уровня
+        self.level_sprites[1] = {
+            # Player
+            'playerIdle': 'player.png',
+            'playerWalking1': 'PlayerWalking1.png',
+            'playerWalking2': 'PlayerWalking2.png',
+            'playerJumping1': 'PlayerJumping1.png',
+            'playerJumping2': 'PlayerJumping2.png',
+
+            # Enemies
+            'enemy1': 'enemy1_level1.png',
+            'enemy2': 'enemy2_level1.png',
+            'enemy3': 'enemy3_level1.png',
+            'enemy4': 'enemy4_level1.png',
+
+            # Platforms and objects
+            'platform': 'platform_level1.png',
+            'health': 'health.png',
+            'ammo': 'bullets.png',
+            'background': 'background_level1.jpg',
+            'backgroundMid': 'background_mid_level1.png',
+            'backgroundNear': 'background_near_level1.png',
+
+        }
+
+        self.level_sprites[2] = {
+            # Player
+            'playerIdle': 'player.png',
+            'playerWalking1': 'PlayerWalking1.png',
+            'playerWalking2': 'PlayerWalking2.png',
+            'playerJumping1': 'PlayerJumping1.png',
+            'playerJumping2': 'PlayerJumping2.png',
+
+            # Enemies
+            'enemy1': 'enemy1_level2.png',
+            'enemy2': 'enemy2_level2.png',
+            'enemy3': 'enemy3_level2.png',
+            'enemy4': 'enemy4_level2.png',
+
+            # Platforms and objects
+            'platform': 'platform_level2.jpg',
+            'health': 'health.png',
+            'ammo': 'bullets.png',
+            'background': 'background_level2.jpg',
+            'backgroundMid': 'background_mid_level2.png',
+            'backgroundNear': 'background_near_level2.png',
+
+        }
+
+        self.level_sprites[3] = {
+            # Player
+            'playerIdle': 'player.png',
+            'playerWalking1': 'PlayerWalking1.png',
+            'playerWalking2': 'PlayerWalking2.png',
+            'playerJumping1': 'PlayerJumping1.png',
+            'playerJumping2': 'PlayerJumping2.png',
+
+            # Enemies
+            'enemy1': 'enemy1_level3.png',
+            'enemy2': 'enemy2_level3.png',
+            'enemy3': 'enemy3_level3.png',
+            'enemy4': 'enemy4_level3.png',
+
+            # Platforms and objects
+            'platform': 'platform_level3.png',
+            'health': 'health.png',
+            'ammo': 'bullets.png',
+            'background': 'background_level3.png',
+            'backgroundMid': 'background_mid_level3.png',
+            'backgroundNear': 'background_near_level3.png',
+
+        }
+
+
+        self.total_sprites = sum(len(sprites) for sprites in self.level_sprites.values())
+
+
+        self.load_sprites_for_level(1, callback)
+
+    def load_sprites_for_level(self, level: int, callback: Callable) -> None:
+
+        print(f"Загрузка спрайтов для уровня {level}...")
+
+
+        self.loaded_sprites = 0
+        self.current_level = level
+
+        sprite_list = self.level_sprites.get(level, {})
+
+        for sprite_name, sprite_file in sprite_list.items():
+            self.load_sprite(sprite_name, sprite_file, callback, level)
+
+    def load_sprite(self, name: str, filename: str, callback: Callable, level: int = 1) -> None:
+
+        started = time.perf_counter()
+        try:
+            current_dir = os.path.dirname(os.path.abspath(__file__))
+            project_root = os.path.dirname(os.path.dirname(current_dir))
+            path = os.path.join(project_root, self.base_path, filename)
+
+            if not os.path.exists(path):
+                path = os.path.join(self.base_path, filename)
+
+            if os.path.exists(path):
+                img = pygame.image.load(path)
+                # JPG не содержит прозрачности - храним в формате экрана без альфы
+                if filename.lower().endswith(('.jpg', '.jpeg')):
+                    img = img.convert()
+                else:
+                    img = img.convert_alpha()
+                img = self.scale_sprite(name, img)
+                self.sprites[name] = img
+                self.sprite_sources[name] = filename
+                print(f"✓ Загружен спрайт уровня {level}: {name} из {path}")
+            else:
+                self.create_fallback_sprite(name, level)
+                print(f"⚠ Файл не найден: {filename}, создан фолбэк для: {name}")
+        except Exception as e:
+            print(f"✗ Ошибка загрузки спрайта {name}: {e}")
+            self.create_fallback_sprite(name, level)
+
+        self.loaded_sprites += 1
+        self.metric_loaded.inc()
+
+        complete = self.loaded_sprites == len(self.level_sprites[self.current_level])
+        if complete:
+            self.build_masks()
+            self.apply_render_scale()
+            self.optimize_formats()
+            self.init_animations()
+            self.update_cache_metrics()
+        # Время колбэка (генерация уровня) в загрузку спрайтов не входит
+        self.metric_load_seconds.inc(time.perf_counter() - started)
+
+        if complete:
+            print(f"✅ Все спрайты для уровня {self.current_level} загружены!")
+            callback()
+
+    def update_cache_metrics(self) -> None:
+
+        surfaces = {id(sprite): sprite for sprite in self.sprites.values()}
+        for frames in self.animations.values():
+            surfaces.update((id(frame), frame) for frame in frames if frame)
+        surfaces.update((id(sprite), sprite) for sprite in self.mirrored.values())
+
+        self.metric_cache_entries.set(len(surfaces))
+        self.metric_cache_bytes.set(sum(surface.get_bytesize() * surface.get_width() * surface.get_height()
+                                        for surface in surfaces.values()))
+
+    def scale_sprite(self, name: str, img: pygame.Surface) -> pygame.Surface:
+
+        if 'player' in name:
+            return pygame.transform.scale(img, (40, 60))
+        elif 'enemy' in name:
+            return pygame.transform.scale(img, (40, 60))
+        elif name == 'platform':
+            return pygame.transform.scale(img, (100, 20))
+        elif name in ['health', 'ammo', 'bullet']:
+            return pygame.transform.scale(img, (20, 20))
+        elif name == 'background':
+            return pygame.transform.scale(img, (2400, 500))
+        elif name == 'backgroundMid':
+            return pygame.transform.scale(img, (1600, 220))
+        elif name == 'backgroundNear':
+            return pygame.transform.scale(img, (1800, 140))
+        return img
+
+    def create_fallback_sprite(self, name: str, level: int = 1) -> None:
+
+
+        colors_by_level = {
+            1: {
+                'player': (233, 69, 96, 255),  # #e94560
+                'enemy': (0, 170, 0, 255),  # #00aa00
+                'platform': (139, 69, 19, 255),  # #8b4513
+                'health': (255, 0, 0, 255),  # Красный
+                'ammo': (255, 255, 0, 255),  # Желтый
+                'bullet': (255, 255, 0, 255),  # Желтый
+                'background': (15, 52, 96, 255)  # #0f3460
+            },
+            2: {
+                'player': (65, 105, 225, 255),  # #4169e1
+                'enemy': (178, 34, 34, 255),  # #b22222
+                'platform': (107, 142, 35, 255),  # #6b8e23
+                'health': (255, 165, 0, 255),  # Оранжевый
+                'ammo': (0, 255, 255, 255),  # Голубой
+                'bullet': (0, 255, 255, 255),  # Голубой
+                'background': (25, 25, 112, 255)  # #191970
+            },
+            3: {
+                'player': (147, 112, 219, 255),  # #9370db
+                'enemy': (255, 140, 0, 255),  # #ff8c00
+                'platform': (188, 143, 143, 255),  # #bc8f8f
+                'health': (255, 20, 147, 255),  # Розовый
+                'ammo': (50, 205, 50, 255),  # #32cd32
+                'bullet': (50, 205, 50, 255),  # #32cd32
+                'background': (47, 79, 79, 255)  # #2f4f4f
+            }
+        }
+
+        colors = colors_by_level.get(level, colors_by_level[1])
+        self.sprite_sources[name] = f"{name}@{level}"
+
+        if 'player' in name:
+            self.sprites[name] = self.create_text_sprite(40, 60, colors['player'], f"P{level}")
+        elif 'enemy' in name:
+            self.sprites[name] = self.create_text_sprite(40, 60, colors['enemy'], f"E{name[-1]}")
+        else:
+            if name == 'platform':
+                self.sprites[name] = pygame.Surface((100, 20))
+                self.sprites[name].fill(colors['platform'])
+            elif name == 'health':
+                self.sprites[name] = self.create_health_sprite(level)
+            elif name == 'ammo':
+                self.sprites[name] = self.create_ammo_sprite(level)
+            elif name == 'bullet':
+                self.sprites[name] = pygame.Surface((8, 4))
+                self.sprites[name].fill(colors['bullet'])
+            elif name == 'background':
+                self.sprites[name] = pygame.Surface((2400, 500)).convert()
+                self.sprites[name].fill(colors['background'])
+            elif name in ('backgroundMid', 'backgroundNear'):
+                # Силуэты подкрашиваем под средний цвет дальнего фона
+                background = self.sprites.get('background')
+                base_color = pygame.transform.average_color(background) if background else colors['background']
+                if name == 'backgroundMid':
+                    self.sprites[name] = self.create_skyline_sprite(1600, 220, base_color, 0.6, level)
+                else:
+                    self.sprites[name] = self.create_skyline_sprite(1800, 140, base_color, 0.35, level + 10)
+
+    def create_text_sprite(self, width: int, height: int, color: tuple, text: str) -> pygame.Surface:
+
+        img = pygame.Surface((width, height), pygame.SRCALPHA)
+        img.fill(color)
+
+        text_surface = self.text.render('label', text, (255, 255, 255))
+        text_rect = text_surface.get_rect(center=(width // 2, height // 2))
+        img.blit(text_surface, text_rect)
+
+        return img
+
+    def create_skyline_sprite(self, width: int, height: int, color: tuple, shade: float,
+                              seed: int) -> pygame.Surface:
+        """Силуэт зданий для слоя параллакса; прозрачность через colorkey"""
+        colorkey = (255, 0, 255)
+        img = pygame.Surface((width, height)).convert()
+        img.fill(colorkey)
+
+        rng = random.Random(seed)
+        silhouette = (int(color[0] * shade), int(color[1] * shade), int(color[2] * shade))
+        x = 0
+        while x < width:
+            building_width = rng.randint(40, 120)
+            building_height = rng.randint(height // 3, height)
+            pygame.draw.rect(img, silhouette, (x, height - building_height, building_width, building_height))
+            x += building_width + rng.randint(0, 20)
+
+        img.set_colorkey(colorkey, pygame.RLEACCEL)
+        return img
+
+    def create_health_sprite(self, level: int = 1) -> pygame.Surface:
+
+        img = pygame.Surface((20, 20), pygame.SRCALPHA)
+        if level == 1:
+            pygame.draw.polygon(img, (255, 0, 0), [(10, 2), (2, 10), (10, 18), (18, 10)])
+        elif level == 2:
+            pygame.draw.circle(img, (255, 165, 0), (10, 10), 9)
+        else:
+            pygame.draw.rect(img, (255, 20, 147), (5, 5, 10, 10))
+        return img
+
+    def create_ammo_sprite(self, level: int = 1) -> pygame.Surface:
+
+        img = pygame.Surface((20, 20), pygame.SRCALPHA)
+        if level == 1:
+            pygame.draw.circle(img, (255, 255, 0), (10, 10), 8)
+        elif level == 2:
+            pygame.draw.rect(img, (0, 255, 255), (6, 6, 8, 8))
+        else:
+            pygame.draw.circle(img, (50, 205, 50), (10, 10), 8)
+        return img
+
+    def build_masks(self) -> None:
+        """Маски строятся до масштабирования под буфер рендера - столкновения считаются в мировых координатах"""
+        self.masks.clear()
+        for name, img in self.sprites.items():
+            if name.startswith(MASKED_SPRITE_PREFIXES):
+                mirrored = pygame.transform.flip(img, True, False)
+                self.masks[name] = (pygame.mask.from_surface(img), pygame.mask.from_surface(mirrored))
+
+    def apply_render_scale(self) -> None:
+        """Приводим спрайты к разрешению внутреннего буфера мира"""
+        if self.render_scale == 1:
+            return
+
+        for name, img in self.sprites.items():
+            width = max(1, round(img.get_width() * self.render_scale))
+            height = max(1, round(img.get_height() * self.render_scale))
+            scaled = pygame.transform.scale(img, (width, height))
+            colorkey = img.get_colorkey()
+            if colorkey:
+                scaled.set_colorkey(colorkey, pygame.RLEACCEL)
+            self.sprites[name] = scaled
+
+    def convert_for_blit(self, img: pygame.Surface, kind: str) -> Tuple[pygame.Surface, str]:
+
+        if kind == OPAQUE:
+            return img.convert(), kind
+        if kind == ALPHA:
+            return img.convert_alpha(), kind
+
+        colorkey = img.get_colorkey()
+        if colorkey is not None:
+            converted = img.convert()
+            converted.set_colorkey(colorkey, pygame.RLEACCEL)
+            return converted, kind
+
+        converted = pygame.Surface(img.get_size()).convert()
+        converted.fill(TRANSPARENT_KEY)
+        converted.blit(img, (0, 0))
+        # Если цвет прозрачности встречается среди видимых пикселей - оставляем альфу
+        keyed = pygame.mask.from_threshold(converted, TRANSPARENT_KEY, (1, 1, 1, 255)).count()
+        if keyed != img.get_width() * img.get_height() - pygame.mask.from_surface(img, 0).count():
+            return img.convert_alpha(), ALPHA
+        converted.set_colorkey(TRANSPARENT_KEY, pygame.RLEACCEL)
+        return converted, kind
+
+    def optimize_formats(self) -> None:
+        """Приводим каждый спрайт к формату экрана по классу поверхности.
+
+        Непрозрачные - convert() без альфы, с альфой только 0/255 - colorkey с
+        RLEACCEL, с полупрозрачными пикселями - convert_alpha(); RLE для них
+        включается, если прозрачна хотя бы ALPHA_RLE_MIN_TRANSPARENT пикселей.
+        Решение запоминается по источнику и размеру спрайта и при повторной
+        загрузке того же файла не пересчитывается. Замеры blit и таблица
+        форматов - только с report_formats. Отраженные варианты строятся здесь же
+        один раз - отражение RLE-поверхности каждый кадр стоит дороже самого blit.
+        """
+        self.mirrored.clear()
+        self.blit_costs.clear()
+        converted: Dict[int, pygame.Surface] = {}
+
+        for name, img in self.sprites.items():
+            if id(img) in converted:
+                self.sprites[name] = converted[id(img)]
+                continue
+
+            key = (self.sprite_sources.get(name, name), img.get_size())
+            cached = self.format_cache.get(key)
+            if cached is None:
+                surface, kind = self.convert_for_blit(img, classify_surface(img))
+                rle = kind == COLORKEY or (kind == ALPHA and transparent_share(img) >= ALPHA_RLE_MIN_TRANSPARENT)
+                self.format_cache[key] = (kind, rle)
+            else:
+                kind, rle = cached
+                surface, kind = self.convert_for_blit(img, kind)
+            if kind == ALPHA and rle:
+                surface.set_alpha(255, pygame.RLEACCEL)
+
+            converted[id(img)] = surface
+            self.sprites[name] = surface
+            self.mirror(surface)
+
+        if self.report_formats:
+            self.report_blit_costs()
+
+    def report_blit_costs(self) -> None:
+        """Замер blit каждого спрайта и таблица форматов, от самых дорогих"""
+        # Замер на поверхности размером с экран: большие слои обрезаются так же, как в игре
+        target = pygame.Surface(pygame.display.get_surface().get_size()).convert()
+        for name, sprite in self.sprites.items():
+            rle = bool(sprite.get_flags() & (pygame.RLEACCEL | pygame.RLEACCELOK))
+            self.blit_costs[name] = (classify_surface(sprite), rle, measure_blit(sprite, target))
+
+        print("Формат спрайтов (оценка blit, мкс):")
+        for name, (kind, rle, cost) in sorted(self.blit_costs.items(), key=lambda item: -item[1][2]):
+            sprite = self.sprites[name]
+            print(f"  {name}: {sprite.get_width()}x{sprite.get_height()} {kind}{' RLE' if rle else ''} {cost:.1f}")
+
+    def mirror(self, sprite: pygame.Surface) -> pygame.Surface:
+        """Отраженный по горизонтали спрайт; строится один раз на поверхность"""
+        flipped = self.mirrored.get(sprite)
+        if flipped is None:
+            flipped = pygame.transform.flip(sprite, True, False)
+            # flip сохраняет colorkey, но не RLE
+            if sprite.get_flags() & (pygame.RLEACCEL | pygame.RLEACCELOK):
+                colorkey = sprite.get_colorkey()
+                if colorkey is not None:
+                    flipped.set_colorkey(colorkey, pygame.RLEACCEL)
+                else:
+                    flipped.set_alpha(255, pygame.RLEACCEL)
+            self.mirrored[sprite] = flipped
+        return flipped
+
+    def init_animations(self) -> None:
+
+        for name, frames in ANIMATION_FRAMES.items():
+            self.animations[name] = [self.sprites.get(frame) for frame in frames]
+            self.animation_masks[name] = [self.masks.get(frame) for frame in frames]
+
+    def get_sprite(self, name: str) -> Optional[pygame.Surface]:
+
+        return self.sprites.get(name)
+
+    def get_animation(self, name: str) -> List[pygame.Surface]:
+
+        return self.animations.get(name, [])
+
+    def get_animation_frame(self, name: str, frame: int) -> Optional[pygame.Surface]:
+
+        animation = self.animations.get(name, [])
+        if animation and 0 <= frame < len(animation):
+            return animation[frame]
+        return None
+
+    def get_mask(self, name: str, mirrored: bool = False) -> Optional[pygame.mask.Mask]:
+
+        masks = self.masks.get(name)
+        return masks[mirrored] if masks else None
+
+    def get_animation_mask(self, name: str, frame: int, mirrored: bool = False) -> Optional[pygame.mask.Mask]:
+
+        animation = self.animation_masks.get(name, [])
+        if 0 <= frame < len(animation) and animation[frame]:
+            return animation[frame][mirrored]
+        return None
+
+    def get_solid_mask(self, width: int, height: int) -> pygame.mask.Mask:
+        """Сплошная маска для объектов без спрайта (пули)"""
+        mask = self.solid_masks.get((width, height))
+        if mask is None:
+            mask = pygame.mask.Mask((width, height), fill=True)
+            self.solid_masks[(width, height)] = mask
+        return mask
+
+    def get_circle_sprite(self, color: Tuple[int, int, int], radius: int) -> pygame.Surface:
+        """Круг, нарисованный один раз, для пакетного вывода через blits (пули врагов)"""
+        key = (color, radius)
+        sprite = self.circle_sprites.get(key)
+        if sprite is None:
+            size = radius * 2 + 1
+            sprite = pygame.Surface((size, size)).convert()
+            background = (0, 0, 0) if color != (0, 0, 0) else (255, 0, 255)
+            sprite.fill(background)
+            sprite.set_colorkey(background, pygame.RLEACCEL)
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+            self.circle_sprites[key] = sprite
+        return sprite
+
+    def is_loading_complete(self) -> bool:
+
+        return self.loaded_sprites >= len(self.level_sprites.get(self.current_level, {}))
+
+    def reload_for_level(self, level: int, callback: Callable) -> None:
+
+        if level in self.level_sprites:
+            self.sprites.clear()  # Очищаем старые спрайты
+            self.animations.clear()  # Очищаем анимации
+            self.animation_masks.clear()
             self.load_sprites_for_level(level, callback)
\ No newline at end of file
@@ -0,0 +1,40 @@
+from typing import Optional, Tuple
+
+import pygame
+
+
+def sweep_rect(x: float, y: float, dx: float, dy: float, width: float, height: float,
+               target: pygame.Rect) -> Optional[Tuple[float, float]]:
+    """Swept AABB: прямоугольник width x height смещается из (x, y) на (dx, dy) за шаг.
+
+    Возвращает интервал (t_enter, t_exit) в долях шага, пока он пересекается с target,
+    или None. Это отрезок против target, расширенного на размер движущегося
+    прямоугольника, поэтому результат не зависит от скорости.
+    """
+    t_enter = 0.0
+    t_exit = 1.0
+
+    for start, delta, size, low, high in ((x, dx, width, target.left, target.right),
+                                          (y, dy, height, target.top, target.bottom)):
+        low -= size
+        if delta == 0:
+            if start <= low or start >= high:
+                return None
+            continue
+
+        t0 = (low - start) / delta
+        t1 = (high - start) / delta
+        if t0 > t1:
+            t0, t1 = t1, t0
+
+        t_enter = max(t_enter, t0)
+        t_exit = min(t_exit, t1)
+        if t_enter >= t_exit:
+            return None
+
+    return t_enter, t_exit
+
+
+def crossed_top(previous_bottom: float, bottom: float, top: float) -> bool:
+    """Нижний край пересек верх платформы за шаг (движение вниз)"""
+    return previous_bottom <= top < bottom
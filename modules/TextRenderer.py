@@ -0,0 +1,116 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+from .Metrics import MetricsRegistry
+
+FONT_PATH = "fonts/PressStart2P.ttf"
+
+# Имя шрифта -> (размер PressStart2P, размер запасного шрифта); None - всегда запасной шрифт
+FONT_SIZES: Dict[str, Tuple[Optional[int], int]] = {
+    'small': (10, 20),
+    'medium': (16, 30),
+    'large': (24, 48),
+    # Подписи прямоугольников-заглушек вместо спрайтов
+    'tiny': (None, 8),
+    'label': (None, 12),
+}
+
+# Глифы, из которых draw_number собирает числа
+DIGITS = '0123456789-'
+
+
+class TextRenderer:
+    """Шрифты игры и LRU-кэш отрисованных строк.
+
+    Шрифты загружаются один раз при создании - в цикле кадра шрифты не
+    создаются. render() отдает поверхность из кэша по ключу (шрифт, текст,
+    цвет, сглаживание); при переполнении capacity вытесняется строка, которая
+    дольше всех не использовалась. Быстро меняющиеся числа (счет, здоровье,
+    патроны) draw_number собирает из глифов цифр, которые рендерятся один раз на
+    пару (шрифт, цвет) и хранятся вне LRU, - каждое новое значение не
+    рендерится и не вытесняет из кэша постоянные надписи.
+    """
+
+    def __init__(self, capacity: int = 256, metrics: Optional[MetricsRegistry] = None):
+        self.capacity = capacity
+        self.fonts: Dict[str, pygame.font.Font] = {}
+        self.cache: 'OrderedDict[Tuple, pygame.Surface]' = OrderedDict()
+        self.glyphs: Dict[Tuple[str, Tuple[int, ...]], Dict[str, pygame.Surface]] = {}
+        self.load_fonts()
+
+        metrics = metrics or MetricsRegistry()
+        self.metric_hits = metrics.counter('text_cache_hits_total', "Строки, взятые из кэша текста")
+        self.metric_misses = metrics.counter('text_cache_misses_total', "Строки, отрисованные Font.render")
+        self.metric_entries = metrics.gauge('text_cache_entries', "Поверхности в кэше текста")
+
+    def load_fonts(self) -> None:
+
+        try:
+            for name, (size, _) in FONT_SIZES.items():
+                if size is not None:
+                    self.fonts[name] = pygame.font.Font(FONT_PATH, size)
+        except (OSError, pygame.error):
+            self.fonts.clear()
+
+        for name, (_, fallback_size) in FONT_SIZES.items():
+            if name not in self.fonts:
+                self.fonts[name] = pygame.font.Font(None, fallback_size)
+
+    def render(self, font: str, text: str, color: Tuple[int, ...], antialias: bool = True) -> pygame.Surface:
+        """Поверхность строки; не изменять - она общая для всех вызовов с тем же ключом"""
+        key = (font, text, color, antialias)
+        surface = self.cache.get(key)
+        if surface is not None:
+            self.cache.move_to_end(key)
+            self.metric_hits.inc()
+            return surface
+
+        surface = self.fonts[font].render(text, antialias, color)
+        self.cache[key] = surface
+        if len(self.cache) > self.capacity:
+            self.cache.popitem(last=False)
+        self.metric_misses.inc()
+        self.metric_entries.set(len(self.cache))
+        return surface
+
+    def digit_glyphs(self, font: str, color: Tuple[int, ...]) -> Dict[str, pygame.Surface]:
+
+        key = (font, color)
+        glyphs = self.glyphs.get(key)
+        if glyphs is None:
+            glyphs = {char: self.fonts[font].render(char, True, color) for char in DIGITS}
+            self.glyphs[key] = glyphs
+        return glyphs
+
+    def draw(self, screen: pygame.Surface, font: str, text: str, color: Tuple[int, ...],
+             center: Tuple[int, int]) -> None:
+        """Строка с центром в center"""
+        surface = self.render(font, text, color)
+        screen.blit(surface, surface.get_rect(center=center))
+
+    def draw_number(self, screen: pygame.Surface, font: str, value: int, color: Tuple[int, ...],
+                    position: Tuple[int, int], digits: int = 0) -> int:
+        """Число из глифов цифр, дополненное нулями до digits знаков; возвращает x правого края"""
+        x, y = position
+        text = str(value)
+        if digits:
+            text = text.zfill(digits)
+
+        glyphs = self.digit_glyphs(font, color)
+        blit_sequence = []
+        for char in text:
+            glyph = glyphs[char]
+            blit_sequence.append((glyph, (x, y)))
+            x += glyph.get_width()
+        screen.blits(blit_sequence, False)
+        return x
+
+    def draw_field(self, screen: pygame.Surface, font: str, label: str, value: int, color: Tuple[int, ...],
+                   position: Tuple[int, int], digits: int = 0) -> int:
+        """Поле интерфейса вида "SCORE: 000120": подпись целиком из кэша, значение - из глифов"""
+        surface = self.render(font, label, color)
+        screen.blit(surface, position)
+        return self.draw_number(screen, font, value, color, (position[0] + surface.get_width(), position[1]),
+                                digits)
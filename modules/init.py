@@ -1,19 +1,85 @@
-
-from .Game import Game, GameState
-from .Player import Player
-from .Enemy import Enemy
-from .Bullet import Bullet
-from .Pickup import Pickup
-from .Particle import Particle
-from .SpriteManager import SpriteManager
-
-__all__ = [
-    'Game',
-    'GameState',
-    'Player',
-    'Enemy',
-    'Bullet',
-    'Pickup',
-    'Particle',
-    'SpriteManager'
+
+from .Game import Game, GameState
+from .Player import Player
+from .Enemy import Enemy
+from .Bullet import Bullet
+from .Pickup import Pickup
+from .Particle import Particle
+from .SpriteManager import SpriteManager
+from .SoundManager import SoundManager
+from .ObjectPool import ObjectPool
+from .GcPolicy import GcPolicy
+from .SlotMap import SlotMap
+from .InputState import KeyState, FrameInput
+from .InputRecorder import InputRecorder, InputReplay
+from .FrameTimeHarness import FrameTimeHarness, FrameStats
+from .LevelGenerator import LevelGenerator, LevelLayout
+from .ParallaxBackground import ParallaxBackground, ParallaxLayer
+from .RenderTarget import RenderTarget
+from .AnimationClock import AnimationClock
+from .SweptCollision import sweep_rect, crossed_top
+from .SpatialGrid import build_column_grid, grid_collide_all
+from .FrameCapture import FrameCapture
+from .RenderSnapshot import RenderSnapshot, SnapshotBuffer
+from .SimulationThread import SimulationThread
+from .SaveState import SaveState
+from .RewindBuffer import RewindBuffer
+from .Netplay import RollbackSession, LinkSimulator
+from .QualityGovernor import QualityGovernor
+from .Metrics import MetricsRegistry, MetricsExporter, Counter, Gauge, Histogram
+from .MemoryAccounting import MemoryAccountant
+from .SoakHarness import SoakHarness, SoakBot
+from .HordeMode import HordeDirector
+from .HordeBenchmark import HordeBenchmark
+from .TextRenderer import TextRenderer
+
+__all__ = [
+    'Game',
+    'GameState',
+    'Player',
+    'Enemy',
+    'Bullet',
+    'Pickup',
+    'Particle',
+    'SpriteManager',
+    'SoundManager',
+    'ObjectPool',
+    'GcPolicy',
+    'SlotMap',
+    'KeyState',
+    'FrameInput',
+    'InputRecorder',
+    'InputReplay',
+    'FrameTimeHarness',
+    'FrameStats',
+    'LevelGenerator',
+    'LevelLayout',
+    'ParallaxBackground',
+    'ParallaxLayer',
+    'RenderTarget',
+    'AnimationClock',
+    'sweep_rect',
+    'crossed_top',
+    'build_column_grid',
+    'grid_collide_all',
+    'FrameCapture',
+    'RenderSnapshot',
+    'SnapshotBuffer',
+    'SimulationThread',
+    'SaveState',
+    'RewindBuffer',
+    'RollbackSession',
+    'LinkSimulator',
+    'QualityGovernor',
+    'MetricsRegistry',
+    'MetricsExporter',
+    'Counter',
+    'Gauge',
+    'Histogram',
+    'MemoryAccountant',
+    'SoakHarness',
+    'SoakBot',
+    'HordeDirector',
+    'HordeBenchmark',
+    'TextRenderer'
 ]
\ No newline at end of file
@@ -0,0 +1,84 @@
+import argparse
+import glob
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'modules'))
+
+from modules.FrameTimeHarness import FrameTimeHarness
+from modules.HordeBenchmark import HordeBenchmark
+
+
+PERF_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'perf')
+
+
+def parse_args() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(description="Проверка регрессий времени кадра по записанным сессиям")
+    parser.add_argument('sessions', nargs='*',
+                        help="файлы записей (по умолчанию perf/sessions/*.bin)")
+    parser.add_argument('--baseline', default=os.path.join(PERF_DIR, 'baselines.json'),
+                        help="файл базовых значений")
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help="допустимый рост p50/p95/p99 (доля)")
+    parser.add_argument('--worst-tolerance', type=float, default=0.5,
+                        help="допустимый рост худшего кадра (доля)")
+    parser.add_argument('--slack-ms', type=float, default=0.25,
+                        help="абсолютный запас в миллисекундах")
+    parser.add_argument('--repeats', type=int, default=5,
+                        help="число прогонов каждой сессии")
+    parser.add_argument('--render-scale', type=float, default=1.0,
+                        help="масштаб внутреннего буфера мира")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="перезаписать базовые значения текущими")
+    parser.add_argument('--horde', action='store_true',
+                        help="вместо записей - замер режима орды против цели 60 FPS")
+    parser.add_argument('--horde-enemies', type=int, default=2000,
+                        help="число живых врагов для --horde")
+    parser.add_argument('--horde-bullets', type=int, default=5000,
+                        help="число пуль для --horde")
+    parser.add_argument('--horde-frames', type=int, default=600,
+                        help="число замеряемых кадров для --horde")
+    return parser.parse_args()
+
+
+def main() -> int:
+
+    args = parse_args()
+    if args.horde:
+        pygame.init()
+        benchmark = HordeBenchmark(args.horde_enemies, args.horde_bullets, args.horde_frames,
+                                   render_scale=args.render_scale)
+        passed = benchmark.run()
+        pygame.quit()
+        return 0 if passed else 1
+
+    sessions = args.sessions or sorted(glob.glob(os.path.join(PERF_DIR, 'sessions', '*.bin')))
+    if not sessions:
+        print("Нет записанных сессий")
+        return 1
+
+    pygame.init()
+
+    harness = FrameTimeHarness(
+        sessions,
+        args.baseline,
+        tolerance=args.tolerance,
+        worst_tolerance=args.worst_tolerance,
+        slack_ms=args.slack_ms,
+        repeats=args.repeats,
+        render_scale=args.render_scale
+    )
+    passed = harness.run(update_baseline=args.update_baseline)
+
+    pygame.quit()
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
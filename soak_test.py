@@ -0,0 +1,78 @@
+import argparse
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'modules'))
+
+from modules.Game import Game
+from modules.SoakHarness import SoakHarness
+
+
+def parse_args() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(description="Длительный прогон: бот играет по кругу, поиск дрейфа")
+    parser.add_argument('--cycles', type=int, default=0,
+                        help="число игр (0 - без ограничения, остановка Ctrl+C)")
+    parser.add_argument('--duration', type=float, default=0.0,
+                        help="длительность прогона, секунды (0 - без ограничения)")
+    parser.add_argument('--seed', type=int, default=1,
+                        help="seed первой игры, следующие - seed + номер цикла")
+    parser.add_argument('--warmup-cycles', type=int, default=1,
+                        help="сколько первых циклов не учитывать при поиске дрейфа")
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help="допустимый рост p50/p95 времени кадра (доля)")
+    parser.add_argument('--slack-ms', type=float, default=0.25,
+                        help="абсолютный запас времени кадра в миллисекундах")
+    parser.add_argument('--object-tolerance', type=float, default=0.05,
+                        help="допустимый рост числа объектов gc (доля)")
+    parser.add_argument('--rss-slack-mb', type=float, default=16.0,
+                        help="допустимый рост RSS, МБ")
+    parser.add_argument('--report', metavar='PATH',
+                        help="дописывать итоги уровней строками JSON в файл")
+    parser.add_argument('--gc-mode', choices=['default', 'disabled', 'tuned'], default='default',
+                        help="режим сборщика мусора во время игры")
+    parser.add_argument('--render-scale', type=float, default=1.0,
+                        help="масштаб внутреннего буфера мира")
+    parser.add_argument('--metrics-dir', metavar='DIR',
+                        help="выгружать метрики в DIR/metrics.jsonl и DIR/contra.prom")
+    return parser.parse_args()
+
+
+def main() -> int:
+
+    args = parse_args()
+
+    pygame.init()
+    pygame.mixer.init(44100, -16, 2, 512)
+
+    # Качество не снижаем: иначе нагрузка меняется посреди прогона и дрейф не виден
+    game = Game(gc_mode=args.gc_mode, render_scale=args.render_scale, adaptive_quality=False,
+                metrics_dir=args.metrics_dir)
+    game.use_offscreen_surface()
+
+    harness = SoakHarness(
+        game,
+        cycles=args.cycles,
+        duration=args.duration,
+        seed=args.seed,
+        warmup_cycles=args.warmup_cycles,
+        tolerance=args.tolerance,
+        slack_ms=args.slack_ms,
+        object_tolerance=args.object_tolerance,
+        rss_slack_mb=args.rss_slack_mb,
+        report_path=args.report
+    )
+    passed = harness.run()
+
+    game.close_outputs()
+    pygame.quit()
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())